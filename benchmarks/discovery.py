@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+Compare distribution discovery against the `importlib.metadata` resolver that was used previously.
+
+    python -m benchmarks.discovery --count 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import tempfile
+import timeit
+from importlib.metadata import Distribution, DistributionFinder
+
+from benchmarks.synthetic import generate_site_packages
+from dep_sync import InstalledDistributions
+
+
+def importlib_get(sys_path: list[str], project_name: str) -> Distribution | None:
+    canonical_regex = re.compile(r"[-_.]+")
+    for distribution in Distribution.discover(context=DistributionFinder.Context(path=sys_path)):
+        name = distribution.metadata["Name"]
+        if name is not None and canonical_regex.sub("-", name).lower() == project_name:
+            return distribution
+
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        generate_site_packages(d, args.count)
+        sys_path = [d]
+
+        benchmarks = {
+            "importlib.metadata": lambda: importlib_get(sys_path, "missing"),
+            "dep_sync": lambda: InstalledDistributions(sys_path=sys_path, share_entries=False).get("missing"),
+        }
+        print(f"Lookup of a missing name among {args.count} distributions (best of {args.repeat}):")
+        for name, func in benchmarks.items():
+            elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"  {name:<20} {elapsed * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
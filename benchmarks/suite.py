@@ -0,0 +1,186 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+Measure the public API against synthetic environments of increasing size and record the results as JSON so that
+they may be compared across commits.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare results.json
+
+Every operation is measured for environments laid out as a directory of distributions and as a zip archive, in the
+following modes:
+
+- cold: a new `InstalledDistributions` instance without a cache
+- cached: a new `InstalledDistributions` instance with a populated cache directory
+- shared: a new `InstalledDistributions` instance that shares the entries scanned by other instances
+- warm: an `InstalledDistributions` instance that has already performed the operation
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.synthetic import (
+    DIRECT_URL_INTERVAL,
+    EXTRAS_CHAIN_LENGTH,
+    generate_site_packages,
+    generate_zip_archive,
+    project_url,
+)
+from dep_sync import Dependency, InstalledDistributions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_COUNTS = (100, 1_000, 10_000)
+# The number of dependencies of every check, spread evenly across the environment
+SAMPLE_SIZE = 50
+LAYOUTS = {"directory": generate_site_packages, "zip": generate_zip_archive}
+
+
+def result_key(result: dict[str, Any]) -> tuple[int, str, str, str]:
+    # Results recorded before archives were measured only cover directories
+    return result["count"], result.get("layout", "directory"), result["operation"], result["mode"]
+
+
+def sample_dependencies(path: str, names: list[str]) -> list[Dependency]:
+    step = max(1, len(names) // SAMPLE_SIZE)
+    dependencies = []
+    for i in range(0, len(names), step):
+        name = names[i]
+        if i % DIRECT_URL_INTERVAL == 0:
+            dependencies.append(Dependency(f"{name} @ {project_url(path, name)}", editable=True))
+        elif i % EXTRAS_CHAIN_LENGTH == 1:
+            dependencies.append(Dependency(f"{name}[all]"))
+        else:
+            dependencies.append(Dependency(f'{name}; python_version >= "3"'))
+
+    # Ensure the entire environment must be searched
+    dependencies.append(Dependency(names[-1]))
+    return dependencies
+
+
+def operations(dependencies: list[Dependency], last_name: str) -> dict[str, Callable[[InstalledDistributions], Any]]:
+    return {
+        "dependencies_satisfied": lambda distributions: distributions.dependencies_satisfied(dependencies),
+        "dependency_state": lambda distributions: distributions.dependency_state(dependencies, exhaustive=True),
+        "get": lambda distributions: distributions.get(last_name),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timings = timeit.repeat(func, number=1, repeat=repeat)
+    return {"min_ms": min(timings) * 1000, "median_ms": statistics.median(timings) * 1000}
+
+
+def run(counts: list[int], repeat: int) -> list[dict[str, Any]]:
+    results = []
+    for count in counts:
+        for layout, generate in LAYOUTS.items():
+            with tempfile.TemporaryDirectory() as d:
+                site_packages = os.path.join(d, "site-packages")
+                names = generate(site_packages, count)
+                # Entries are not cached until they have not been modified for a moment
+                timestamp = time.time() - 10
+                os.utime(site_packages, (timestamp, timestamp))
+
+                dependencies = sample_dependencies(site_packages, names)
+                for operation, func in operations(dependencies, names[-1]).items():
+                    timings = measure_operation(func, [site_packages], os.path.join(d, "cache"), repeat)
+                    for mode, timing in timings.items():
+                        results.append({
+                            "count": count,
+                            "layout": layout,
+                            "operation": operation,
+                            "mode": mode,
+                            "repeat": repeat,
+                            **timing,
+                        })
+
+    return results
+
+
+def measure_operation(
+    func: Callable[[InstalledDistributions], Any], sys_path: list[str], cache_dir: str, repeat: int
+) -> dict[str, dict[str, float]]:
+    InstalledDistributions(sys_path=sys_path, cache_dir=cache_dir).dependency_state([], exhaustive=True)
+    warm_distributions = InstalledDistributions(sys_path=sys_path)
+    func(warm_distributions)
+
+    def cold() -> Any:
+        return func(InstalledDistributions(sys_path=sys_path, share_entries=False))
+
+    def cached() -> Any:
+        return func(InstalledDistributions(sys_path=sys_path, cache_dir=cache_dir, share_entries=False))
+
+    return {
+        "cold": measure(cold, repeat),
+        "cached": measure(cached, repeat),
+        "shared": measure(lambda: func(InstalledDistributions(sys_path=sys_path)), repeat),
+        "warm": measure(lambda: func(warm_distributions), repeat),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        process = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)  # noqa: S607
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return process.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, action="append", dest="counts", help="May be passed more than once")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="The path to which the results are written as JSON")
+    parser.add_argument("--compare", help="The path to previously written results to compare against")
+    args = parser.parse_args()
+
+    results = run(args.counts or list(DEFAULT_COUNTS), args.repeat)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {result_key(result): result for result in json.load(f)["results"]}
+
+    print(f"{'count':>8} {'layout':<9} {'operation':<24} {'mode':<8} {'min (ms)':>12} {'median (ms)':>12}", end="")
+    print(f" {'baseline':>12}" if baseline else "")
+    for result in results:
+        print(
+            f"{result['count']:>8} {result['layout']:<9} {result['operation']:<24} {result['mode']:<8} "
+            f"{result['min_ms']:>12.3f} {result['median_ms']:>12.3f}",
+            end="",
+        )
+        previous = baseline.get(result_key(result))
+        if previous is None:
+            print(f" {'':>12}" if baseline else "")
+        else:
+            print(f" {result['min_ms'] / previous['min_ms']:>11.2f}x")
+
+    if args.output:
+        data = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "implementation": sys.implementation.name,
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+# The number of distributions in every chain of extras, which is bounded to stay well below the recursion limit
+EXTRAS_CHAIN_LENGTH = 20
+# Every distribution whose index is a multiple of this is an editable installation
+DIRECT_URL_INTERVAL = 10
+
+
+def generate_site_packages(path: str, count: int) -> list[str]:
+    """
+    Populate `path` with `count` synthetic distributions and return their project names in installation order.
+
+    Every distribution provides an `all` extra that requires the next distribution with the same extra, forming
+    chains of `EXTRAS_CHAIN_LENGTH` distributions, along with requirements guarded by environment markers. Every
+    `DIRECT_URL_INTERVAL`th distribution is recorded as an editable installation of a local directory.
+    """
+    os.makedirs(path, exist_ok=True)
+    names = [project_name(i) for i in range(count)]
+    for i, name in enumerate(names):
+        version = project_version(i)
+        metadata_directory = os.path.join(path, f"{name.replace('-', '_')}-{version}.dist-info")
+        os.mkdir(metadata_directory)
+
+        lines = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}", "Provides-Extra: all"]
+        if (i + 1) % EXTRAS_CHAIN_LENGTH and i + 1 < count:
+            lines.extend((
+                f'Requires-Dist: {names[i + 1]}[all]>={project_version(i + 1)}; extra == "all"',
+                f'Requires-Dist: {names[i + 1]}; python_version >= "3" and extra == "all"',
+            ))
+
+        lines.append('Requires-Dist: missing-project; sys_platform == "never"')
+        with open(os.path.join(metadata_directory, "METADATA"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+        if i % DIRECT_URL_INTERVAL == 0:
+            direct_url = {"url": project_url(path, name), "dir_info": {"editable": True}}
+            with open(os.path.join(metadata_directory, "direct_url.json"), "w", encoding="utf-8") as f:
+                json.dump(direct_url, f)
+
+    return names
+
+
+def generate_zip_archive(path: str, count: int) -> list[str]:
+    """
+    Generate the distributions of [`generate_site_packages`][] in a directory next to `path` and compress them into
+    a zip archive at `path`, which may be added to the search path like a zipapp. The project URLs are unchanged as
+    both share a parent directory.
+    """
+    import zipfile
+
+    directory = f"{path}.d"
+    names = generate_site_packages(directory, count)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for root, _, files in os.walk(directory):
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                z.write(file_path, os.path.relpath(file_path, directory).replace(os.sep, "/"))
+
+    return names
+
+
+def project_name(i: int) -> str:
+    return f"project-{i:05}"
+
+
+def project_version(i: int) -> str:
+    return f"{i % 7}.{i % 13}.{i % 3}"
+
+
+def project_url(path: str, name: str) -> str:
+    return (Path(path).parent / "projects" / name).as_uri()
@@ -1,15 +1,79 @@
 # SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
 #
 # SPDX-License-Identifier: MIT
-from dep_sync import scripts
-from dep_sync._dependency import Dependency
-from dep_sync._distributions import DependencyState, InstalledDistributions, dependencies_satisfied, dependency_state
+from __future__ import annotations
+
+# Avoid importing `typing` at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from dep_sync import scripts
+    from dep_sync._dependency import Dependency
+    from dep_sync._dependency_set import DependencySet
+    from dep_sync._distributions import (
+        DependencyState,
+        InstalledDistributions,
+        SyncPlan,
+        UnsatisfiedReason,
+        dependencies_satisfied,
+        dependency_state,
+    )
+    from dep_sync._environments import EnvironmentCheckError, dependency_states, python_info
+    from dep_sync._requirements import merge_dependencies, read_dependencies
+    from dep_sync._stats import Stats
 
 __all__ = [
     "Dependency",
+    "DependencySet",
     "DependencyState",
+    "EnvironmentCheckError",
     "InstalledDistributions",
+    "Stats",
+    "SyncPlan",
+    "UnsatisfiedReason",
     "dependencies_satisfied",
     "dependency_state",
+    "dependency_states",
+    "merge_dependencies",
+    "python_info",
+    "read_dependencies",
     "scripts",
 ]
+
+# Public names are imported on first access to keep the import of this package cheap, see PEP 562
+__lazy_attributes = {
+    "Dependency": "dep_sync._dependency",
+    "DependencySet": "dep_sync._dependency_set",
+    "DependencyState": "dep_sync._distributions",
+    "EnvironmentCheckError": "dep_sync._environments",
+    "InstalledDistributions": "dep_sync._distributions",
+    "Stats": "dep_sync._stats",
+    "SyncPlan": "dep_sync._distributions",
+    "UnsatisfiedReason": "dep_sync._distributions",
+    "dependencies_satisfied": "dep_sync._distributions",
+    "dependency_state": "dep_sync._distributions",
+    "dependency_states": "dep_sync._environments",
+    "merge_dependencies": "dep_sync._requirements",
+    "python_info": "dep_sync._environments",
+    "read_dependencies": "dep_sync._requirements",
+    "scripts": "dep_sync.scripts",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = __lazy_attributes.get(name)
+    if module_name is None:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+
+    from importlib import import_module
+
+    module = import_module(module_name)
+    value = module if name == "scripts" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
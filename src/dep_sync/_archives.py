@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import struct
+from functools import cached_property
+from importlib.metadata import Distribution
+from typing import TYPE_CHECKING
+
+from dep_sync._discovery import DistributionRecord, parse_metadata_headers
+
+if TYPE_CHECKING:
+    from zipfile import Path as ZipPath
+    from zipfile import ZipInfo
+
+# https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT section 4.3.7
+LOCAL_FILE_HEADER = struct.Struct("<4s5H3L2H")
+LOCAL_FILE_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+class ZipArchive:
+    """
+    The members of the metadata directories of a zip archive, such as a zipapp, an `.egg` or a zipped wheel. The
+    central directory is read only once, after which members are read directly from their recorded offsets.
+
+    Parameters:
+        path: The path to the archive.
+        members: A mapping of member names to their entries in the central directory.
+        directories: The names of the metadata directories at the root of the archive, in order.
+    """
+
+    def __init__(self, path: str, members: dict[str, ZipInfo], directories: list[str]) -> None:
+        self.path = path
+        self.members = members
+        self.directories = directories
+
+    @classmethod
+    def open(cls, path: str) -> ZipArchive | None:
+        """
+        Returns:
+            The index of the archive, or `None` if the path is not a readable zip archive.
+        """
+        import mmap
+        from zipfile import BadZipFile, ZipFile
+
+        from dep_sync._discovery import METADATA_DIRECTORY_SUFFIXES
+
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, ZipFile(m) as z:  # type: ignore[call-overload]
+                infos = z.infolist()
+        except (OSError, ValueError, BadZipFile):
+            return None
+
+        members: dict[str, ZipInfo] = {}
+        directories: dict[str, None] = {}
+        for info in infos:
+            directory, separator, _ = info.filename.partition("/")
+            if separator and (directory.lower().endswith(METADATA_DIRECTORY_SUFFIXES) or directory == "EGG-INFO"):
+                members[info.filename] = info
+                directories[directory] = None
+
+        return cls(path, members, list(directories))
+
+    def read(self, name: str) -> bytes | None:
+        """
+        Returns:
+            The contents of the member, or `None` if there is no such member.
+        """
+        import zipfile
+
+        info = self.members.get(name)
+        if info is None:
+            return None
+
+        # Encrypted members and uncommon compression methods are left to the standard library
+        if info.flag_bits & 0x1 or info.compress_type not in {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED}:
+            with zipfile.ZipFile(self.path) as z:
+                return z.read(info)
+
+        with open(self.path, "rb") as f:
+            f.seek(info.header_offset)
+            header = f.read(LOCAL_FILE_HEADER.size)
+            if len(header) != LOCAL_FILE_HEADER.size or header[:4] != LOCAL_FILE_HEADER_SIGNATURE:
+                message = f"Bad magic number for file header: {name}"
+                raise zipfile.BadZipFile(message)
+
+            *_, name_length, extra_length = LOCAL_FILE_HEADER.unpack(header)
+            f.seek(name_length + extra_length, os.SEEK_CUR)
+            data = f.read(info.compress_size)
+
+        if info.compress_type == zipfile.ZIP_STORED:
+            return data
+
+        import zlib
+
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+    def read_text(self, name: str) -> str | None:
+        data = self.read(name)
+        return None if data is None else data.decode("utf-8")
+
+
+class ArchiveRecord(DistributionRecord):
+    """
+    A distribution whose metadata directory is within a zip archive.
+    """
+
+    def __init__(self, name: str, directory: str, version: str | None = None, *, archive: ZipArchive) -> None:
+        super().__init__(name, os.path.join(archive.path, directory), version)
+        self.archive = archive
+        self.directory = directory
+
+    @cached_property
+    def distribution(self) -> Distribution:
+        return ArchiveDistribution(self.archive, self.directory)
+
+    def read_headers(self) -> dict[str, list[str]]:
+        for metadata_file in ("METADATA", "PKG-INFO"):
+            text = self.archive.read_text(f"{self.directory}/{metadata_file}")
+            # Empty files are skipped like they are by the standard library
+            if text:
+                return parse_metadata_headers(text.splitlines(keepends=True)) or {}
+
+        return {}
+
+
+class ArchiveDistribution(Distribution):
+    """
+    An [`importlib.metadata.Distribution`][] that reads the files of a metadata directory within a zip archive
+    from the index of the archive.
+    """
+
+    def __init__(self, archive: ZipArchive, directory: str) -> None:
+        self.__archive = archive
+        self.__directory = directory
+
+    def read_text(self, filename: str) -> str | None:
+        return self.__archive.read_text(f"{self.__directory}/{filename}")
+
+    def locate_file(self, path: str | os.PathLike[str]) -> ZipPath:  # type: ignore[override]
+        import zipfile
+
+        return zipfile.Path(self.__archive.path, at=os.fspath(path))
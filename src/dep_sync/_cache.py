@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import stat
+from typing import TYPE_CHECKING, Any
+
+from dep_sync._discovery import DistributionRecord, scan_directory
+
+if TYPE_CHECKING:
+    from dep_sync._stats import Stats
+
+# Increment whenever the structure of the cached data changes
+CACHE_FORMAT = 1
+# Directories modified this recently are not trusted because timestamps are coarse on some file systems and
+# another change within the same tick would be undetectable
+RACY_INTERVAL_NS = 1_000_000_000
+
+
+def fingerprint(path: str) -> list[int] | None:
+    try:
+        result = os.stat(path or ".")
+    except OSError:
+        return None
+
+    return [result.st_mode, result.st_mtime_ns, result.st_ino, result.st_dev, result.st_size]
+
+
+def trusted(path_fingerprint: list[int], now: int) -> bool:
+    return now - path_fingerprint[1] >= RACY_INTERVAL_NS
+
+
+class DistributionIndex:
+    """
+    An index of the distributions in every search path entry that is stored in the given cache directory. Every
+    entry is validated by its fingerprint and only the entries that have changed since the index was last written
+    are scanned again.
+    """
+
+    def __init__(self, sys_path: list[str], cache_dir: str, *, stats: Stats | None = None) -> None:
+        self.__sys_path = sys_path
+        self.__stats = stats
+        self.__index_file = os.path.join(cache_dir, f"index-{cache_key(sys_path)}.json")
+        index = read_json(self.__index_file)
+        if not isinstance(index, dict) or index.get("format") != CACHE_FORMAT:
+            index = {"format": CACHE_FORMAT, "entries": {}}
+
+        self.__cached_entries: dict[str, dict[str, Any]] = index["entries"]
+        self.__entries: dict[str, dict[str, Any]] = {}
+        self.__modified = False
+
+    def scan(self, entry: str) -> list[DistributionRecord]:
+        import time
+
+        now = time.time_ns()
+        entry_fingerprint = fingerprint(entry)
+        cached_entry = self.__cached_entries.get(entry)
+        if (
+            entry_fingerprint is not None
+            and cached_entry is not None
+            and cached_entry["fingerprint"] == entry_fingerprint
+        ):
+            if self.__stats is not None:
+                self.__stats.count("index_hits")
+
+            self.__entries[entry] = cached_entry
+            return [load_record(data) for data in cached_entry["distributions"]]
+
+        # Archives are not cached because their distributions are not backed by metadata directories
+        if entry_fingerprint is not None and not stat.S_ISDIR(entry_fingerprint[0]):
+            return list(scan_directory(entry))
+
+        if self.__stats is not None:
+            self.__stats.count("index_misses")
+
+        self.__modified = True
+        records = list(scan_directory(entry)) if entry_fingerprint is not None else []
+        self.__entries[entry] = {
+            "fingerprint": (
+                entry_fingerprint if entry_fingerprint is not None and trusted(entry_fingerprint, now) else None
+            ),
+            "distributions": [dump_record(record) for record in records],
+        }
+        return records
+
+    def save(self) -> None:
+        # Entries that were not scanned, for example because they were already known to be unchanged, retain
+        # their previous state
+        entries = {}
+        for entry in self.__sys_path:
+            entry_data = self.__entries.get(entry, self.__cached_entries.get(entry))
+            if entry_data is not None:
+                entries[entry] = entry_data
+
+        if self.__modified or len(entries) != len(self.__cached_entries):
+            write_json(self.__index_file, {"format": CACHE_FORMAT, "entries": entries})
+
+
+def load_python_info(cache_dir: str, python: str) -> dict[str, Any] | None:
+    """
+    Returns:
+        The cached output of `dep_sync.scripts.PYTHON_INFO_SCRIPT` for the given interpreter, or `None` if
+        the interpreter, its virtual environment configuration or any of its search path entries have changed.
+    """
+    entry = read_json(python_info_file(cache_dir, python))
+    if not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT:
+        return None
+
+    if not python_info_current(python, entry):
+        return None
+
+    return entry["info"]
+
+
+def save_python_info(cache_dir: str, python: str, info: dict[str, Any]) -> None:
+    state = python_info_state(python, info)
+    if state is None:
+        return
+
+    entry = {"format": CACHE_FORMAT, **state, "info": info}
+    write_json(python_info_file(cache_dir, python), entry)
+
+
+def python_info_state(python: str, info: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Returns:
+        The fingerprints that must remain unchanged for the inspection of the interpreter to remain valid, or
+        `None` if any search path entry was modified too recently to be trusted.
+    """
+    import time
+
+    now = time.time_ns()
+    paths: dict[str, list[int] | None] = {}
+    # Entries are fingerprinted so that changes such as new `.pth` files are detected
+    for path in info["sys_path"]:
+        path_fingerprint = fingerprint(path)
+        if path_fingerprint is not None and not trusted(path_fingerprint, now):
+            return None
+
+        paths[path] = path_fingerprint
+
+    return {"interpreter": interpreter_fingerprint(python), "paths": paths}
+
+
+def python_info_current(python: str, state: dict[str, Any]) -> bool:
+    if state["interpreter"] != interpreter_fingerprint(python):
+        return False
+
+    return all(fingerprint(path) == path_fingerprint for path, path_fingerprint in state["paths"].items())
+
+
+def interpreter_fingerprint(python: str) -> list[Any]:
+    directory = os.path.dirname(os.path.abspath(python))
+    resolved_path = os.path.realpath(python)
+    return [
+        resolved_path,
+        fingerprint(resolved_path),
+        # https://peps.python.org/pep-0405/#specification
+        fingerprint(os.path.join(directory, "pyvenv.cfg")),
+        fingerprint(os.path.join(os.path.dirname(directory), "pyvenv.cfg")),
+    ]
+
+
+def python_info_file(cache_dir: str, python: str) -> str:
+    return os.path.join(cache_dir, f"python-{cache_key([os.path.abspath(python)])}.json")
+
+
+def cache_key(sys_path: list[str]) -> str:
+    from hashlib import sha256
+
+    return sha256("\0".join(sys_path).encode("utf-8")).hexdigest()[:32]
+
+
+def dump_record(record: DistributionRecord) -> list[Any]:
+    return [
+        record.name,
+        record.path,
+        record.version,
+        record.requires_dist,
+        record.provides_extra,
+        record.direct_url,
+    ]
+
+
+def load_record(data: list[Any]) -> DistributionRecord:
+    name, path, version, requires_dist, provides_extra, direct_url = data
+    record = DistributionRecord(name, path, version)
+    record.requires_dist = requires_dist
+    record.provides_extra = provides_extra
+    record.direct_url = direct_url
+    return record
+
+
+def read_json(path: str) -> Any:
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, data: Any) -> None:
+    import json
+    from tempfile import NamedTemporaryFile
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False) as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        os.replace(f.name, path)
+    # The cache is merely an optimization
+    except OSError:  # no cov
+        pass
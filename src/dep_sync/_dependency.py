@@ -3,11 +3,22 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from functools import cached_property
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any
 
 from packaging.requirements import Requirement
 
-from dep_sync._utils import path_from_url
+from dep_sync._utils import canonical_name, path_from_url
+
+if TYPE_CHECKING:
+    import sys
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+MAX_INTERNED_DEPENDENCIES = 8192
 
 
 class Dependency(Requirement):
@@ -23,6 +34,23 @@ class Dependency(Requirement):
         super().__init__(requirement_string)
 
         self.editable = False if self.url is None else editable
+        self.canonical_name = canonical_name(self.name)
+
+    @classmethod
+    def from_string(cls, requirement_string: str, *, editable: bool = False) -> Self:
+        """
+        This should be preferred when the same requirement strings are parsed repeatedly, such as when loading
+        the metadata of installed distributions. Instances are shared and immutable, with the `extras` being a
+        `frozenset`, and the most recently used are kept for the lifetime of the process.
+
+        Parameters:
+            requirement_string: The requirement string.
+            editable: Whether the dependency should be editable.
+
+        Returns:
+            An instance of the class on which this is called.
+        """
+        return intern_dependency(cls, requirement_string, editable)  # type: ignore[arg-type,return-value]
 
     @cached_property
     def path(self) -> str | None:
@@ -34,3 +62,19 @@ class Dependency(Requirement):
             return None
 
         return path_from_url(self.url)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get("_Dependency__frozen"):
+            message = f"Shared instance of {type(self).__name__} cannot be modified: {self}"
+            raise AttributeError(message)
+
+        super().__setattr__(name, value)
+
+
+@lru_cache(maxsize=MAX_INTERNED_DEPENDENCIES)
+def intern_dependency(cls: type[Dependency], requirement_string: str, editable: bool) -> Dependency:  # noqa: FBT001
+    dependency = cls(requirement_string, editable=editable)
+    # Shared instances must not be modified in place either
+    dependency.extras = frozenset(dependency.extras)  # type: ignore[assignment]
+    dependency.__dict__["_Dependency__frozen"] = True
+    return dependency
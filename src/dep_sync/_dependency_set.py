@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dep_sync._markers import compile_marker
+from dep_sync._utils import canonical_name
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from packaging.specifiers import SpecifierSet
+
+    from dep_sync._dependency import Dependency
+    from dep_sync._markers import CompiledMarker
+
+
+class DependencySet:
+    """
+    An immutable collection of dependencies that is prepared once to be checked against any number of environments.
+    It may be passed to the methods of [`dep_sync.InstalledDistributions`][] wherever a list of dependencies is
+    accepted, in which case the work that does not depend on the environment, such as compiling markers, normalizing
+    the names of extras and classifying direct references, is not repeated for every check. The dependencies must not be
+    modified afterward.
+
+    Parameters:
+        dependencies: The dependencies to check.
+    """
+
+    __slots__ = ("dependencies", "entries", "vcs_entries")
+
+    def __init__(self, dependencies: Iterable[Dependency]) -> None:
+        self.dependencies: tuple[Dependency, ...] = tuple(dependencies)
+        self.entries = tuple(CompiledDependency(dependency) for dependency in self.dependencies)
+        self.vcs_entries = tuple(entry for entry in self.entries if entry.kind == CheckKind.VCS)
+
+    def __iter__(self) -> Iterator[Dependency]:
+        return iter(self.dependencies)
+
+    def __len__(self) -> int:
+        return len(self.dependencies)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.dependencies)!r})"
+
+
+class CheckKind:
+    """
+    What must be verified about an installed distribution to satisfy a dependency, beyond its version.
+    """
+
+    PLAIN = "plain"
+    EXTRAS = "extras"
+    PATH = "path"
+    VCS = "vcs"
+    URL = "url"
+
+
+class CompiledDependency:
+    """
+    The parts of a dependency that are used to check it, computed once.
+    """
+
+    __slots__ = ("dependency", "editable", "extras", "kind", "marker", "name", "path", "specifier", "url")
+
+    def __init__(self, dependency: Dependency) -> None:
+        self.dependency = dependency
+        self.name = dependency.canonical_name
+        marker = dependency.marker
+        self.marker: CompiledMarker | None = None if marker is None else compile_marker(marker)
+        self.editable = dependency.editable
+        self.specifier: SpecifierSet | None = dependency.specifier or None
+        extras = dependency.extras
+        self.extras = tuple(sorted(map(canonical_name, extras))) if extras else ()
+        self.url = url = dependency.url
+        if url is None:
+            self.path = None
+            self.kind = CheckKind.EXTRAS if extras else CheckKind.PLAIN
+            return
+
+        self.path = dependency.path
+        if url.startswith("git+"):
+            self.kind = CheckKind.VCS
+        elif self.path is not None:
+            self.kind = CheckKind.PATH
+        else:
+            self.kind = CheckKind.URL
+
+
+def compile_dependencies(dependencies: Iterable[Dependency] | DependencySet) -> DependencySet:
+    return dependencies if isinstance(dependencies, DependencySet) else DependencySet(dependencies)
@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from dep_sync._utils import canonical_name
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from importlib.metadata import Distribution
+
+    from packaging.version import Version
+
+    from dep_sync._dependency import Dependency
+    from dep_sync._references import DirectReference
+    from dep_sync._stats import Stats
+
+METADATA_DIRECTORY_SUFFIXES = (".dist-info", ".egg-info")
+# The only fields that are ever read from metadata files
+METADATA_FIELDS = ("Name", "Version", "Requires-Dist", "Provides-Extra")
+
+
+class DistributionRecord:
+    """
+    A lightweight view of an installed distribution. The name and version are derived from the name of the metadata
+    directory whenever possible so that the metadata file is only read when more information is required.
+    """
+
+    # Set when statistics are being collected
+    stats: Stats | None = None
+
+    def __init__(self, name: str, path: str, version: str | None = None) -> None:
+        self.name = name
+        self.path = path
+        self.__version = version
+
+    @cached_property
+    def distribution(self) -> Distribution:
+        from importlib.metadata import PathDistribution
+        from pathlib import Path
+
+        return PathDistribution(Path(self.path))
+
+    @cached_property
+    def headers(self) -> dict[str, list[str]]:
+        """
+        The values of every field in `METADATA_FIELDS` found in the metadata file, keyed by lowercase field name.
+        """
+        if self.stats is None:
+            return self.read_headers()
+
+        self.stats.count("metadata_reads")
+        with self.stats.time("metadata"):
+            return self.read_headers()
+
+    def read_headers(self) -> dict[str, list[str]]:
+        return read_metadata_headers(self.path)
+
+    def header(self, name: str) -> str | None:
+        values = self.headers.get(name.lower())
+        return values[0] if values else None
+
+    @cached_property
+    def version(self) -> str:
+        return self.__version or self.header("Version") or ""
+
+    @cached_property
+    def parsed_version(self) -> Version | str:
+        """
+        The version for comparisons with specifiers, which remains a string if it is invalid so that it is handled
+        as it would be otherwise. Records are shared across instances so every version is parsed at most once.
+        """
+        from packaging.version import InvalidVersion, Version
+
+        try:
+            return Version(self.version)
+        except InvalidVersion:
+            return self.version
+
+    @cached_property
+    def requires_dist(self) -> list[str]:
+        return self.headers.get("requires-dist", [])
+
+    @cached_property
+    def provides_extra(self) -> list[str]:
+        return self.headers.get("provides-extra", [])
+
+    @cached_property
+    def available_extras(self) -> dict[str, str]:
+        return {canonical_name(extra): extra for extra in self.provides_extra}
+
+    @cached_property
+    def requirements(self) -> list[Dependency]:
+        from dep_sync._dependency import Dependency
+
+        return [Dependency.from_string(requirement) for requirement in self.requires_dist]
+
+    @cached_property
+    def direct_url(self) -> dict[str, Any] | None:
+        if self.stats is None:
+            return self.read_direct_url()
+
+        self.stats.count("direct_url_reads")
+        with self.stats.time("direct_url"):
+            return self.read_direct_url()
+
+    @cached_property
+    def direct_reference(self) -> DirectReference | None:
+        direct_url_data = self.direct_url
+        if direct_url_data is None:
+            return None
+
+        from dep_sync._references import DirectReference
+
+        return DirectReference(direct_url_data)
+
+    def read_direct_url(self) -> dict[str, Any] | None:
+        direct_url_file = self.distribution.read_text("direct_url.json")
+        if direct_url_file is None:
+            return None
+
+        import json
+
+        return json.loads(direct_url_file)
+
+
+def scan_directory(directory: str) -> Iterator[DistributionRecord]:
+    root = directory or "."
+    try:
+        with os.scandir(root) as entries:
+            children = [(entry.name, entry.path) for entry in entries]
+    except OSError:
+        if os.path.isfile(root):
+            yield from scan_archive(root)
+
+        return
+
+    yield from iter_records(root, children, DistributionRecord)
+
+
+def scan_archive(path: str) -> Iterator[DistributionRecord]:
+    from functools import partial
+
+    from dep_sync._archives import ArchiveRecord, ZipArchive
+
+    archive = ZipArchive.open(path)
+    if archive is None:
+        return
+
+    # Members are addressed by their name within the archive rather than by a path
+    children = [(directory, directory) for directory in archive.directories]
+    yield from iter_records(path, children, partial(ArchiveRecord, archive=archive))
+
+
+def iter_records(
+    root: str, children: list[tuple[str, str]], record_type: Callable[..., DistributionRecord]
+) -> Iterator[DistributionRecord]:
+    for child_name, child_path in children:
+        low = child_name.lower()
+        if low.endswith(METADATA_DIRECTORY_SUFFIXES):
+            stem, _, suffix = child_name.rpartition(".")
+            project_name, _, version = stem.partition("-")
+            if suffix.lower() == "egg-info":
+                # Drop the Python version tag e.g. `pkg-1.0-py3.12.egg-info`
+                version = version.partition("-")[0]
+
+            record = parse_record(project_name, version, child_path, record_type)
+            if record is not None:
+                yield record
+
+    base = os.path.basename(root).lower()
+    if base.endswith(".egg"):
+        for child_name, child_path in children:
+            if child_name.lower() == "egg-info":
+                project_name, _, version = base.rpartition(".")[0].partition("-")
+                record = parse_record(project_name, version.partition("-")[0], child_path, record_type)
+                if record is not None:
+                    yield record
+
+
+def parse_record(
+    project_name: str, version: str, path: str, record_type: Callable[..., DistributionRecord] = DistributionRecord
+) -> DistributionRecord | None:
+    # Directory names are only trusted when they follow the `{name}-{version}` convention, otherwise the name
+    # could contain dashes or the version could be absent, as is the case for `.egg-info` directories created by
+    # `setup.py develop` and distributions installed by very old tools
+    if project_name and version[:1].isdigit():
+        return record_type(canonical_name(project_name), path, version)
+
+    record = record_type("", path)
+    name = record.header("Name")
+    if name is None:  # no cov
+        return None
+
+    record.name = canonical_name(name)
+    return record
+
+
+def read_metadata_headers(path: str) -> dict[str, list[str]]:
+    """
+    Read the fields in `METADATA_FIELDS` from the metadata file of the distribution at `path`. Reading stops at the
+    end of the header block so the description, which is usually the bulk of the file, is never read. The same files
+    are considered as [`importlib.metadata.Distribution.metadata`][], with `path` itself being the metadata file of
+    legacy `.egg-info` files.
+    """
+    for metadata_file in (os.path.join(path, "METADATA"), os.path.join(path, "PKG-INFO"), path):
+        try:
+            f = open(metadata_file, encoding="utf-8")  # noqa: SIM115
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError):
+            continue
+
+        with f:
+            headers = parse_metadata_headers(f)
+
+        # Empty files are skipped like they are by the standard library
+        if headers is not None:
+            return headers
+
+    return {}
+
+
+def parse_metadata_headers(lines: Iterable[str]) -> dict[str, list[str]] | None:
+    """
+    Parse the header block of a metadata file in the same way as the `email` package with the `compat32` policy
+    that the standard library uses, such that values retain the line breaks of folded lines.
+
+    Returns:
+        The values of every field in `METADATA_FIELDS`, keyed by lowercase field name, or `None` if there were no
+        lines.
+    """
+    fields = {name.lower() for name in METADATA_FIELDS}
+    headers: dict[str, list[str]] = {}
+    # The name and lines of the field currently being parsed, if it is one of interest
+    current: tuple[str, list[str]] | None = None
+    empty = True
+    for line in lines:
+        empty = False
+        if line[:1] in {" ", "\t"}:
+            if current is not None:
+                current[1].append(line)
+            continue
+
+        if current is not None:
+            add_header(headers, *current)
+            current = None
+
+        name, separator, value = line.partition(":")
+        # A blank line or anything else that is not a header ends the header block
+        if not separator or not name or " " in name:
+            break
+
+        name = name.lower()
+        if name in fields:
+            current = (name, [value.lstrip(" \t")])
+    else:
+        if current is not None:
+            add_header(headers, *current)
+
+    return None if empty else headers
+
+
+def add_header(headers: dict[str, list[str]], name: str, lines: list[str]) -> None:
+    headers.setdefault(name, []).append("".join(lines).rstrip("\r\n"))
@@ -3,14 +3,32 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-import re
+import os
 import sys
-from importlib.metadata import Distribution, DistributionFinder
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING
 
-from packaging.markers import default_environment
+from dep_sync._cache import fingerprint, trusted
+from dep_sync._dependency_set import CheckKind, CompiledDependency, compile_dependencies
+from dep_sync._discovery import scan_directory
+from dep_sync._markers import MarkerEnvironment
+from dep_sync._utils import canonical_name
+from dep_sync._vcs import GitRemotes, vcs_pinned, vcs_reference
 
-from dep_sync._dependency import Dependency
-from dep_sync._utils import path_from_url
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from importlib.metadata import Distribution
+    from typing import Any, TypeVar
+
+    from dep_sync._dependency import Dependency
+    from dep_sync._dependency_set import DependencySet
+    from dep_sync._discovery import DistributionRecord
+    from dep_sync._markers import CompiledMarker
+    from dep_sync._references import DirectReference, DirectReferenceIndex
+    from dep_sync._stats import Stats
+
+    T = TypeVar("T")
 
 
 class DependencyState:
@@ -19,36 +37,214 @@ class DependencyState:
     [`dep_sync.InstalledDistributions.dependency_state`][] method.
     """
 
-    __slots__ = ("missing", "not_required", "satisfied")
+    __slots__ = ("missing", "not_required", "satisfied", "stats")
 
-    def __init__(self, *, satisfied: list[Dependency], missing: list[Dependency], not_required: list[str]) -> None:
+    def __init__(
+        self,
+        *,
+        satisfied: list[Dependency],
+        missing: list[Dependency],
+        not_required: list[str],
+        stats: Stats | None = None,
+    ) -> None:
         self.satisfied = tuple(satisfied)
         self.missing = tuple(missing)
         self.not_required = tuple(not_required)
+        # The statistics of the check if they were being collected
+        self.stats = stats
+
+
+class UnsatisfiedReason:
+    """
+    The reasons for which a dependency is not satisfied as yielded by the
+    [`dep_sync.InstalledDistributions.iter_dependency_state`][] method.
+    """
+
+    # No distribution is installed for the project
+    NOT_INSTALLED = "not-installed"
+    # The version of the installed distribution is not allowed by the specifier
+    VERSION_MISMATCH = "version-mismatch"
+    # A requested extra is not provided by the installed distribution or its requirements are not satisfied
+    EXTRA_MISSING = "extra-missing"
+    # The installed distribution was not installed from the requested direct reference
+    URL_MISMATCH = "url-mismatch"
+    # The installed distribution is not the latest commit of the requested Git revision
+    STALE_VCS_COMMIT = "stale-vcs-commit"
+    # The remote Git repository could not be listed to determine the latest commit of the requested revision
+    VCS_UNREACHABLE = "vcs-unreachable"
+
+
+class SyncPlan:
+    """
+    Represents the changes required to synchronize a Python environment with dependencies as returned by the
+    [`dep_sync.InstalledDistributions.plan`][] method.
+    """
+
+    __slots__ = ("orphans", "satisfied", "stats", "to_install", "to_upgrade")
+
+    def __init__(
+        self,
+        *,
+        satisfied: list[Dependency],
+        to_install: list[Dependency],
+        to_upgrade: list[Dependency],
+        orphans: list[str],
+        stats: Stats | None = None,
+    ) -> None:
+        self.satisfied = tuple(satisfied)
+        # Dependencies without an installed distribution
+        self.to_install = tuple(to_install)
+        # Dependencies with an installed distribution that does not satisfy them
+        self.to_upgrade = tuple(to_upgrade)
+        # The names of installed distributions that are not required, directly or transitively, by the dependencies
+        self.orphans = tuple(orphans)
+        # The statistics of the check if they were being collected
+        self.stats = stats
+
+
+class ScannedEntry:
+    """
+    The distributions found in a search path entry along with the state of the entry when it was scanned.
+    """
+
+    __slots__ = ("fingerprint", "path", "records", "scanned_at")
+
+    def __init__(self, path: str, fingerprint: list[int] | None, records: list[DistributionRecord], scanned_at: int):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.records = records
+        self.scanned_at = scanned_at
+
+    def changed(self) -> bool:
+        # Entries that were modified too close to when they were scanned might have changed again since
+        if self.fingerprint is not None and not trusted(self.fingerprint, self.scanned_at):
+            return True
+
+        return fingerprint(self.path) != self.fingerprint
 
 
 class InstalledDistributions:
     """
     Represents the installed distributions within a Python environment. This adds caching to the distribution
     discovery process for improved performance and should be used instead of the standalone functions when the
-    state of the environment would not change between calls.
+    environment is checked more than once.
+
+    If the environment may change between calls, for example because distributions were installed, call the
+    [`refresh`][dep_sync.InstalledDistributions.refresh] method or enable `auto_refresh` to have every check do so.
+    Only the search path entries that changed are scanned again.
+
+    Distributions are discovered by scanning the metadata directories of each search path entry, in order, only
+    reading metadata files when a directory's name is insufficient to determine the project name and version or
+    when the checks require more information such as extras or direct references.
+
+    Dependencies on Git repositories that do not pin a commit are verified by listing the references of the
+    remote repository. Every remote is listed at most once per instance and the remotes required by a batch of
+    dependencies are listed concurrently using up to `vcs_workers` threads. If a `cache_dir` is provided, the
+    resolved revisions are also persisted there and trusted for `vcs_cache_ttl` seconds. In `offline` mode, Git is
+    never executed and the installed commits are assumed to be current unless a cached resolution says otherwise.
+
+    Unless `share_entries` is disabled, the distributions found in every search path entry are shared with the other
+    instances in the process whose search paths include the same directory, such that it is only scanned once.
+    Entries are validated in the same way as when refreshing, and the least recently used entries are evicted once
+    100,000 distributions are retained.
+
+    Search path entries are scanned one at a time, in order, and only until the distributions being checked are
+    found. For slow file systems such as network mounts, `scan_workers` may be set to instead scan every entry
+    concurrently using that many threads, including the metadata files that must be read to discover the
+    distributions. Distributions found in earlier entries still take precedence.
+
+    The same dependencies may be checked against many environments by passing a [`dep_sync.DependencySet`][]
+    instead of a list to any of the methods that check dependencies, so that they are only prepared once.
+
+    If a `cache_dir` is provided, an index of the distributions in every search path entry will be persisted
+    there. Subsequent instances will validate each entry by the modification time and inode of its directory and
+    will only scan the entries that have changed.
 
     Parameters:
         sys_path: The list of directories to search for installed distributions, defaulting to [`sys.path`][].
         environment: The marker environment, defaulting to [`packaging.markers.default_environment`][].
+        cache_dir: The directory in which to persist the index of installed distributions.
+        vcs_timeout: The number of seconds after which listing the references of a remote repository fails.
+        vcs_workers: The maximum number of remote repositories to list concurrently, defaulting to 8.
+        vcs_cache_ttl: The number of seconds for which cached resolutions of Git revisions are trusted.
+        offline: Whether to avoid executing Git, relying on cached resolutions and installed commits.
+        auto_refresh: Whether to detect changes to the environment before every check.
+        collect_stats: Whether to collect [`stats`][dep_sync.InstalledDistributions.stats] about the work performed.
+        stats_hook: A callable that is passed the [`dep_sync.Stats`][] of every check, implying `collect_stats`.
+        share_entries: Whether to share the distributions found in search path entries with other instances.
+        scan_workers: The number of threads with which to scan search path entries concurrently.
     """
 
-    def __init__(self, *, sys_path: list[str] | None = None, environment: dict[str, str] | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        sys_path: list[str] | None = None,
+        environment: dict[str, str] | None = None,
+        cache_dir: str | None = None,
+        vcs_timeout: float | None = None,
+        vcs_workers: int | None = None,
+        vcs_cache_ttl: float = 60,
+        offline: bool = False,
+        auto_refresh: bool = False,
+        collect_stats: bool = False,
+        stats_hook: Callable[[Stats], None] | None = None,
+        share_entries: bool = True,
+        scan_workers: int | None = None,
+    ) -> None:
+        if environment is None:
+            from packaging.markers import default_environment
+
+            environment = default_environment()  # type: ignore[assignment]
+
         self.__sys_path: list[str] = sys.path if sys_path is None else sys_path
-        self.__environment: dict[str, str] = (
-            default_environment() if environment is None else environment  # type: ignore[assignment]
-        )
-        self.__resolver = Distribution.discover(context=DistributionFinder.Context(path=self.__sys_path))
-        self.__distributions: dict[str, Distribution] = {}
+        self.__environment: dict[str, str] = environment  # type: ignore[assignment]
+        self.__marker_environment = MarkerEnvironment(self.__environment)
+        self.__cache_dir = cache_dir
+        self.__auto_refresh = auto_refresh
+        self.__scan_workers = scan_workers
+        self.__resolver = self.__resolve()
+        self.__scanned_entries: dict[str, ScannedEntry] = {}
+        self.__stale_records: dict[str, tuple[DistributionRecord, int]] = {}
+        self.__distributions: dict[str, DistributionRecord] = {}
         self.__search_exhausted = False
-        self.__canonical_regex = re.compile(r"[-_.]+")
+        self.__compiled_requirements: dict[str, list[CompiledDependency]] = {}
+        self.__requirements_by_extra: dict[tuple[str, str], list[CompiledDependency]] = {}
+        self.__extras_satisfied: dict[tuple[str, str], bool] = {}
+        self.__extras_pending: set[tuple[str, str]] = set()
+        self.__extras_assumed: list[tuple[str, str]] = []
+        self.__requires: dict[str, list[str]] | None = None
+        self.__required_by: dict[str, list[str]] | None = None
+        self.__direct_references: DirectReferenceIndex | None = None
+        self.__stats: Stats | None = None
+        self.__stats_hook = stats_hook
+        # Held by the worker threads of asynchronous checks
+        self.__lock = threading.Lock()
+        if collect_stats or stats_hook is not None:
+            from dep_sync._stats import Stats
+
+            self.__stats = Stats()
+
+        # Distributions found by instances that collect statistics are never shared because they record their work
+        self.__share_entries = share_entries and self.__stats is None
+
+        self.__git_remotes = GitRemotes(
+            timeout=vcs_timeout,
+            workers=vcs_workers,
+            cache_dir=cache_dir,
+            cache_ttl=vcs_cache_ttl,
+            offline=offline,
+            stats=self.__stats,
+        )
+
+    @property
+    def stats(self) -> Stats | None:
+        """
+        The statistics collected over the lifetime of this instance, or `None` if they are not being collected.
+        Every [`dep_sync.DependencyState`][] also has the statistics of only the check that produced it.
+        """
+        return self.__stats
 
-    def dependencies_satisfied(self, dependencies: list[Dependency]) -> bool:
+    def dependencies_satisfied(self, dependencies: list[Dependency] | DependencySet) -> bool:
         """
         This should be preferred for simple checks as the discovery process halts when a dependency is not satisfied.
 
@@ -58,9 +254,17 @@ class InstalledDistributions:
         Returns:
             Whether all the dependencies are satisfied.
         """
-        return all(self.__satisfied(dependency) for dependency in dependencies)
+        snapshot = None if self.__stats is None else self.__stats.copy()
+        if self.__auto_refresh:
+            self.refresh()
+
+        dependency_set = compile_dependencies(dependencies)
+        self.__prefetch_git_remotes(dependency_set)
+        return self.__check_satisfied(dependency_set, snapshot)
 
-    def dependency_state(self, dependencies: list[Dependency], *, exhaustive: bool = False) -> DependencyState:
+    def dependency_state(
+        self, dependencies: list[Dependency] | DependencySet, *, exhaustive: bool = False
+    ) -> DependencyState:
         """
         This should be preferred for more complex checks as it returns the state of all dependencies. If the
         `exhaustive` argument is `True`, the `not_required` attribute of the returned [`dep_sync.DependencyState`][]
@@ -74,32 +278,122 @@ class InstalledDistributions:
         Returns:
             An instance of [`dep_sync.DependencyState`][].
         """
+        snapshot = None if self.__stats is None else self.__stats.copy()
+        if self.__auto_refresh:
+            self.refresh()
+
+        dependency_set = compile_dependencies(dependencies)
+        self.__prefetch_git_remotes(dependency_set)
+        return self.__check_state(dependency_set, snapshot, exhaustive=exhaustive)
+
+    async def async_dependencies_satisfied(
+        self, dependencies: list[Dependency] | DependencySet, *, timeout: float | None = None
+    ) -> bool:
+        """
+        The asynchronous counterpart of the
+        [`dependencies_satisfied`][dep_sync.InstalledDistributions.dependencies_satisfied] method. See the
+        [`async_dependency_state`][dep_sync.InstalledDistributions.async_dependency_state] method for details.
+
+        Parameters:
+            dependencies: The dependencies to check.
+            timeout: The number of seconds after which the check is cancelled.
+
+        Returns:
+            Whether all the dependencies are satisfied.
+
+        Raises:
+            asyncio.TimeoutError: If the check did not finish within the `timeout`.
+        """
+        return await self.__check_async(self.__check_satisfied, compile_dependencies(dependencies), timeout)
+
+    async def async_dependency_state(
+        self, dependencies: list[Dependency] | DependencySet, *, exhaustive: bool = False, timeout: float | None = None
+    ) -> DependencyState:
+        """
+        The asynchronous counterpart of the [`dependency_state`][dep_sync.InstalledDistributions.dependency_state]
+        method. Distributions are discovered and checked in the default executor of the running event loop and the
+        references of remote Git repositories are listed with asynchronous subprocesses, such that the event loop is
+        never blocked and many environments may be checked concurrently.
+
+        When cancelled, Git processes are killed immediately while work that was already submitted to the executor
+        finishes in the background. Asynchronous checks of the same instance are performed one at a time.
+
+        Parameters:
+            dependencies: The dependencies to check.
+            exhaustive: Whether to search for all distributions that are not required.
+            timeout: The number of seconds after which the check is cancelled.
+
+        Returns:
+            An instance of [`dep_sync.DependencyState`][].
+
+        Raises:
+            asyncio.TimeoutError: If the check did not finish within the `timeout`.
+        """
+        from functools import partial
+
+        check = partial(self.__check_state, exhaustive=exhaustive)
+        return await self.__check_async(check, compile_dependencies(dependencies), timeout)
+
+    def __check_satisfied(self, dependencies: DependencySet, snapshot: Stats | None) -> bool:
+        satisfied = all(self.__satisfied(entry) for entry in dependencies.entries)
+        if snapshot is not None:
+            self.__report_stats(snapshot)
+
+        return satisfied
+
+    def __check_state(
+        self, dependencies: DependencySet, snapshot: Stats | None, *, exhaustive: bool
+    ) -> DependencyState:
         satisfied: list[Dependency] = []
         missing: list[Dependency] = []
         not_required: list[str] = []
         names: set[str] = set()
-        for dependency in dependencies:
-            names.add(self.__normalize_name(dependency.name))
-            if self.__satisfied(dependency):
-                satisfied.append(dependency)
+        for entry in dependencies.entries:
+            names.add(entry.name)
+            if self.__satisfied(entry):
+                satisfied.append(entry.dependency)
             else:
-                missing.append(dependency)
+                missing.append(entry.dependency)
 
         if exhaustive:
-            if not self.__search_exhausted:
-                for distribution in self.__resolver:
-                    name = distribution.metadata["Name"]
-                    if name is None:  # no cov
-                        continue
+            self.__exhaust_search()
+            not_required.extend(name for name in self.__distributions if name not in names)
 
-                    name = self.__normalize_name(name)
-                    self.__distributions[name] = distribution
+        stats = None if snapshot is None else self.__report_stats(snapshot)
+        return DependencyState(satisfied=satisfied, missing=missing, not_required=not_required, stats=stats)
 
-                self.__search_exhausted = True
+    def iter_dependency_state(
+        self, dependencies: list[Dependency] | DependencySet
+    ) -> Iterator[tuple[Dependency, bool, str | None]]:
+        """
+        This should be preferred for very large sets of dependencies as the state of every dependency is yielded as
+        soon as it is known, allowing consumers to act on it immediately or to stop early. Dependencies that do not
+        apply to the environment because of their markers are satisfied.
 
-            not_required.extend(name for name in self.__distributions if name not in names)
+        Parameters:
+            dependencies: The dependencies to check.
+
+        Yields:
+            A tuple containing the dependency, whether it is satisfied and, if it is not, one of the
+                [`dep_sync.UnsatisfiedReason`][] values explaining why.
+        """
+        snapshot = None if self.__stats is None else self.__stats.copy()
+        try:
+            if self.__auto_refresh:
+                self.refresh()
+
+            dependency_set = compile_dependencies(dependencies)
+            self.__prefetch_git_remotes(dependency_set)
+            for entry in dependency_set.entries:
+                if entry.marker and not self.__marker_satisfied(entry.marker):
+                    yield entry.dependency, True, None
+                    continue
 
-        return DependencyState(satisfied=satisfied, missing=missing, not_required=not_required)
+                reason = self.__unsatisfied_reason(entry)
+                yield entry.dependency, reason is None, reason
+        finally:
+            if snapshot is not None:
+                self.__report_stats(snapshot)
 
     def get(self, project_name: str) -> Distribution | None:
         """
@@ -109,126 +403,528 @@ class InstalledDistributions:
         Returns:
             The distribution for the given project name, or `None` if a distribution is not found.
         """
-        project_name = self.__canonical_regex.sub("-", project_name).lower()
-        possible_distribution = self.__distributions.get(project_name)
-        if possible_distribution is not None:
-            return possible_distribution
+        if self.__auto_refresh:
+            self.refresh()
+
+        record = self.__get_record(canonical_name(project_name))
+        return None if record is None else record.distribution
+
+    def plan(self, dependencies: list[Dependency] | DependencySet) -> SyncPlan:
+        """
+        Determine the changes required to synchronize the environment with the dependencies. Unlike the
+        `not_required` attribute of [`dep_sync.DependencyState`][], the `orphans` attribute of the returned
+        [`dep_sync.SyncPlan`][] only contains the distributions that are not reachable from the dependencies by
+        following the requirements of installed distributions, including those of the requested extras.
+
+        Parameters:
+            dependencies: The dependencies to synchronize with.
+
+        Returns:
+            An instance of [`dep_sync.SyncPlan`][].
+        """
+        satisfied: list[Dependency] = []
+        to_install: list[Dependency] = []
+        to_upgrade: list[Dependency] = []
+        snapshot = None if self.__stats is None else self.__stats.copy()
+        if self.__auto_refresh:
+            self.refresh()
+
+        dependency_set = compile_dependencies(dependencies)
+        self.__prefetch_git_remotes(dependency_set)
+        pending: list[tuple[str, str | None]] = []
+        for entry in dependency_set.entries:
+            if entry.marker and not self.__marker_satisfied(entry.marker):
+                satisfied.append(entry.dependency)
+                continue
+
+            reason = self.__unsatisfied_reason(entry)
+            if reason is None:
+                satisfied.append(entry.dependency)
+            elif reason == UnsatisfiedReason.NOT_INSTALLED:
+                to_install.append(entry.dependency)
+            else:
+                to_upgrade.append(entry.dependency)
+
+            pending.append((entry.name, None))
+            pending.extend((entry.name, extra) for extra in entry.extras)
+
+        # Every distribution and extra is visited at most once
+        visited: set[tuple[str, str | None]] = set()
+        while pending:
+            node = pending.pop()
+            if node in visited:
+                continue
+
+            visited.add(node)
+            for requirement in self.__node_requirements(*node):
+                pending.append((requirement.name, None))
+                pending.extend((requirement.name, extra) for extra in requirement.extras)
+
+        reachable = {name for name, _ in visited}
+        self.__exhaust_search()
+        orphans = [name for name in self.__distributions if name not in reachable]
+
+        stats = None if snapshot is None else self.__report_stats(snapshot)
+        return SyncPlan(satisfied=satisfied, to_install=to_install, to_upgrade=to_upgrade, orphans=orphans, stats=stats)
+
+    def requires(self, project_name: str) -> list[str]:
+        """
+        Parameters:
+            project_name: The name of the project.
+
+        Returns:
+            The names of the projects that the installed distribution requires in this environment, excluding the
+            requirements of extras, or an empty list if a distribution is not found.
+        """
+        if self.__auto_refresh:
+            self.refresh()
+
+        return self.__dependency_graph()[0].get(canonical_name(project_name), [])
+
+    def required_by(self, project_name: str) -> list[str]:
+        """
+        Parameters:
+            project_name: The name of the project.
+
+        Returns:
+            The names of the installed distributions that require the project in this environment, excluding the
+            requirements of extras.
+        """
+        if self.__auto_refresh:
+            self.refresh()
+
+        return self.__dependency_graph()[1].get(canonical_name(project_name), [])
+
+    def installed_from(self, url_or_path: str) -> str | None:
+        """
+        Find the distribution that was installed from a URL or local path, as recorded by its `direct_url.json`
+        file. The `direct_url.json` files of every distribution are read once, the first time this is called.
+
+        Parameters:
+            url_or_path: A URL, such as `git+https://github.com/org/repo` or `file:///path/to/project`, or the path
+                to a local directory or file.
+
+        Returns:
+            The name of the project, or `None` if no distribution was installed from the URL or path.
+        """
+        if self.__auto_refresh:
+            self.refresh()
+
+        if self.__direct_references is None:
+            from dep_sync._references import DirectReferenceIndex
+
+            self.__exhaust_search()
+            index = DirectReferenceIndex()
+            for name, record in self.__distributions.items():
+                reference = record.direct_reference
+                if reference is not None:
+                    index.add(name, reference)
+
+            self.__direct_references = index
+
+        return self.__direct_references.find(url_or_path)
+
+    def refresh(self) -> bool:
+        """
+        Detect changes to the environment since distributions were discovered so that subsequent calls reflect its
+        current state. Only the search path entries that have changed since they were scanned are scanned again,
+        and distributions whose metadata directories did not change retain any metadata that was already read.
+
+        Returns:
+            Whether any changes were detected.
+        """
+        changed_entries = [entry for entry, scanned_entry in self.__scanned_entries.items() if scanned_entry.changed()]
+        if not changed_entries:
+            return False
+
+        for entry in changed_entries:
+            scanned_entry = self.__scanned_entries.pop(entry)
+            for record in scanned_entry.records:
+                self.__stale_records[record.path] = (record, scanned_entry.scanned_at)
+
+        self.__resolver = self.__resolve()
+        self.__distributions.clear()
+        self.__search_exhausted = False
+        self.__compiled_requirements.clear()
+        self.__requirements_by_extra.clear()
+        self.__extras_satisfied.clear()
+        self.__requires = None
+        self.__required_by = None
+        self.__direct_references = None
+        return True
+
+    def __exhaust_search(self) -> None:
+        if not self.__search_exhausted:
+            for record in self.__resolver:
+                self.__distributions.setdefault(record.name, record)
+
+            self.__search_exhausted = True
+
+    def __dependency_graph(self) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        if self.__requires is None or self.__required_by is None:
+            self.__exhaust_search()
+            requires: dict[str, list[str]] = {}
+            required_by: dict[str, list[str]] = {}
+            for name in self.__distributions:
+                requirement_names = list(
+                    dict.fromkeys(requirement.name for requirement in self.__node_requirements(name, None))
+                )
+                requires[name] = requirement_names
+                for requirement_name in requirement_names:
+                    if requirement_name in self.__distributions:
+                        required_by.setdefault(requirement_name, []).append(name)
+
+            self.__requires = requires
+            self.__required_by = required_by
+
+        return self.__requires, self.__required_by
+
+    def __node_requirements(self, project_name: str, extra: str | None) -> list[CompiledDependency]:
+        distribution = self.__get_record(project_name)
+        if distribution is None:
+            return []
+
+        if extra is not None:
+            if extra not in distribution.available_extras:
+                return []
+
+            return self.__extra_requirements(distribution, distribution.available_extras[extra])
+
+        return [
+            requirement
+            for requirement in self.__record_requirements(distribution)
+            if not requirement.marker or self.__marker_satisfied(requirement.marker)
+        ]
+
+    def __report_stats(self, snapshot: Stats) -> Stats:
+        stats = self.__stats.since(snapshot)  # type: ignore[union-attr]
+        if self.__stats_hook is not None:
+            self.__stats_hook(stats)
+
+        return stats
+
+    def __resolve(self) -> Iterator[DistributionRecord]:
+        # Distributions are yielded in the same order as `importlib.metadata.Distribution.discover` would for the
+        # search path, with entries only being scanned once the previous entries have been exhausted
+        if self.__cache_dir is None:
+            self.__scan_concurrently(scan_directory)
+            for entry in self.__sys_path:
+                yield from self.__scan_entry(entry, scan_directory)
+
+            return
+
+        from dep_sync._cache import DistributionIndex
+
+        index = DistributionIndex(self.__sys_path, self.__cache_dir, stats=self.__stats)
+        self.__scan_concurrently(index.scan)
+        records = [record for entry in self.__sys_path for record in self.__scan_entry(entry, index.scan)]
+        index.save()
+        yield from records
+
+    def __scan_concurrently(self, scan: Callable[[str], Iterable[DistributionRecord]]) -> None:
+        # Entries are only scanned concurrently when there is more than one worker and entry
+        if self.__scan_workers is None or self.__scan_workers <= 1:
+            return
+
+        pending = [entry for entry in dict.fromkeys(self.__sys_path) if entry not in self.__scanned_entries]
+        if len(pending) <= 1:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The scanned entries are retained by the instance and then yielded in search path order by the resolver
+        with ThreadPoolExecutor(max_workers=min(len(pending), self.__scan_workers)) as executor:
+            for _ in executor.map(lambda entry: self.__scan_entry(entry, scan), pending):
+                pass
+
+    def __scan_entry(self, entry: str, scan: Callable[[str], Iterable[DistributionRecord]]) -> list[DistributionRecord]:
+        scanned_entry = self.__scanned_entries.get(entry)
+        if scanned_entry is not None:
+            return scanned_entry.records
+
+        # Relative entries depend on the working directory
+        share_entry = self.__share_entries and os.path.isabs(entry)
+        if share_entry:
+            from dep_sync._registry import ENTRY_REGISTRY
+
+            scanned_entry = ENTRY_REGISTRY.get(entry)
+            if scanned_entry is not None:
+                self.__scanned_entries[entry] = scanned_entry
+                return scanned_entry.records
+
+        import time
+
+        now = time.time_ns()
+        start = perf_counter()
+        entry_fingerprint = fingerprint(entry)
+        records = []
+        for record in scan(entry):
+            # Distributions whose metadata directories have not changed since they were last seen are reused
+            stale_record = self.__stale_records.pop(record.path, None)
+            if stale_record is None:
+                records.append(record)
+                continue
+
+            record_fingerprint = fingerprint(record.path)
+            if record_fingerprint is not None and trusted(record_fingerprint, stale_record[1]):
+                records.append(stale_record[0])
+            else:
+                records.append(record)
+
+        scanned_entry = ScannedEntry(entry, entry_fingerprint, records, now)
+        self.__scanned_entries[entry] = scanned_entry
+        if share_entry:
+            ENTRY_REGISTRY.add(scanned_entry)
+
+        if self.__stats is not None:
+            self.__stats.count("entries_scanned")
+            self.__stats.count("distributions_scanned", len(records))
+            self.__stats.add_time("discovery", perf_counter() - start)
+            for record in records:
+                record.stats = self.__stats
+
+        return records
+
+    def __get_record(self, project_name: str) -> DistributionRecord | None:
+        possible_record = self.__distributions.get(project_name)
+        if possible_record is not None:
+            return possible_record
 
         if self.__search_exhausted:
             return None
 
-        for distribution in self.__resolver:
-            name = distribution.metadata["Name"]
-            if name is None:  # no cov
+        for record in self.__resolver:
+            # The first distribution found on the search path takes precedence
+            if record.name in self.__distributions:
                 continue
 
-            name = self.__normalize_name(name)
-            self.__distributions[name] = distribution
-            if name == project_name:
-                return distribution
+            self.__distributions[record.name] = record
+            if record.name == project_name:
+                return record
 
         self.__search_exhausted = True
         return None
 
-    def __normalize_name(self, name: str) -> str:
-        return self.__canonical_regex.sub("-", name).lower()
+    async def __check_async(self, check: Callable[..., T], dependencies: DependencySet, timeout: float | None) -> T:
+        import asyncio
 
-    def __satisfied(self, dependency: Dependency, *, environment: dict[str, str] | None = None) -> bool:
-        if environment is None:
-            environment = self.__environment
+        return await asyncio.wait_for(self.__run_async(check, dependencies), timeout)
+
+    async def __run_async(self, check: Callable[..., T], dependencies: DependencySet) -> T:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        snapshot = None if self.__stats is None else self.__stats.copy()
+        references, pending = await loop.run_in_executor(None, self.__locked, self.__pending_git_remotes, dependencies)
+        await self.__git_remotes.async_prefetch(pending)
+        return await loop.run_in_executor(
+            None, self.__locked, self.__finish_async_check, check, dependencies, references, pending, snapshot
+        )
+
+    def __locked(self, func: Callable[..., T], *args: Any) -> T:
+        with self.__lock:
+            return func(*args)
+
+    def __pending_git_remotes(self, dependencies: DependencySet) -> tuple[list[tuple[str, str | None]], list[str]]:
+        if self.__auto_refresh:
+            self.refresh()
+
+        references = self.__git_references(dependencies)
+        return references, self.__git_remotes.pending(references)
+
+    def __finish_async_check(
+        self,
+        check: Callable[..., T],
+        dependencies: DependencySet,
+        references: list[tuple[str, str | None]],
+        pending: list[str],
+        snapshot: Stats | None,
+    ) -> T:
+        self.__git_remotes.cache_resolutions(references, pending)
+        return check(dependencies, snapshot=snapshot)
+
+    def __prefetch_git_remotes(self, dependencies: DependencySet) -> None:
+        self.__git_remotes.prefetch(self.__git_references(dependencies))
+
+    def __git_references(self, dependencies: DependencySet) -> list[tuple[str, str | None]]:
+        references: list[tuple[str, str | None]] = []
+        for entry in dependencies.vcs_entries:
+            if entry.marker and not self.__marker_satisfied(entry.marker):
+                continue
+
+            distribution = self.__get_record(entry.name)
+            if distribution is None:
+                continue
 
-        if dependency.marker and not dependency.marker.evaluate(environment):
+            reference = git_reference(entry, distribution.direct_reference)
+            if reference is not None:
+                references.append(reference)
+
+        return references
+
+    def __satisfied(self, entry: CompiledDependency) -> bool:
+        if entry.marker and not self.__marker_satisfied(entry.marker):
             return True
 
-        distribution = self.get(dependency.name)
+        return self.__unsatisfied_reason(entry) is None
+
+    def __unsatisfied_reason(self, entry: CompiledDependency) -> str | None:
+        distribution = self.__get_record(entry.name)
         if distribution is None:
-            return False
+            return UnsatisfiedReason.NOT_INSTALLED
 
-        extras = dependency.extras
-        if extras:
-            transitive_dependencies: list[str] = distribution.metadata.get_all("Requires-Dist", [])
-            if not transitive_dependencies:
-                return False
+        # The version is checked first as it does not require reading metadata
+        if entry.specifier is not None and not entry.specifier.contains(distribution.parsed_version):
+            return UnsatisfiedReason.VERSION_MISMATCH
 
-            available_extras: list[str] = distribution.metadata.get_all("Provides-Extra", [])
+        if entry.kind == CheckKind.PLAIN:
+            return None
 
-            for dependency_string in transitive_dependencies:
-                transitive_dependency = Dependency(dependency_string)
-                if not transitive_dependency.marker:
-                    continue
+        for extra in entry.extras:
+            if not self.__extra_satisfied(distribution, extra):
+                return UnsatisfiedReason.EXTRA_MISSING
 
-                for extra in extras:
-                    # FIXME: This may cause a build to never be ready if newer versions do not provide the desired
-                    # extra and it's just a user error/typo. See: https://github.com/pypa/pip/issues/7122
-                    if extra not in available_extras:
-                        return False
+        if entry.url is None:
+            return None
 
-                    extra_environment = dict(environment)
-                    extra_environment["extra"] = extra
-                    if not self.__satisfied(transitive_dependency, environment=extra_environment):
-                        return False
+        return direct_reference_reason(entry, distribution.direct_reference, self.__git_remotes)
 
-        if dependency.specifier and not dependency.specifier.contains(distribution.version):
-            return False
+    def __marker_satisfied(self, marker: CompiledMarker, extra: str | None = None) -> bool:
+        if self.__stats is None:
+            return marker.evaluate(self.__marker_environment, extra)
+
+        self.__stats.count("marker_evaluations")
+        with self.__stats.time("markers"):
+            return marker.evaluate(self.__marker_environment, extra)
 
-        if not dependency.url:
+    def __extra_satisfied(self, distribution: DistributionRecord, extra: str) -> bool:
+        key = (distribution.name, extra)
+        satisfied = self.__extras_satisfied.get(key)
+        if satisfied is not None:
+            return satisfied
+
+        # Extras may depend on themselves either directly or through other distributions, in which case the
+        # requirement is assumed to be satisfied and the outcome is decided by the rest of the requirements
+        if key in self.__extras_pending:
+            self.__extras_assumed.append(key)
             return True
 
-        # TODO: handle https://discuss.python.org/t/11938
-        direct_url_file = distribution.read_text("direct_url.json")
-        if direct_url_file is None:
+        # FIXME: This may cause a build to never be ready if newer versions do not provide the desired
+        # extra and it's just a user error/typo. See: https://github.com/pypa/pip/issues/7122
+        available_extras = distribution.available_extras
+        if extra not in available_extras:
+            self.__extras_satisfied[key] = False
             return False
 
-        import json
-
-        # https://packaging.python.org/specifications/direct-url/
-        direct_url_data = json.loads(direct_url_file)
-        url = direct_url_data["url"]
-        if "dir_info" in direct_url_data:
-            dir_info = direct_url_data["dir_info"]
-            editable = dir_info.get("editable", False)
-            if editable != dependency.editable:
-                return False
-
-            if path_from_url(url) != dependency.path:
-                return False
-        elif "vcs_info" in direct_url_data:
-            vcs_info = direct_url_data["vcs_info"]
-            vcs = vcs_info["vcs"]
-            commit_id = vcs_info["commit_id"]
-            requested_revision = vcs_info.get("requested_revision")
-
-            # Try a few variations, see https://peps.python.org/pep-0440/#direct-references
-            if (
-                requested_revision and dependency.url == f"{vcs}+{url}@{requested_revision}#{commit_id}"
-            ) or dependency.url == f"{vcs}+{url}@{commit_id}":
-                return True
-
-            if dependency.url in {f"{vcs}+{url}", f"{vcs}+{url}@{requested_revision}"}:
-                import subprocess
-
-                if vcs == "git":
-                    vcs_cmd = [vcs, "ls-remote", url]
-                    if requested_revision:
-                        vcs_cmd.append(requested_revision)
-                # TODO: support other VCS
-                else:  # no cov
-                    return False
-
-                result = subprocess.run(vcs_cmd, capture_output=True, text=True)  # noqa: PLW1510
-                if result.returncode or not result.stdout.strip():
-                    return False
-
-                latest_commit_id, *_ = result.stdout.split()
-                return commit_id == latest_commit_id
+        # Only the outermost extra is timed because the evaluation of extras is recursive
+        timed = self.__stats is not None and not self.__extras_pending
+        start = perf_counter() if timed else 0.0
+        assumptions = len(self.__extras_assumed)
+        self.__extras_pending.add(key)
+        try:
+            satisfied = all(
+                self.__unsatisfied_reason(transitive_entry) is None
+                for transitive_entry in self.__extra_requirements(distribution, available_extras[extra])
+            )
+        finally:
+            self.__extras_pending.discard(key)
+            if self.__stats is not None:
+                self.__stats.count("extras_evaluated")
+                if timed:
+                    self.__stats.add_time("extras", perf_counter() - start)
+
+        # Positive results that relied on the assumption of an extra that is still being evaluated may not be
+        # cached because that extra might turn out to be unsatisfied
+        remaining_assumptions = [assumed for assumed in self.__extras_assumed[assumptions:] if assumed != key]
+        self.__extras_assumed[assumptions:] = remaining_assumptions
+        if not satisfied or not remaining_assumptions:
+            self.__extras_satisfied[key] = satisfied
+
+        return satisfied
+
+    def __extra_requirements(self, distribution: DistributionRecord, extra: str) -> list[CompiledDependency]:
+        key = (distribution.name, canonical_name(extra))
+        requirements = self.__requirements_by_extra.get(key)
+        if requirements is not None:
+            return requirements
+
+        requirements = [
+            requirement
+            for requirement in self.__record_requirements(distribution)
+            if requirement.marker and self.__marker_satisfied(requirement.marker, extra)
+        ]
+        self.__requirements_by_extra[key] = requirements
+        return requirements
+
+    def __record_requirements(self, distribution: DistributionRecord) -> list[CompiledDependency]:
+        # Compiled once per distribution so that markers are never compiled while they are being evaluated
+        requirements = self.__compiled_requirements.get(distribution.name)
+        if requirements is None:
+            requirements = self.__compiled_requirements[distribution.name] = [
+                CompiledDependency(requirement) for requirement in distribution.requirements
+            ]
+
+        return requirements
+
+
+def git_reference(entry: CompiledDependency, direct_reference: DirectReference | None) -> tuple[str, str | None] | None:
+    """
+    Returns:
+        The remote URL and requested revision that must be resolved to check a dependency on a Git repository against
+        the direct reference of the installed distribution, or `None` if the remote does not need to be listed.
+    """
+    if direct_reference is None or direct_reference.vcs is None or vcs_pinned(entry.url, direct_reference.data):  # type: ignore[arg-type]
+        return None
 
-            return False
+    return vcs_reference(entry.url, direct_reference.data)  # type: ignore[arg-type]
+
+
+def direct_reference_reason(
+    entry: CompiledDependency, direct_reference: DirectReference | None, git_remotes: GitRemotes
+) -> str | None:
+    """
+    Returns:
+        One of the [`dep_sync.UnsatisfiedReason`][] values if the direct reference of the installed distribution does
+        not satisfy the dependency on a URL, otherwise `None`.
+    """
+    # TODO: handle https://discuss.python.org/t/11938
+    # https://packaging.python.org/specifications/direct-url/
+    if direct_reference is None:
+        return UnsatisfiedReason.URL_MISMATCH
+
+    if direct_reference.directory:
+        if direct_reference.editable != entry.editable or direct_reference.path != entry.path:
+            return UnsatisfiedReason.URL_MISMATCH
+    elif direct_reference.vcs is not None:
+        direct_url_data = direct_reference.data
+        if vcs_pinned(entry.url, direct_url_data):  # type: ignore[arg-type]
+            return None
+
+        reference = vcs_reference(entry.url, direct_url_data)  # type: ignore[arg-type]
+        if reference is None:
+            return UnsatisfiedReason.URL_MISMATCH
 
-        return url == dependency.url
+        if not git_remotes.is_current(*reference, direct_url_data["vcs_info"]["commit_id"]):
+            if git_remotes.unreachable(reference[0]):
+                return UnsatisfiedReason.VCS_UNREACHABLE
+
+            return UnsatisfiedReason.STALE_VCS_COMMIT
+
+        return None
+
+    return None if direct_reference.url == entry.url else UnsatisfiedReason.URL_MISMATCH
 
 
 def dependencies_satisfied(
-    dependencies: list[Dependency], *, sys_path: list[str] | None = None, environment: dict[str, str] | None = None
+    dependencies: list[Dependency],
+    *,
+    sys_path: list[str] | None = None,
+    environment: dict[str, str] | None = None,
+    cache_dir: str | None = None,
+    vcs_timeout: float | None = None,
+    vcs_workers: int | None = None,
+    vcs_cache_ttl: float = 60,
+    offline: bool = False,
 ) -> bool:
     """
     This is equivalent to creating an instance of [`InstalledDistributions`][dep_sync.InstalledDistributions] and
@@ -238,11 +934,24 @@ def dependencies_satisfied(
         dependencies: The dependencies to check.
         sys_path: The list of directories to search for installed distributions, defaulting to [`sys.path`][].
         environment: The marker environment, defaulting to [`packaging.markers.default_environment`][].
+        cache_dir: The directory in which to persist the index of installed distributions.
+        vcs_timeout: The number of seconds after which listing the references of a remote repository fails.
+        vcs_workers: The maximum number of remote repositories to list concurrently, defaulting to 8.
+        vcs_cache_ttl: The number of seconds for which cached resolutions of Git revisions are trusted.
+        offline: Whether to avoid executing Git, relying on cached resolutions and installed commits.
 
     Returns:
         Whether all the dependencies are satisfied.
     """
-    distributions = InstalledDistributions(sys_path=sys_path, environment=environment)
+    distributions = InstalledDistributions(
+        sys_path=sys_path,
+        environment=environment,
+        cache_dir=cache_dir,
+        vcs_timeout=vcs_timeout,
+        vcs_workers=vcs_workers,
+        vcs_cache_ttl=vcs_cache_ttl,
+        offline=offline,
+    )
     return distributions.dependencies_satisfied(dependencies)
 
 
@@ -252,6 +961,11 @@ def dependency_state(
     exhaustive: bool = False,
     sys_path: list[str] | None = None,
     environment: dict[str, str] | None = None,
+    cache_dir: str | None = None,
+    vcs_timeout: float | None = None,
+    vcs_workers: int | None = None,
+    vcs_cache_ttl: float = 60,
+    offline: bool = False,
 ) -> DependencyState:
     """
     This is equivalent to creating an instance of [`InstalledDistributions`][dep_sync.InstalledDistributions] and
@@ -260,9 +974,24 @@ def dependency_state(
     Parameters:
         dependencies: The dependencies to check.
         exhaustive: Whether to search for all distributions that are not required.
+        sys_path: The list of directories to search for installed distributions, defaulting to [`sys.path`][].
+        environment: The marker environment, defaulting to [`packaging.markers.default_environment`][].
+        cache_dir: The directory in which to persist the index of installed distributions.
+        vcs_timeout: The number of seconds after which listing the references of a remote repository fails.
+        vcs_workers: The maximum number of remote repositories to list concurrently, defaulting to 8.
+        vcs_cache_ttl: The number of seconds for which cached resolutions of Git revisions are trusted.
+        offline: Whether to avoid executing Git, relying on cached resolutions and installed commits.
 
     Returns:
         An instance of [`dep_sync.DependencyState`][].
     """
-    distributions = InstalledDistributions(sys_path=sys_path, environment=environment)
+    distributions = InstalledDistributions(
+        sys_path=sys_path,
+        environment=environment,
+        cache_dir=cache_dir,
+        vcs_timeout=vcs_timeout,
+        vcs_workers=vcs_workers,
+        vcs_cache_ttl=vcs_cache_ttl,
+        offline=offline,
+    )
     return distributions.dependency_state(dependencies, exhaustive=exhaustive)
@@ -0,0 +1,271 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dep_sync._dependency import Dependency
+    from dep_sync._dependency_set import CompiledDependency
+    from dep_sync._distributions import DependencyState
+    from dep_sync._references import DirectReference
+
+
+class EnvironmentCheckError(Exception):
+    """
+    Raised, or returned by [`dep_sync.dependency_states`][], when an environment could not be checked.
+
+    Parameters:
+        python: The path to the Python interpreter of the environment.
+        message: The reason for the failure.
+    """
+
+    def __init__(self, python: str, message: str) -> None:
+        super().__init__(f"{python}: {message}")
+
+        self.python = python
+        self.message = message
+
+
+def dependency_states(
+    environments: dict[str, list[Dependency]],
+    *,
+    exhaustive: bool = False,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    cache_dir: str | None = None,
+    in_interpreter: bool = False,
+) -> dict[str, DependencyState | EnvironmentCheckError]:
+    """
+    Check the dependencies of many Python environments concurrently. Every environment is inspected by running
+    its interpreter with `dep_sync.scripts.PYTHON_INFO_SCRIPT` after which its distributions are checked
+    in the same manner as [`dep_sync.dependency_state`][].
+
+    In `in_interpreter` mode, the check is instead performed by running each interpreter with
+    `dep_sync.scripts.DEPENDENCY_STATE_SCRIPT` such that distributions are discovered and markers are evaluated
+    by the interpreter itself in a single process. The script only requires the standard library so neither this
+    package nor its dependencies need to be importable by the interpreter. Dependencies on direct references are then
+    compared with the `direct_url.json` files that the interpreter found, listing the references of remote Git
+    repositories in the current process, and the `cache_dir` is only used to persist the resolved revisions.
+
+    Parameters:
+        environments: A mapping of paths to Python interpreters to the dependencies to check.
+        exhaustive: Whether to search for all distributions that are not required.
+        max_workers: The maximum number of environments to check concurrently.
+        timeout: The number of seconds after which the inspection of an interpreter fails.
+        cache_dir: The directory in which to persist the inspection of interpreters and the index of installed
+            distributions.
+        in_interpreter: Whether to perform the check within each interpreter rather than the current process.
+
+    Returns:
+        A mapping of paths to Python interpreters to an instance of [`dep_sync.DependencyState`][], or an instance
+        of [`dep_sync.EnvironmentCheckError`][] if the environment could not be checked.
+    """
+    if not environments:
+        return {}
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    check_environment = interpreter_dependency_state if in_interpreter else environment_dependency_state
+
+    def check(python: str) -> DependencyState | EnvironmentCheckError:
+        try:
+            return check_environment(
+                python, environments[python], exhaustive=exhaustive, timeout=timeout, cache_dir=cache_dir
+            )
+        except EnvironmentCheckError as e:
+            return e
+        except Exception as e:  # noqa: BLE001
+            return EnvironmentCheckError(python, f"{type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(environments, executor.map(check, environments)))
+
+
+def environment_dependency_state(
+    python: str,
+    dependencies: list[Dependency],
+    *,
+    exhaustive: bool = False,
+    timeout: float | None = None,
+    cache_dir: str | None = None,
+) -> DependencyState:
+    from dep_sync._distributions import InstalledDistributions
+
+    info = python_info(python, cache_dir=cache_dir, timeout=timeout)
+    distributions = InstalledDistributions(
+        sys_path=info["sys_path"], environment=info["environment"], cache_dir=cache_dir
+    )
+    return distributions.dependency_state(dependencies, exhaustive=exhaustive)
+
+
+def interpreter_dependency_state(
+    python: str,
+    dependencies: list[Dependency],
+    *,
+    exhaustive: bool = False,
+    timeout: float | None = None,
+    cache_dir: str | None = None,
+) -> DependencyState:
+    import json
+
+    from dep_sync._dependency_set import compile_dependencies
+    from dep_sync._references import DirectReference
+    from dep_sync.scripts import DEPENDENCY_STATE_SCRIPT
+
+    dependency_set = compile_dependencies(dependencies)
+    request = {
+        "dependencies": [
+            [
+                entry.name,
+                str(entry.specifier or ""),
+                list(entry.extras),
+                entry.marker and entry.marker.marker_string,
+                entry.url,
+            ]
+            for entry in dependency_set.entries
+        ],
+        "exhaustive": exhaustive,
+    }
+    output = run_script(python, DEPENDENCY_STATE_SCRIPT, timeout=timeout, stdin=json.dumps(request))
+    try:
+        response = json.loads(output)
+        satisfied = set(response["satisfied"])
+        indices = [index for index, _ in response["direct_urls"]]
+        entries = [dependency_set.entries[index] for index in indices]
+        direct_references = [
+            None if direct_url is None else DirectReference(direct_url) for _, direct_url in response["direct_urls"]
+        ]
+        not_required = response["not_required"]
+    except (IndexError, KeyError, TypeError, ValueError):
+        message = f"unexpected output: {output.strip()}"
+        raise EnvironmentCheckError(python, message) from None
+
+    reasons = direct_reference_reasons(entries, direct_references, cache_dir=cache_dir)
+    satisfied.update(index for index, reason in zip(indices, reasons) if reason is None)
+    return load_dependency_state(dependencies, {"satisfied": satisfied, "not_required": not_required})
+
+
+def direct_reference_reasons(
+    entries: list[CompiledDependency],
+    direct_references: list[DirectReference | None],
+    *,
+    cache_dir: str | None = None,
+) -> list[str | None]:
+    """
+    Check dependencies on direct references against the direct references of the installed distributions, listing
+    the references of the required remote Git repositories concurrently.
+
+    Returns:
+        One of the [`dep_sync.UnsatisfiedReason`][] values for every dependency that is not satisfied, otherwise
+        `None`.
+    """
+    from dep_sync._distributions import direct_reference_reason, git_reference
+    from dep_sync._vcs import GitRemotes
+
+    git_remotes = GitRemotes(cache_dir=cache_dir)
+    references = [git_reference(entry, reference) for entry, reference in zip(entries, direct_references)]
+    git_remotes.prefetch([reference for reference in references if reference is not None])
+    return [
+        direct_reference_reason(entry, reference, git_remotes) for entry, reference in zip(entries, direct_references)
+    ]
+
+
+def dump_dependencies(dependencies: list[Dependency]) -> list[list[Any]]:
+    return [[str(dependency), dependency.editable] for dependency in dependencies]
+
+
+def load_dependencies(data: list[list[Any]]) -> list[Dependency]:
+    from dep_sync._dependency import Dependency
+
+    return [Dependency.from_string(requirement, editable=editable) for requirement, editable in data]
+
+
+def dump_dependency_state(dependencies: list[Dependency], state: DependencyState) -> dict[str, Any]:
+    """
+    Returns:
+        A compact representation of the state with the indices of the satisfied dependencies, every other
+        dependency being missing.
+    """
+    # Dependencies are compared by identity because equal dependencies may appear more than once
+    satisfied = {id(dependency) for dependency in state.satisfied}
+    return {
+        "satisfied": [i for i, dependency in enumerate(dependencies) if id(dependency) in satisfied],
+        "not_required": list(state.not_required),
+    }
+
+
+def load_dependency_state(dependencies: list[Dependency], data: dict[str, Any]) -> DependencyState:
+    from dep_sync._distributions import DependencyState
+
+    indices = set(data["satisfied"])
+    satisfied: list[Dependency] = []
+    missing: list[Dependency] = []
+    for i, dependency in enumerate(dependencies):
+        (satisfied if i in indices else missing).append(dependency)
+
+    return DependencyState(satisfied=satisfied, missing=missing, not_required=data["not_required"])
+
+
+def python_info(python: str, *, cache_dir: str | None = None, timeout: float | None = None) -> dict[str, Any]:
+    """
+    Inspect a Python interpreter by running `dep_sync.scripts.PYTHON_INFO_SCRIPT`. If a `cache_dir` is
+    provided, the result is persisted there and reused until the interpreter, its `pyvenv.cfg` or any of the
+    entries of its search path change.
+
+    Parameters:
+        python: The path to the Python interpreter.
+        cache_dir: The directory in which to persist the result.
+        timeout: The number of seconds after which the inspection of the interpreter fails.
+
+    Returns:
+        A dictionary with the `sys_path` and marker `environment` of the interpreter.
+
+    Raises:
+        EnvironmentCheckError: If the interpreter could not be inspected.
+    """
+    if cache_dir is None:
+        return probe_interpreter(python, timeout=timeout)
+
+    from dep_sync._cache import load_python_info, save_python_info
+
+    info = load_python_info(cache_dir, python)
+    if info is None:
+        info = probe_interpreter(python, timeout=timeout)
+        save_python_info(cache_dir, python, info)
+
+    return info
+
+
+def probe_interpreter(python: str, *, timeout: float | None = None) -> dict[str, Any]:
+    from ast import literal_eval
+
+    from dep_sync.scripts import PYTHON_INFO_SCRIPT
+
+    output = run_script(python, PYTHON_INFO_SCRIPT, timeout=timeout)
+    try:
+        return literal_eval(output)
+    except (SyntaxError, ValueError):
+        message = f"unexpected output: {output.strip()}"
+        raise EnvironmentCheckError(python, message) from None
+
+
+def run_script(python: str, script: bytes, *, timeout: float | None = None, stdin: str | None = None) -> str:
+    import subprocess
+
+    try:
+        process = subprocess.run(  # noqa: PLW1510
+            [python, "-c", script], input=stdin, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        message = f"timed out after {timeout} seconds"
+        raise EnvironmentCheckError(python, message) from None
+    except OSError as e:
+        raise EnvironmentCheckError(python, str(e)) from None
+
+    if process.returncode:
+        message = f"exited with code {process.returncode}: {process.stderr.strip()}"
+        raise EnvironmentCheckError(python, message)
+
+    return process.stdout
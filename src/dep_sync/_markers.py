@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from dep_sync._utils import canonical_name
+
+if TYPE_CHECKING:
+    from packaging.markers import Marker
+
+# Markers are normalized when parsed so this matches regardless of the original quoting and spacing
+EXTRA_CLAUSE_REGEX = re.compile(r'extra == "([^"]+)"')
+# The least recently used markers are evicted
+MAX_COMPILED_MARKERS = 4096
+# The results of a marker are forgotten once it has been evaluated in this many environments
+MAX_MARKER_RESULTS = 256
+COMPILED_MARKERS: OrderedDict[str, CompiledMarker] = OrderedDict()
+# Markers are compiled by every thread that checks dependencies
+COMPILED_MARKERS_LOCK = threading.Lock()
+
+
+class MarkerEnvironment:
+    """
+    A marker environment that is hashed once so that it may be used to memoize evaluations. Environments for
+    extras are derived once per extra rather than once per evaluation.
+    """
+
+    def __init__(self, values: dict[str, str]) -> None:
+        self.values = values
+        self.key = frozenset(values.items())
+        self.extra = values.get("extra")
+        self.__extra_values: dict[str, dict[str, str]] = {}
+
+    def extra_values(self, extra: str) -> dict[str, str]:
+        values = self.__extra_values.get(extra)
+        if values is None:
+            values = dict(self.values)
+            values["extra"] = extra
+            self.__extra_values[extra] = values
+
+        return values
+
+
+class CompiledMarker:
+    """
+    A reusable evaluator for a marker that memoizes results per environment. Markers consisting solely of
+    `extra == "..."` clauses are evaluated without involving the environment at all and markers that do not
+    refer to extras share results regardless of the extra.
+    """
+
+    def __init__(self, marker: Marker, marker_string: str) -> None:
+        self.marker = marker
+        self.marker_string = marker_string
+        self.extras = parse_extras(marker_string)
+        self.uses_extra = "extra" in marker_string
+        self.__results: dict[tuple[frozenset[tuple[str, str]], str | None], bool] = {}
+
+    def evaluate(self, environment: MarkerEnvironment, extra: str | None = None) -> bool:
+        if self.extras is not None:
+            if extra is None:
+                extra = environment.extra
+
+            return extra is not None and canonical_name(extra) in self.extras
+
+        if not self.uses_extra:
+            extra = None
+
+        key = (environment.key, extra)
+        results = self.__results
+        result = results.get(key)
+        if result is None:
+            values = environment.values if extra is None else environment.extra_values(extra)
+            result = self.marker.evaluate(values)
+            # Replacing rather than pruning the results is safe while other threads are reading them
+            if len(results) >= MAX_MARKER_RESULTS:
+                results = self.__results = {}
+
+            results[key] = result
+
+        return result
+
+
+def compile_marker(marker: Marker) -> CompiledMarker:
+    marker_string = str(marker)
+    with COMPILED_MARKERS_LOCK:
+        compiled_marker = COMPILED_MARKERS.get(marker_string)
+        if compiled_marker is not None:
+            COMPILED_MARKERS.move_to_end(marker_string)
+            return compiled_marker
+
+    compiled_marker = CompiledMarker(marker, marker_string)
+    with COMPILED_MARKERS_LOCK:
+        compiled_marker = COMPILED_MARKERS.setdefault(marker_string, compiled_marker)
+        while len(COMPILED_MARKERS) > MAX_COMPILED_MARKERS:
+            COMPILED_MARKERS.popitem(last=False)
+
+    return compiled_marker
+
+
+def parse_extras(marker_string: str) -> frozenset[str] | None:
+    extras = set()
+    for clause in marker_string.split(" or "):
+        match = EXTRA_CLAUSE_REGEX.fullmatch(clause)
+        if match is None:
+            return None
+
+        extras.add(canonical_name(match.group(1)))
+
+    return frozenset(extras)
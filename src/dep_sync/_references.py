@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from dep_sync._utils import path_from_url
+
+
+class DirectReference:
+    """
+    The `direct_url.json` of an installed distribution, parsed once with the path of local directories normalized.
+
+    https://packaging.python.org/specifications/direct-url/
+    """
+
+    __slots__ = ("data", "directory", "editable", "path", "url", "vcs")
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.data = data
+        self.url: str = data["url"]
+        self.path = path_from_url(self.url)
+
+        dir_info = data.get("dir_info")
+        self.directory = dir_info is not None
+        self.editable: bool = dir_info is not None and dir_info.get("editable", False)
+
+        vcs_info = data.get("vcs_info")
+        self.vcs: str | None = None if vcs_info is None else vcs_info["vcs"]
+
+
+class DirectReferenceIndex:
+    """
+    Maps the URLs and local paths from which distributions were installed to their project names. The first
+    distribution added for a URL or path takes precedence.
+    """
+
+    def __init__(self) -> None:
+        self.__urls: dict[str, str] = {}
+        self.__paths: dict[str, str] = {}
+
+    def add(self, project_name: str, reference: DirectReference) -> None:
+        self.__urls.setdefault(reference.url, project_name)
+        if reference.vcs is not None:
+            self.__urls.setdefault(f"{reference.vcs}+{reference.url}", project_name)
+
+        if reference.path is not None:
+            self.__paths.setdefault(normalize_path(reference.path), project_name)
+
+    def find(self, url_or_path: str) -> str | None:
+        if "://" not in url_or_path:
+            return self.__paths.get(normalize_path(os.path.abspath(url_or_path)))
+
+        path = path_from_url(url_or_path)
+        if path is not None:
+            return self.__paths.get(normalize_path(path))
+
+        url = url_or_path.partition("#")[0]
+        project_name = self.__urls.get(url)
+        if project_name is not None or "+" not in url.partition("://")[0]:
+            return project_name
+
+        # Drop the requested revision of VCS URLs e.g. `git+https://github.com/org/repo@v1.0`
+        base, _, revision = url.rpartition("@")
+        return None if "/" in revision else self.__urls.get(base)
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
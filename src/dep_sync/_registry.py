@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from dep_sync._cache import trusted
+
+if TYPE_CHECKING:
+    from dep_sync._distributions import ScannedEntry
+
+# The least recently used entries are evicted once the registry holds more than this many distributions
+REGISTRY_MAX_DISTRIBUTIONS = 100_000
+
+
+class EntryRegistry:
+    """
+    The scanned search path entries of every instance of [`dep_sync.InstalledDistributions`][] in the process, keyed
+    by absolute path, such that environments with overlapping search paths only scan each entry once. Entries are
+    validated by their fingerprint whenever they are retrieved.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: OrderedDict[str, ScannedEntry] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get(self, path: str) -> ScannedEntry | None:
+        with self.__lock:
+            scanned_entry = self.__entries.get(path)
+            if scanned_entry is None:
+                return None
+
+            self.__entries.move_to_end(path)
+
+        if not scanned_entry.changed():
+            return scanned_entry
+
+        with self.__lock:
+            if self.__entries.get(path) is scanned_entry:
+                self.__remove(path)
+
+        return None
+
+    def add(self, scanned_entry: ScannedEntry) -> None:
+        # Entries that were modified too close to when they were scanned would never be considered unchanged
+        if scanned_entry.fingerprint is None or not trusted(scanned_entry.fingerprint, scanned_entry.scanned_at):
+            return
+
+        max_distributions = REGISTRY_MAX_DISTRIBUTIONS
+        if len(scanned_entry.records) > max_distributions:
+            return
+
+        with self.__lock:
+            if scanned_entry.path in self.__entries:
+                self.__remove(scanned_entry.path)
+
+            self.__entries[scanned_entry.path] = scanned_entry
+            self.__size += len(scanned_entry.records)
+            while self.__size > max_distributions:
+                self.__remove(next(iter(self.__entries)))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __remove(self, path: str) -> None:
+        self.__size -= len(self.__entries.pop(path).records)
+
+
+ENTRY_REGISTRY = EntryRegistry()
@@ -0,0 +1,340 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import re
+from typing import TYPE_CHECKING, Any
+
+from dep_sync._dependency import Dependency
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+# Options that may follow a requirement on the same line, such as `--hash`, begin after whitespace
+TRAILING_OPTIONS_REGEX = re.compile(r"\s+--?[a-zA-Z]")
+# Comments begin at the start of a line or after whitespace
+COMMENT_REGEX = re.compile(r"(^|\s+)#.*$")
+PYLOCK_FILE_REGEX = re.compile(r"^pylock\.([^.]+\.)?toml$")
+# Local projects may request extras e.g. `.[dev]`
+LOCATION_EXTRAS_REGEX = re.compile(r"^(?P<location>.+?)(?P<extras>\[[^\]]*\])?$")
+# The name and extras of a requirement on a direct reference, which pip accepts without whitespace before the `@`
+NAMED_REQUIREMENT_REGEX = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*\s*(\[[^\]]*\])?\s*@")
+# The options of requirements files that pip supports which do not affect installed distributions
+IGNORED_OPTIONS = frozenset({
+    "-c",
+    "--constraint",
+    "-i",
+    "--index-url",
+    "--extra-index-url",
+    "--no-index",
+    "-f",
+    "--find-links",
+    "--no-binary",
+    "--only-binary",
+    "--prefer-binary",
+    "--pre",
+    "--require-hashes",
+    "--trusted-host",
+    "--use-feature",
+})
+# The options that add requirements, which must be given a value
+VALUE_OPTIONS = frozenset({"-r", "--requirement", "-e", "--editable"})
+ARCHIVE_EXTENSIONS = (".whl", ".zip", ".tar.gz", ".tar.bz2", ".tgz")
+
+
+def read_dependencies(paths: list[str]) -> list[Dependency]:
+    """
+    Load dependencies from requirements files and [PEP 751](https://peps.python.org/pep-0751/) lock files,
+    the latter being recognized by being named `pylock.toml` or `pylock.<name>.toml`. The dependencies of every file
+    are merged as described by [`dep_sync.merge_dependencies`][] so that the result may be checked efficiently.
+
+    Requirements files support the syntax understood by pip that is relevant to installed distributions: comments,
+    line continuations, nested requirements files with `-r`, editable requirements with `-e` and requirements that
+    are only a URL or path to a local project. Constraints files referenced with `-c` and the other options that pip
+    supports are ignored.
+
+    Lock files produce a dependency for every package, pinned to its version or to the source it was installed
+    from, along with its marker.
+
+    Parameters:
+        paths: The paths to the files.
+
+    Returns:
+        The merged dependencies.
+
+    Raises:
+        ValueError: If a file contains an invalid requirement or an unsupported option.
+    """
+    return merge_dependencies(dependency for path in paths for dependency in iter_file_dependencies(path))
+
+
+def merge_dependencies(dependencies: Iterable[Dependency]) -> list[Dependency]:
+    """
+    Collapse dependencies on the same project such that each project is checked only once. Dependencies are
+    merged when they share a normalized name, a marker and, if any, a direct reference. Merged dependencies
+    require the intersection of the version specifiers and the union of the extras, and are editable if any of
+    them are. The order of first appearance is preserved.
+
+    Parameters:
+        dependencies: The dependencies to merge.
+
+    Returns:
+        The merged dependencies, which are the original instances when there was nothing to merge.
+    """
+    groups: dict[tuple[str, str, str], list[Dependency]] = {}
+    for dependency in dependencies:
+        key = (dependency.canonical_name, str(dependency.marker or ""), dependency.url or "")
+        groups.setdefault(key, []).append(dependency)
+
+    return [group[0] if len(group) == 1 else merge_group(group) for group in groups.values()]
+
+
+def merge_group(group: list[Dependency]) -> Dependency:
+    first = group[0]
+    extras: set[str] = set()
+    specifier = first.specifier
+    for dependency in group:
+        extras.update(dependency.extras)
+        specifier &= dependency.specifier
+
+    requirement_string = first.name
+    if extras:
+        requirement_string += f"[{','.join(sorted(extras))}]"
+
+    if first.url:
+        requirement_string += f" @ {first.url}"
+        if first.marker:
+            requirement_string += " "
+    else:
+        requirement_string += str(specifier)
+
+    if first.marker:
+        requirement_string += f"; {first.marker}"
+
+    return Dependency(requirement_string, editable=any(dependency.editable for dependency in group))
+
+
+def iter_file_dependencies(path: str) -> Iterator[Dependency]:
+    if PYLOCK_FILE_REGEX.match(os.path.basename(path)):
+        return iter_pylock_dependencies(path)
+
+    return iter_requirements_file_dependencies(path)
+
+
+def iter_requirements_file_dependencies(path: str, seen: set[str] | None = None) -> Iterator[Dependency]:
+    # Guard against files that include each other
+    if seen is None:
+        seen = set()
+
+    path = os.path.abspath(path)
+    if path in seen:
+        return
+
+    seen.add(path)
+    directory = os.path.dirname(path)
+    for line_number, line in iter_logical_lines(path):
+        try:
+            if line.startswith("-"):
+                option, value = parse_option(line)
+                if option in {"-r", "--requirement"}:
+                    yield from iter_requirements_file_dependencies(os.path.join(directory, value), seen)
+                elif option in {"-e", "--editable"}:
+                    yield unnamed_dependency(
+                        TRAILING_OPTIONS_REGEX.split(value, maxsplit=1)[0], directory, editable=True
+                    )
+
+                continue
+
+            requirement = TRAILING_OPTIONS_REGEX.split(line, maxsplit=1)[0]
+            # Locations are recognized first, like pip does, since archive file names are also valid project names
+            if is_location(requirement):
+                yield unnamed_dependency(requirement, directory)
+            else:
+                yield Dependency(requirement)
+        except ValueError as e:
+            message = f"{path}:{line_number}: {e}"
+            raise ValueError(message) from None
+
+
+def parse_option(line: str) -> tuple[str, str]:
+    """
+    Returns:
+        The option and its value, which may be separated by whitespace, by `=` for long options or not at all for
+        short options e.g. `-rrequirements.txt`.
+
+    Raises:
+        ValueError: If the option is not supported or requires a value that is missing.
+    """
+    option, _, value = line.partition(" ")
+    if option.startswith("--"):
+        if "=" in option:
+            option, _, value = option.partition("=")
+    elif len(option) > 2:  # noqa: PLR2004
+        option, value = option[:2], line[2:]
+
+    # Dropping unknown options could silently lose the dependencies they provide
+    if option not in VALUE_OPTIONS and option not in IGNORED_OPTIONS:
+        message = f"unsupported option: {option}"
+        raise ValueError(message)
+
+    value = value.strip()
+    if option in VALUE_OPTIONS and not value:
+        message = f"option requires a value: {option}"
+        raise ValueError(message)
+
+    return option, value
+
+
+def iter_logical_lines(path: str) -> Iterator[tuple[int, str]]:
+    with open(path, encoding="utf-8") as f:
+        parts: list[str] = []
+        start = 0
+        for line_number, physical_line in enumerate(f, 1):
+            if not parts:
+                start = line_number
+
+            line = COMMENT_REGEX.sub("", physical_line.rstrip("\r\n"))
+            if line.endswith("\\"):
+                parts.append(line[:-1])
+                continue
+
+            parts.append(line)
+            logical_line = "".join(parts).strip()
+            parts.clear()
+            if logical_line:
+                yield start, logical_line
+
+        logical_line = "".join(parts).strip()
+        if logical_line:
+            yield start, logical_line
+
+
+def is_location(requirement: str) -> bool:
+    # Direct references such as `foo @ https://...` are named requirements
+    if NAMED_REQUIREMENT_REGEX.match(requirement):
+        return False
+
+    location = split_marker(requirement)[0]
+    return (
+        "://" in location
+        or location.startswith((".", "~"))
+        or any(separator in location for separator in (os.sep, os.altsep) if separator)
+        or location.partition("[")[0].endswith(ARCHIVE_EXTENSIONS)
+    )
+
+
+def split_marker(requirement: str) -> tuple[str, str]:
+    # Markers, which may contain anything, follow a semicolon that must be followed by whitespace for URLs
+    location, _, marker = requirement.partition("; " if "://" in requirement else ";")
+    return location.strip(), marker.strip()
+
+
+def unnamed_dependency(location: str, directory: str, *, editable: bool = False) -> Dependency:
+    """
+    Create a dependency from a requirement that is only a URL or a path, as pip allows. The project name is taken
+    from the `egg` fragment of the URL, the file name of a wheel or the `pyproject.toml` file of a local project.
+    """
+    from pathlib import Path
+
+    location, marker = split_marker(location)
+    extras = ""
+    if "://" not in location:
+        match = LOCATION_EXTRAS_REGEX.match(location)
+        if match is not None:
+            location = match.group("location")
+            extras = match.group("extras") or ""
+
+    url, _, fragment = location.partition("#")
+    if "://" in url:
+        path = None
+    else:
+        path = Path(directory, os.path.expanduser(url)).resolve()
+        url = path.as_uri()
+
+    name = None
+    for fragment_part in fragment.split("&"):
+        key, _, value = fragment_part.partition("=")
+        if key == "egg" and value:
+            name = value
+
+    if name is None:
+        name = project_name(path, url)
+
+    if name is None:
+        message = f"unable to determine the project name of: {location}"
+        raise ValueError(message)
+
+    requirement = f"{name}{extras} @ {url}"
+    if marker:
+        # A space is required between a URL and the marker separator
+        requirement += f" ; {marker}"
+
+    return Dependency(requirement, editable=editable)
+
+
+def project_name(path: Path | None, url: str) -> str | None:
+    file_name = url.rstrip("/").rpartition("/")[2]
+    if file_name.endswith(".whl"):
+        return file_name.partition("-")[0]
+
+    if path is None or not path.is_dir():
+        return None
+
+    pyproject_file = path / "pyproject.toml"
+    if not pyproject_file.is_file():
+        return None
+
+    project = load_toml(str(pyproject_file)).get("project", {})
+    name = project.get("name")
+    return name if isinstance(name, str) else None
+
+
+def iter_pylock_dependencies(path: str) -> Iterator[Dependency]:
+    from pathlib import Path
+
+    directory = os.path.dirname(os.path.abspath(path))
+    for i, package in enumerate(load_toml(path).get("packages", [])):
+        try:
+            name = package["name"]
+            editable = False
+            if "vcs" in package:
+                vcs = package["vcs"]
+                url = vcs.get("url") or Path(directory, vcs["path"]).resolve().as_uri()
+                requirement = f"{name} @ {vcs['type']}+{url}@{vcs['commit-id']}"
+            elif "directory" in package:
+                project = package["directory"]
+                requirement = f"{name} @ {Path(directory, project['path']).resolve().as_uri()}"
+                editable = project.get("editable", False)
+            elif "archive" in package:
+                archive = package["archive"]
+                url = archive.get("url") or Path(directory, archive["path"]).resolve().as_uri()
+                requirement = f"{name} @ {url}"
+            elif "version" in package:
+                requirement = f"{name}=={package['version']}"
+            else:
+                requirement = name
+
+            marker = package.get("marker")
+            if marker:
+                # A space is required between a URL and the marker separator
+                requirement += f" ; {marker}"
+
+            yield Dependency(requirement, editable=editable)
+        except (KeyError, TypeError, ValueError) as e:
+            message = f"{path}: invalid package at index {i}: {e!r}"
+            raise ValueError(message) from None
+
+
+def load_toml(path: str) -> dict[str, Any]:
+    import sys
+
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+
+    with open(path, "rb") as f:
+        return tomllib.load(f)
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import threading
+from time import perf_counter
+from typing import Any
+
+
+class Stats:
+    """
+    Counters and timings of the work performed by an instance of [`dep_sync.InstalledDistributions`][] that
+    collects statistics.
+
+    The `counts` attribute maps the following names to the number of times that something happened, with names
+    that never occurred being absent:
+
+    - `entries_scanned`: search path entries that were scanned
+    - `distributions_scanned`: distributions that were found by scanning
+    - `metadata_reads`: metadata files that were read and parsed
+    - `direct_url_reads`: `direct_url.json` files that were read
+    - `marker_evaluations`: markers that were evaluated, including those with memoized results
+    - `extras_evaluated`: extras whose requirements were evaluated
+    - `subprocesses`: processes that were spawned to list the references of remote repositories
+    - `index_hits` / `index_misses`: search path entries that were or were not found unchanged in the cache
+    - `vcs_cache_hits` / `vcs_cache_misses`: lookups of Git revisions in the cache that did or did not find a
+      usable resolution
+
+    The `timings` attribute maps the following phases to the total number of seconds spent in them:
+
+    - `discovery`: scanning search path entries, summed across threads when they are scanned concurrently
+    - `metadata`: reading and parsing metadata files
+    - `direct_url`: reading `direct_url.json` files
+    - `markers`: evaluating markers
+    - `extras`: evaluating the requirements of extras, including the time spent in other phases
+    - `git`: listing the references of remote repositories
+    """
+
+    __slots__ = ("__lock", "counts", "timings")
+
+    def __init__(self, counts: dict[str, int] | None = None, timings: dict[str, float] | None = None) -> None:
+        self.counts: dict[str, int] = {} if counts is None else counts
+        self.timings: dict[str, float] = {} if timings is None else timings
+        # Search path entries may be scanned concurrently
+        self.__lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self.__lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        with self.__lock:
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def time(self, phase: str) -> PhaseTimer:
+        return PhaseTimer(self, phase)
+
+    def copy(self) -> Stats:
+        return Stats(dict(self.counts), dict(self.timings))
+
+    def since(self, snapshot: Stats) -> Stats:
+        """
+        Returns:
+            The statistics collected after the given snapshot was taken.
+        """
+        counts = {name: n - snapshot.counts.get(name, 0) for name, n in self.counts.items()}
+        timings = {phase: seconds - snapshot.timings.get(phase, 0.0) for phase, seconds in self.timings.items()}
+        return Stats(
+            {name: n for name, n in counts.items() if n},
+            {phase: seconds for phase, seconds in timings.items() if seconds},
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"counts": dict(self.counts), "timings": dict(self.timings)}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(counts={self.counts!r}, timings={self.timings!r})"
+
+
+class PhaseTimer:
+    __slots__ = ("phase", "start", "stats")
+
+    def __init__(self, stats: Stats, phase: str) -> None:
+        self.stats = stats
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *args: object) -> None:
+        self.stats.add_time(self.phase, perf_counter() - self.start)
@@ -4,8 +4,15 @@
 from __future__ import annotations
 
 import os
+import re
 import sys
 
+CANONICAL_NAME_REGEX = re.compile(r"[-_.]+")
+
+
+def canonical_name(name: str) -> str:
+    return CANONICAL_NAME_REGEX.sub("-", name).lower()
+
 
 def path_from_url(url: str) -> str | None:
     from urllib.parse import urlsplit
@@ -0,0 +1,321 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dep_sync._stats import Stats
+
+# The oldest resolved revisions are evicted once the cache holds more than this many entries
+VCS_CACHE_MAX_ENTRIES = 1000
+
+
+def vcs_pinned(dependency_url: str, direct_url_data: dict[str, Any]) -> bool:
+    url = direct_url_data["url"]
+    vcs_info = direct_url_data["vcs_info"]
+    vcs = vcs_info["vcs"]
+    commit_id = vcs_info["commit_id"]
+    requested_revision = vcs_info.get("requested_revision")
+
+    # Try a few variations, see https://peps.python.org/pep-0440/#direct-references
+    return (
+        bool(requested_revision) and dependency_url == f"{vcs}+{url}@{requested_revision}#{commit_id}"
+    ) or dependency_url == f"{vcs}+{url}@{commit_id}"
+
+
+def vcs_reference(dependency_url: str, direct_url_data: dict[str, Any]) -> tuple[str, str | None] | None:
+    """
+    Returns:
+        The remote URL and requested revision that must be resolved to determine whether the installed commit is
+        the latest, or `None` if the dependency does not refer to the installed repository.
+    """
+    url = direct_url_data["url"]
+    vcs_info = direct_url_data["vcs_info"]
+    vcs = vcs_info["vcs"]
+    requested_revision = vcs_info.get("requested_revision")
+    if dependency_url not in {f"{vcs}+{url}", f"{vcs}+{url}@{requested_revision}"}:
+        return None
+
+    # TODO: support other VCS
+    if vcs != "git":  # no cov
+        return None
+
+    return url, requested_revision
+
+
+class GitRemotes:
+    """
+    Resolves revisions of remote Git repositories. The references of each remote are listed at most once and
+    every requested revision is resolved from that listing.
+
+    If a `cache_dir` is provided, resolved revisions are persisted there and reused by other instances for
+    `cache_ttl` seconds. In `offline` mode, Git is never executed and revisions are resolved solely from the cache,
+    regardless of age, trusting the installed commit when there is no cached entry.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        workers: int | None = None,
+        cache_dir: str | None = None,
+        cache_ttl: float = 60,
+        offline: bool = False,
+        stats: Stats | None = None,
+    ) -> None:
+        self.__timeout = timeout
+        self.__workers = workers
+        self.__cache_file = None if cache_dir is None else os.path.join(cache_dir, "vcs.json")
+        self.__cache_ttl = cache_ttl
+        self.__offline = offline
+        self.__stats = stats
+        self.__references: dict[str, list[tuple[str, str]] | None] = {}
+        # Resolutions found in the cache, such that every lookup is only counted once
+        self.__cached_commits: dict[str, str] = {}
+
+    def prefetch(self, references: list[tuple[str, str | None]]) -> None:
+        pending = self.pending(references)
+        if not pending:
+            return
+
+        # Remotes are listed concurrently so the time is measured for the whole batch
+        start = 0.0
+        if self.__stats is not None:
+            self.__stats.count("subprocesses", len(pending))
+            start = time.perf_counter()
+
+        if len(pending) == 1:
+            self.__references[pending[0]] = self.list_references(pending[0])
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            max_workers = min(len(pending), self.__workers or 8)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for url, url_references in zip(pending, executor.map(self.list_references, pending)):
+                    self.__references[url] = url_references
+
+        if self.__stats is not None:
+            self.__stats.add_time("git", time.perf_counter() - start)
+
+        self.cache_resolutions(references, pending)
+
+    def pending(self, references: list[tuple[str, str | None]]) -> list[str]:
+        """
+        Returns:
+            The remote URLs that must be listed to resolve the references, which is always empty in offline mode.
+        """
+        if self.__offline:
+            return []
+
+        return list(
+            dict.fromkeys(
+                url
+                for url, revision in references
+                if url not in self.__references and self.__cached_commit(url, revision) is None
+            )
+        )
+
+    async def async_prefetch(self, pending: list[str]) -> None:
+        """
+        List the `pending` remotes, as returned by the `pending` method, using asynchronous subprocesses. Processes
+        that are still running when this is cancelled are killed. The resolutions are not persisted so that the
+        caller may call the `cache_resolutions` method outside the event loop.
+        """
+        if not pending:
+            return
+
+        import asyncio
+
+        start = 0.0
+        if self.__stats is not None:
+            self.__stats.count("subprocesses", len(pending))
+            start = time.perf_counter()
+
+        semaphore = asyncio.Semaphore(min(len(pending), self.__workers or 8))
+
+        async def list_references(url: str) -> list[tuple[str, str]] | None:
+            async with semaphore:
+                return await self.async_list_references(url)
+
+        results = await asyncio.gather(*(list_references(url) for url in pending))
+        self.__references.update(zip(pending, results))
+        if self.__stats is not None:
+            self.__stats.add_time("git", time.perf_counter() - start)
+
+    def is_current(self, url: str, revision: str | None, commit_id: str) -> bool:
+        """
+        Returns:
+            Whether the revision currently points to the given commit.
+        """
+        latest_commit_id = self.__cached_commit(url, revision)
+        if latest_commit_id is None:
+            if self.__offline:
+                return True
+
+            if url not in self.__references:
+                if self.__stats is None:
+                    self.__references[url] = self.list_references(url)
+                else:
+                    self.__stats.count("subprocesses")
+                    with self.__stats.time("git"):
+                        self.__references[url] = self.list_references(url)
+
+            latest_commit_id = self.__cache_resolution(url, revision)
+            self.__save_cache()
+
+        return latest_commit_id == commit_id
+
+    def unreachable(self, url: str) -> bool:
+        """
+        Returns:
+            Whether listing the references of the remote failed, for example because it timed out.
+        """
+        return url in self.__references and self.__references[url] is None
+
+    def list_references(self, url: str) -> list[tuple[str, str]] | None:
+        import subprocess
+
+        vcs_cmd = ["git", "ls-remote", url]
+        try:
+            result = subprocess.run(vcs_cmd, capture_output=True, text=True, timeout=self.__timeout)  # noqa: PLW1510
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
+        if result.returncode:
+            return None
+
+        return parse_references(result.stdout)
+
+    async def async_list_references(self, url: str) -> list[tuple[str, str]] | None:
+        import asyncio
+        from contextlib import suppress
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", "ls-remote", url, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+        except OSError:
+            return None
+
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), self.__timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
+        except BaseException:
+            # Do not leave processes behind when cancelled
+            with suppress(ProcessLookupError):
+                process.kill()
+
+            raise
+
+        if process.returncode:
+            return None
+
+        return parse_references(stdout.decode("utf-8", "replace"))
+
+    @cached_property
+    def __cache(self) -> dict[str, list[Any]]:
+        if self.__cache_file is None:
+            return {}
+
+        from dep_sync._cache import read_json
+
+        cache = read_json(self.__cache_file)
+        return cache if isinstance(cache, dict) else {}
+
+    def __cached_commit(self, url: str, revision: str | None) -> str | None:
+        references = self.__references.get(url)
+        if references is not None:
+            return resolve_reference(references, revision)
+
+        key = f"{url}#{revision or ''}"
+        cached_commit_id = self.__cached_commits.get(key)
+        if cached_commit_id is not None:
+            return cached_commit_id
+
+        entry = self.__cache.get(key)
+        if entry is not None:
+            commit_id, timestamp = entry
+            if self.__offline or time.time() - timestamp < self.__cache_ttl:
+                if self.__stats is not None:
+                    self.__stats.count("vcs_cache_hits")
+
+                self.__cached_commits[key] = commit_id
+                return commit_id
+
+        if self.__stats is not None and self.__cache_file is not None:
+            self.__stats.count("vcs_cache_misses")
+
+        return None
+
+    def cache_resolutions(self, references: list[tuple[str, str | None]], pending: list[str]) -> None:
+        if self.__cache_file is None:
+            return
+
+        for url, revision in references:
+            if url in pending:
+                self.__cache_resolution(url, revision)
+
+        self.__save_cache()
+
+    def __cache_resolution(self, url: str, revision: str | None) -> str | None:
+        references = self.__references.get(url)
+        if not references:
+            return None
+
+        commit_id = resolve_reference(references, revision)
+        if commit_id is not None and self.__cache_file is not None:
+            self.__cache[f"{url}#{revision or ''}"] = [commit_id, time.time()]
+
+        return commit_id
+
+    def __save_cache(self) -> None:
+        if self.__cache_file is None:
+            return
+
+        from dep_sync._cache import write_json
+
+        cache = self.__cache
+        if len(cache) > VCS_CACHE_MAX_ENTRIES:
+            newest = sorted(cache.items(), key=lambda item: item[1][1], reverse=True)[:VCS_CACHE_MAX_ENTRIES]
+            cache.clear()
+            cache.update(newest)
+
+        write_json(self.__cache_file, cache)
+
+
+def parse_references(output: str) -> list[tuple[str, str]]:
+    references = []
+    for line in output.splitlines():
+        commit_id, _, reference = line.partition("\t")
+        if reference:
+            references.append((commit_id.strip(), reference.strip()))
+
+    return references
+
+
+def resolve_reference(references: list[tuple[str, str]], revision: str | None) -> str | None:
+    # This mirrors the way `git ls-remote <url> <pattern>` matches references from the tail at path component
+    # boundaries, with the default branch being used when no revision is requested
+    if not revision:
+        revision = "HEAD"
+
+    suffix = f"/{revision}"
+    for commit_id, reference in references:
+        if reference == revision or reference.endswith(suffix):
+            # Annotated tags refer to tag objects so prefer the commit that they point to
+            peeled_reference = f"{reference}^{{}}"
+            for peeled_commit_id, other_reference in references:
+                if other_reference == peeled_reference:
+                    return peeled_commit_id
+
+            return commit_id
+
+    return None
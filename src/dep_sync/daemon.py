@@ -0,0 +1,277 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+A long-lived process that keeps the installed distributions of Python environments indexed in memory and checks
+dependencies on behalf of clients connected to a Unix socket. Start it with:
+
+```
+python -m dep_sync.daemon --socket /path/to/socket
+```
+
+Every request and response is a single line of JSON. Requests have the following keys:
+
+- python: the path to the Python interpreter of the environment
+- dependencies: a list of [requirement, editable] pairs
+- exhaustive: whether to search for all distributions that are not required
+
+Responses have the indices of the `satisfied` dependencies and the names of the distributions that are
+`not_required`, every other dependency being missing, or an `error` message if the environment could not be checked.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import socketserver
+
+    from dep_sync._dependency import Dependency
+    from dep_sync._distributions import DependencyState, InstalledDistributions
+
+
+class Daemon:
+    """
+    Checks dependencies against an index of the installed distributions of every environment it has been asked
+    about that is kept in memory. Before every check, the interpreter and search path entries of the environment
+    are polled for changes so that installations and removals are reflected immediately, while only the search path
+    entries that changed are scanned again.
+
+    Parameters:
+        cache_dir: The directory in which to persist the inspection of interpreters and the index of installed
+            distributions.
+        timeout: The number of seconds after which the inspection of an interpreter fails.
+    """
+
+    def __init__(self, *, cache_dir: str | None = None, timeout: float | None = None) -> None:
+        self.__cache_dir = cache_dir
+        self.__timeout = timeout
+        self.__environments: dict[str, WarmEnvironment] = {}
+        self.__lock = threading.Lock()
+
+    def dependency_state(
+        self, python: str, dependencies: list[Dependency], *, exhaustive: bool = False
+    ) -> DependencyState:
+        """
+        Parameters:
+            python: The path to the Python interpreter of the environment.
+            dependencies: The dependencies to check.
+            exhaustive: Whether to search for all distributions that are not required.
+
+        Returns:
+            An instance of [`dep_sync.DependencyState`][].
+
+        Raises:
+            EnvironmentCheckError: If the environment could not be checked.
+        """
+        python = os.path.abspath(python)
+        with self.__lock:
+            environment = self.__environments.get(python)
+            if environment is None:
+                environment = self.__environments[python] = WarmEnvironment(
+                    python, cache_dir=self.__cache_dir, timeout=self.__timeout
+                )
+
+        return environment.dependency_state(dependencies, exhaustive=exhaustive)
+
+    def respond(self, request: bytes) -> dict[str, Any]:
+        import json
+
+        from dep_sync._environments import EnvironmentCheckError, dump_dependency_state, load_dependencies
+
+        try:
+            data = json.loads(request)
+            dependencies = load_dependencies(data["dependencies"])
+            state = self.dependency_state(data["python"], dependencies, exhaustive=data.get("exhaustive", False))
+        except EnvironmentCheckError as e:
+            return {"error": e.message}
+        except Exception as e:  # noqa: BLE001
+            return {"error": f"{type(e).__name__}: {e}"}
+
+        return dump_dependency_state(dependencies, state)
+
+    def server(self, socket_path: str) -> socketserver.BaseServer:
+        """
+        Parameters:
+            socket_path: The path to the Unix socket on which to listen.
+
+        Returns:
+            A server that must be started by calling its `serve_forever` method.
+        """
+        import json
+        import socketserver
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for request in self.rfile:
+                    self.wfile.write(json.dumps(daemon.respond(request)).encode("utf-8") + b"\n")
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+            def server_bind(self) -> None:
+                # Requests name the interpreters that are executed so only the owner may connect
+                umask = os.umask(0o077)
+                try:
+                    super().server_bind()
+                    os.chmod(socket_path, 0o600)
+                finally:
+                    os.umask(umask)
+
+        remove_stale_socket(socket_path)
+        return Server(socket_path, RequestHandler)
+
+    def serve(self, socket_path: str) -> None:
+        """
+        Serve requests until interrupted, removing the socket afterward.
+
+        Parameters:
+            socket_path: The path to the Unix socket on which to listen.
+        """
+        with self.server(socket_path) as server:
+            try:
+                server.serve_forever()
+            finally:
+                from contextlib import suppress
+
+                with suppress(FileNotFoundError):
+                    os.remove(socket_path)
+
+
+class WarmEnvironment:
+    """
+    The installed distributions of an environment along with the state of its interpreter when it was inspected.
+    """
+
+    def __init__(self, python: str, *, cache_dir: str | None = None, timeout: float | None = None) -> None:
+        self.__python = python
+        self.__cache_dir = cache_dir
+        self.__timeout = timeout
+        self.__lock = threading.Lock()
+        self.__state: dict[str, Any] | None = None
+        self.__distributions: InstalledDistributions | None = None
+
+    def dependency_state(self, dependencies: list[Dependency], *, exhaustive: bool = False) -> DependencyState:
+        with self.__lock:
+            return self.__current_distributions().dependency_state(dependencies, exhaustive=exhaustive)
+
+    def __current_distributions(self) -> InstalledDistributions:
+        from dep_sync._cache import python_info_current, python_info_state
+
+        # Interpreters that were inspected while their search path was still changing are inspected again
+        if (
+            self.__distributions is not None
+            and self.__state is not None
+            and python_info_current(self.__python, self.__state)
+        ):
+            return self.__distributions
+
+        from dep_sync._distributions import InstalledDistributions
+        from dep_sync._environments import python_info
+
+        info = python_info(self.__python, cache_dir=self.__cache_dir, timeout=self.__timeout)
+        self.__state = python_info_state(self.__python, info)
+        self.__distributions = InstalledDistributions(
+            sys_path=info["sys_path"], environment=info["environment"], cache_dir=self.__cache_dir, auto_refresh=True
+        )
+        return self.__distributions
+
+
+def request_dependency_state(
+    socket_path: str,
+    dependencies: list[Dependency],
+    *,
+    python: str | None = None,
+    exhaustive: bool = False,
+    timeout: float | None = None,
+) -> DependencyState:
+    """
+    Check dependencies using a running daemon.
+
+    Parameters:
+        socket_path: The path to the Unix socket on which the daemon listens.
+        dependencies: The dependencies to check.
+        python: The path to the Python interpreter of the environment, defaulting to [`sys.executable`][].
+        exhaustive: Whether to search for all distributions that are not required.
+        timeout: The number of seconds after which communicating with the daemon fails.
+
+    Returns:
+        An instance of [`dep_sync.DependencyState`][].
+
+    Raises:
+        EnvironmentCheckError: If the environment could not be checked.
+    """
+    import json
+    import socket
+    import sys
+
+    from dep_sync._environments import EnvironmentCheckError, dump_dependencies, load_dependency_state
+
+    if python is None:
+        python = sys.executable
+
+    request = {"python": python, "dependencies": dump_dependencies(dependencies), "exhaustive": exhaustive}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as f:
+            response = json.loads(f.readline())
+
+    if "error" in response:
+        raise EnvironmentCheckError(python, response["error"])
+
+    return load_dependency_state(dependencies, response)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    import errno
+    import socket
+    import stat
+
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+
+    # Anything other than a socket is never removed since the path may have been mistyped
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EADDRINUSE, os.strerror(errno.EADDRINUSE), socket_path)
+
+    # Sockets are left behind when a daemon is killed, but one that accepts connections is still in use
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+
+    raise OSError(errno.EADDRINUSE, os.strerror(errno.EADDRINUSE), socket_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+    import signal
+    import sys
+    from contextlib import suppress
+
+    parser = argparse.ArgumentParser(
+        prog="python -m dep_sync.daemon", description="Check dependencies on behalf of clients of a Unix socket."
+    )
+    parser.add_argument("--socket", required=True, help="The path to the Unix socket on which to listen")
+    parser.add_argument("--cache-dir", help="The directory in which to persist inspections and indices")
+    parser.add_argument("--timeout", type=float, help="The number of seconds after which inspections fail")
+    args = parser.parse_args(argv)
+
+    # Ensure the socket is removed when terminated
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with suppress(KeyboardInterrupt):
+        Daemon(cache_dir=args.cache_dir, timeout=args.timeout).serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@
 
 # Keep support for Python 2 for a while:
 # https://github.com/pypa/packaging/blob/20.9/packaging/markers.py#L267-L300
-PYTHON_INFO_SCRIPT = b"""\
+MARKER_ENVIRONMENT_SCRIPT = b"""\
 import os
 import platform
 import sys
@@ -35,6 +35,561 @@ environment = {
     'sys_platform': sys.platform,
 }
 sys_path = [path for path in sys.path if path]
+"""
 
+PYTHON_INFO_SCRIPT = (
+    MARKER_ENVIRONMENT_SCRIPT
+    + b"""
 print({'environment': environment, 'sys_path': sys_path})
 """
+)
+
+# Only the standard library is used so that any interpreter may run this regardless of what is installed, with
+# minimal implementations of the parts of PEP 440 and PEP 508 that are required to check installed distributions.
+#
+# The request is a JSON object read from stdin with the following keys:
+#
+# - dependencies: a list of [name, specifier, extras, marker, url] lists with the canonical project name, the
+#   version specifier, the canonical names of the extras, the marker or null, and the direct reference or null
+# - exhaustive: whether to search for all distributions that are not required
+#
+# The response is a JSON object written to stdout with the following keys, every other dependency being missing:
+#
+# - satisfied: the indices of the satisfied dependencies
+# - direct_urls: [index, direct_url] pairs for the dependencies on direct references that are otherwise satisfied,
+#   with the contents of the `direct_url.json` file of the installed distribution or null, which are compared by
+#   the caller
+# - not_required: the names of the distributions that are not required
+DEPENDENCY_STATE_SCRIPT = (
+    MARKER_ENVIRONMENT_SCRIPT
+    + rb"""
+import io
+import json
+import re
+import zipfile
+
+NAME_SEPARATORS = re.compile(r'[-_.]+')
+VERSION = re.compile(
+    r'^\s*v?(?:(\d+)!)?(\d+(?:\.\d+)*)'
+    r'(?:[-_.]?(alpha|a|beta|b|preview|pre|c|rc)[-_.]?(\d*))?'
+    r'(?:-(\d+)|[-_.]?(post|rev|r)[-_.]?(\d*))?'
+    r'(?:[-_.]?(dev)[-_.]?(\d*))?'
+    r'(?:\+([a-z0-9]+(?:[-_.][a-z0-9]+)*))?\s*$',
+    re.IGNORECASE,
+)
+PRE_RELEASE_PHASES = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'c': 2, 'pre': 2, 'preview': 2, 'rc': 2}
+PRE_RELEASE_LABELS = ('a', 'b', 'rc')
+REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[([^\]]*)\])?\s*(.*)$')
+SPECIFIER_CLAUSE = re.compile(r'^\s*(~=|===|==|!=|<=|>=|<|>)\s*(\S+?)\s*$')
+MARKER_TOKEN = re.compile(
+    r'\s*(?:([()])|\'([^\']*)\'|"([^"]*)"|(===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b|and\b|or\b)|([A-Za-z_][\w.]*))'
+)
+MARKER_ALIASES = {
+    'os.name': 'os_name',
+    'sys.platform': 'sys_platform',
+    'platform.version': 'platform_version',
+    'platform.machine': 'platform_machine',
+    'platform.python_implementation': 'platform_python_implementation',
+    'python_implementation': 'platform_python_implementation',
+}
+METADATA_FIELDS = ('name', 'version', 'requires-dist', 'provides-extra')
+
+
+def canonical_name(name):
+    return NAME_SEPARATORS.sub('-', name).lower()
+
+
+class Version(object):
+    def __init__(self, match):
+        epoch, release, pre, pre_number, implicit_post, post, post_number, dev, dev_number, local = match.groups()
+        self.epoch = int(epoch or 0)
+        self.release = tuple(int(part) for part in release.split('.'))
+        self.pre = None if pre is None else (PRE_RELEASE_PHASES[pre.lower()], int(pre_number or 0))
+        if implicit_post is not None:
+            self.post = int(implicit_post)
+        else:
+            self.post = None if post is None else int(post_number or 0)
+        self.dev = None if dev is None else int(dev_number or 0)
+        self.is_prerelease = self.pre is not None or self.dev is not None
+        self.local = None
+        if local is not None:
+            self.local = tuple(int(part) if part.isdigit() else part.lower() for part in re.split(r'[-_.]', local))
+
+        # The same ordering as `packaging.version.Version`
+        release = list(self.release)
+        while release and release[-1] == 0:
+            release.pop()
+        self.base = (self.epoch, tuple(release))
+        if self.pre is None and self.post is None and self.dev is not None:
+            pre_key = (-1,)
+        else:
+            pre_key = (1,) if self.pre is None else (0,) + self.pre
+        post_key = (-1,) if self.post is None else (0, self.post)
+        dev_key = (1,) if self.dev is None else (0, self.dev)
+        self.public_key = self.base + (pre_key, post_key, dev_key, (0,))
+        if self.local is None:
+            self.key = self.public_key
+        else:
+            local_key = tuple((1, part, '') if isinstance(part, int) else (0, 0, part) for part in self.local)
+            self.key = self.public_key[:-1] + ((1, local_key),)
+
+    def components(self, release_length):
+        release = self.release + (0,) * (release_length - len(self.release))
+        components = [self.epoch] + list(release)
+        if self.pre is not None:
+            components.append(PRE_RELEASE_LABELS[self.pre[0]] + str(self.pre[1]))
+        if self.post is not None:
+            components.append('post' + str(self.post))
+        if self.dev is not None:
+            components.append('dev' + str(self.dev))
+        return components
+
+
+def parse_version(text):
+    match = VERSION.match(text)
+    return None if match is None else Version(match)
+
+
+def prefix_matches(version, prefix):
+    components = prefix.components(0)
+    return version.components(len(prefix.release))[:len(components)] == components
+
+
+def valid_specifier(operator, text):
+    if operator == '===':
+        return True
+    wildcard = operator in ('==', '!=') and text.endswith('.*')
+    spec = parse_version(text[:-2] if wildcard else text)
+    if spec is None or operator == '~=' and len(spec.release) < 2:
+        return False
+    if wildcard:
+        return spec.pre is None and spec.post is None and spec.dev is None and spec.local is None
+    return spec.local is None or operator in ('==', '!=')
+
+
+def specifier_contains(operator, text, version_text):
+    # Pre-releases are accepted because installed versions are checked
+    if operator == '===':
+        return version_text.lower() == text.lower()
+    version = parse_version(version_text)
+    if version is None:
+        return False
+    if operator in ('==', '!=') and text.endswith('.*'):
+        return prefix_matches(version, parse_version(text[:-2])) == (operator == '==')
+    spec = parse_version(text)
+    if operator in ('==', '!='):
+        equal = (version.key if spec.local is not None else version.public_key) == spec.key
+        return equal == (operator == '==')
+    if operator == '~=':
+        prefix = parse_version('{0}!{1}'.format(spec.epoch, '.'.join(map(str, spec.release[:-1]))))
+        return version.public_key >= spec.key and prefix_matches(version, prefix)
+    if operator == '<=':
+        return version.public_key <= spec.key
+    if operator == '>=':
+        return version.public_key >= spec.key
+    # The exclusive comparisons do not match the pre-releases, post-releases and local versions of the version
+    if operator == '<':
+        return version.key < (spec.key if spec.is_prerelease else parse_version(text + '.dev0').key)
+    if not version.public_key > spec.key:
+        return False
+    return spec.post is not None or spec.dev is not None or version.post is None or (
+        (version.base, version.pre) != (spec.base, spec.pre)
+    )
+
+
+def parse_specifier(text):
+    text = text.strip()
+    if text.startswith('(') and text.endswith(')'):
+        text = text[1:-1]
+    clauses = []
+    for clause in text.split(','):
+        if clause.strip():
+            match = SPECIFIER_CLAUSE.match(clause)
+            if match is None or not valid_specifier(*match.groups()):
+                raise ValueError('invalid specifier: ' + text)
+            clauses.append(match.groups())
+    return clauses
+
+
+def version_satisfied(clauses, version_text):
+    for operator, text in clauses:
+        if not specifier_contains(operator, text, version_text):
+            return False
+    return True
+
+
+def parse_marker(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = MARKER_TOKEN.match(text, position)
+        if match is None:
+            raise ValueError('invalid marker: ' + text)
+        parenthesis, single_quoted, double_quoted, operator, variable = match.groups()
+        if parenthesis is not None:
+            tokens.append(('parenthesis', parenthesis))
+        elif operator is not None:
+            tokens.append(('operator', ' '.join(operator.split())))
+        elif variable is not None:
+            tokens.append(('variable', MARKER_ALIASES.get(variable, variable)))
+        else:
+            tokens.append(('string', double_quoted if single_quoted is None else single_quoted))
+        position = match.end()
+
+    tokens.reverse()
+    expression = parse_marker_expression(tokens, text)
+    if tokens:
+        raise ValueError('invalid marker: ' + text)
+    return expression
+
+
+def parse_marker_expression(tokens, text):
+    # A list of alternatives, each being a list of conditions that must all be true
+    alternatives = [[parse_marker_atom(tokens, text)]]
+    while tokens and tokens[-1][0] == 'operator' and tokens[-1][1] in ('and', 'or'):
+        if tokens.pop()[1] == 'or':
+            alternatives.append([])
+        alternatives[-1].append(parse_marker_atom(tokens, text))
+    return alternatives
+
+
+def parse_marker_atom(tokens, text):
+    if not tokens:
+        raise ValueError('invalid marker: ' + text)
+    if tokens[-1] == ('parenthesis', '('):
+        tokens.pop()
+        expression = parse_marker_expression(tokens, text)
+        if not tokens or tokens.pop() != ('parenthesis', ')'):
+            raise ValueError('invalid marker: ' + text)
+        return expression
+    if len(tokens) < 3 or tokens[-2][0] != 'operator' or tokens[-2][1] in ('and', 'or'):
+        raise ValueError('invalid marker: ' + text)
+    lhs, operator, rhs = tokens.pop(), tokens.pop()[1], tokens.pop()
+    if lhs[0] not in ('variable', 'string') or rhs[0] not in ('variable', 'string'):
+        raise ValueError('invalid marker: ' + text)
+    return (lhs, operator, rhs)
+
+
+def evaluate_marker(expression, extra):
+    if isinstance(expression, tuple):
+        return evaluate_comparison(expression, extra)
+    for conditions in expression:
+        satisfied = True
+        for condition in conditions:
+            if not evaluate_marker(condition, extra):
+                satisfied = False
+                break
+        if satisfied:
+            return True
+    return False
+
+
+def evaluate_comparison(comparison, extra):
+    values = []
+    variable = None
+    for kind, value in (comparison[0], comparison[2]):
+        if kind == 'variable':
+            variable = value
+            if value == 'extra':
+                value = extra or ''
+            elif value in environment:
+                value = environment[value]
+            else:
+                raise ValueError('undefined marker variable: ' + value)
+        values.append(value)
+
+    lhs, rhs = values
+    operator = comparison[1]
+    if variable == 'extra':
+        lhs, rhs = canonical_name(lhs), canonical_name(rhs)
+    if operator not in ('in', 'not in') and valid_specifier(operator, rhs):
+        return specifier_contains(operator, rhs, lhs)
+    if operator == 'in':
+        return lhs in rhs
+    if operator == 'not in':
+        return lhs not in rhs
+    if operator == '==':
+        return lhs == rhs
+    if operator == '!=':
+        return lhs != rhs
+    if operator == '<':
+        return lhs < rhs
+    if operator == '<=':
+        return lhs <= rhs
+    if operator == '>=':
+        return lhs >= rhs
+    if operator == '>':
+        return lhs > rhs
+    raise ValueError('undefined comparison: ' + operator)
+
+
+class Requirement(object):
+    def __init__(self, text):
+        match = REQUIREMENT.match(text)
+        if match is None:
+            raise ValueError('invalid requirement: ' + text)
+        name, extras, rest = match.groups()
+        self.name = canonical_name(name)
+        self.extras = sorted(set(canonical_name(extra.strip()) for extra in (extras or '').split(',') if extra.strip()))
+        self.url = None
+        self.specifier = []
+        marker = None
+        if rest.startswith('@'):
+            # The URL ends at the first whitespace
+            parts = rest[1:].strip().split(None, 1)
+            self.url = parts[0]
+            rest = parts[1] if len(parts) > 1 else ''
+            if rest:
+                if not rest.startswith(';'):
+                    raise ValueError('invalid requirement: ' + text)
+                marker = rest[1:]
+        else:
+            specifier, separator, marker = rest.partition(';')
+            self.specifier = parse_specifier(specifier)
+            if not separator:
+                marker = None
+        self.marker = None if marker is None or not marker.strip() else parse_marker(marker)
+
+
+class Record(object):
+    def __init__(self, name, path, version, open_file):
+        self.name = name
+        self.path = path
+        self.open_file = open_file
+        self.version = version
+        self.cached_headers = None
+        self.cached_requirements = None
+        self.cached_extras = None
+
+    def headers(self):
+        if self.cached_headers is None:
+            self.cached_headers = {}
+            for metadata_file in (self.path + '/METADATA', self.path + '/PKG-INFO', self.path):
+                f = self.open_file(metadata_file)
+                if f is None:
+                    continue
+                with f:
+                    headers = parse_metadata_headers(f)
+                if headers is not None:
+                    self.cached_headers = headers
+                    break
+        return self.cached_headers
+
+    def requirements(self):
+        if self.cached_requirements is None:
+            self.cached_requirements = [Requirement(text) for text in self.headers().get('requires-dist', [])]
+        return self.cached_requirements
+
+    def available_extras(self):
+        if self.cached_extras is None:
+            self.cached_extras = set(canonical_name(extra) for extra in self.headers().get('provides-extra', []))
+        return self.cached_extras
+
+    def direct_url(self):
+        f = self.open_file(self.path + '/direct_url.json')
+        if f is None:
+            return None
+        with f:
+            return json.loads(f.read())
+
+
+def parse_metadata_headers(lines):
+    headers = {}
+    current = None
+    empty = True
+    for line in lines:
+        empty = False
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current[1].append(line)
+            continue
+        if current is not None:
+            headers.setdefault(current[0], []).append(''.join(current[1]).rstrip('\r\n'))
+            current = None
+        name, separator, value = line.partition(':')
+        if not separator or not name or ' ' in name:
+            break
+        name = name.lower()
+        if name in METADATA_FIELDS:
+            current = (name, [value.lstrip(' \t')])
+    else:
+        if current is not None:
+            headers.setdefault(current[0], []).append(''.join(current[1]).rstrip('\r\n'))
+    return None if empty else headers
+
+
+def open_directory_file(path):
+    try:
+        return io.open(path, encoding='utf-8')
+    except (IOError, OSError):
+        return None
+
+
+def archive_file_opener(archive):
+    def open_file(path):
+        try:
+            return io.StringIO(archive.read(path).decode('utf-8'))
+        except KeyError:
+            return None
+    return open_file
+
+
+def scan_entry(entry):
+    try:
+        children = [(name, os.path.join(entry, name)) for name in os.listdir(entry)]
+        open_file = open_directory_file
+    except (IOError, OSError):
+        try:
+            archive = zipfile.ZipFile(entry)
+        except (IOError, OSError, zipfile.BadZipfile):
+            return
+        directories = []
+        for member in archive.namelist():
+            directory = member.partition('/')[0]
+            if directory != member and directory not in directories:
+                directories.append(directory)
+        children = [(directory, directory) for directory in directories]
+        open_file = archive_file_opener(archive)
+
+    for child_name, child_path in children:
+        stem, _, suffix = child_name.rpartition('.')
+        if stem and suffix.lower() in ('dist-info', 'egg-info'):
+            project_name, _, version = stem.partition('-')
+            if suffix.lower() == 'egg-info':
+                version = version.partition('-')[0]
+            record = parse_record(project_name, version, child_path, open_file)
+            if record is not None:
+                yield record
+
+    base = os.path.basename(entry).lower()
+    if base.endswith('.egg'):
+        for child_name, child_path in children:
+            if child_name.lower() == 'egg-info':
+                project_name, _, version = base.rpartition('.')[0].partition('-')
+                record = parse_record(project_name, version.partition('-')[0], child_path, open_file)
+                if record is not None:
+                    yield record
+
+
+def parse_record(project_name, version, path, open_file):
+    if project_name and version[:1].isdigit():
+        return Record(canonical_name(project_name), path, version, open_file)
+    record = Record('', path, None, open_file)
+    headers = record.headers()
+    if not headers.get('name'):
+        return None
+    record.name = canonical_name(headers['name'][0])
+    record.version = headers.get('version', [''])[0]
+    return record
+
+
+def iter_records():
+    for entry in sys_path:
+        for record in scan_entry(entry):
+            yield record
+
+
+request = json.load(sys.stdin)
+records = iter_records()
+distributions = {}
+extras_satisfied = {}
+extras_pending = set()
+extras_assumed = []
+
+
+def get_record(name):
+    if name in distributions:
+        return distributions[name]
+    for record in records:
+        distributions.setdefault(record.name, record)
+        if record.name == name:
+            return record
+    distributions[name] = None
+    return None
+
+
+def requirement_satisfied(record, specifier, extras):
+    if not version_satisfied(specifier, record.version):
+        return False
+    for extra in extras:
+        if not extra_satisfied(record, extra):
+            return False
+    return True
+
+
+def direct_url_matches(url, direct_url):
+    # The commits of Git repositories that are required by extras are not compared with the remote
+    if direct_url is None:
+        return False
+    if 'vcs_info' in direct_url:
+        vcs_url = direct_url['vcs_info']['vcs'] + '+' + direct_url['url']
+        return url == vcs_url or url.startswith(vcs_url + '@')
+    if 'dir_info' in direct_url and direct_url['dir_info'].get('editable', False):
+        return False
+    return url == direct_url['url']
+
+
+def extra_satisfied(record, extra):
+    key = (record.name, extra)
+    if key in extras_satisfied:
+        return extras_satisfied[key]
+    # Extras that depend on themselves are assumed to be satisfied while they are being evaluated
+    if key in extras_pending:
+        extras_assumed.append(key)
+        return True
+    if extra not in record.available_extras():
+        extras_satisfied[key] = False
+        return False
+
+    assumptions = len(extras_assumed)
+    extras_pending.add(key)
+    try:
+        satisfied = True
+        for requirement in record.requirements():
+            if requirement.marker is None or not evaluate_marker(requirement.marker, extra):
+                continue
+            required_record = get_record(requirement.name)
+            if required_record is None or not requirement_satisfied(
+                required_record, requirement.specifier, requirement.extras
+            ):
+                satisfied = False
+                break
+            if requirement.url is not None and not direct_url_matches(requirement.url, required_record.direct_url()):
+                satisfied = False
+                break
+    finally:
+        extras_pending.discard(key)
+
+    remaining_assumptions = [assumed for assumed in extras_assumed[assumptions:] if assumed != key]
+    extras_assumed[assumptions:] = remaining_assumptions
+    if not satisfied or not remaining_assumptions:
+        extras_satisfied[key] = satisfied
+    return satisfied
+
+
+satisfied = []
+direct_urls = []
+names = set()
+for index, (name, specifier, extras, marker, url) in enumerate(request['dependencies']):
+    names.add(name)
+    if marker is not None and not evaluate_marker(parse_marker(marker), None):
+        satisfied.append(index)
+        continue
+    record = get_record(name)
+    if record is None or not requirement_satisfied(record, parse_specifier(specifier), extras):
+        continue
+    if url is None:
+        satisfied.append(index)
+    else:
+        direct_urls.append([index, record.direct_url()])
+
+not_required = []
+if request['exhaustive']:
+    for record in records:
+        distributions.setdefault(record.name, record)
+    not_required = [name for name, record in distributions.items() if record is not None and name not in names]
+
+json.dump({'satisfied': satisfied, 'direct_urls': direct_urls, 'not_required': not_required}, sys.stdout)
+"""
+)
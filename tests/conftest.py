@@ -3,17 +3,21 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import json
 import os
 import subprocess
 import sys
 from ast import literal_eval
 from functools import cached_property
-from typing import TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import pytest
 
 from dep_sync.scripts import PYTHON_INFO_SCRIPT
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 class PythonInfo(TypedDict):
     sys_path: list[str]
@@ -34,6 +38,11 @@ def pip_venv(tmp_path) -> VirtualEnv:
     return venv
 
 
+@pytest.fixture
+def site_packages(tmp_path) -> SitePackages:
+    return SitePackages(tmp_path / "site-packages")
+
+
 class VirtualEnv:
     def __init__(self, path: os.PathLike) -> None:
         self.__path = path
@@ -69,3 +78,44 @@ class PipVirtualEnv(VirtualEnv):
 
     def install_base_command(self) -> list[str]:
         return [self.python_path, "-m", "pip", "install"]
+
+
+class SitePackages:
+    """
+    A synthetic installation directory that does not require building environments or network access.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def sys_path(self) -> list[str]:
+        return [str(self.path)]
+
+    def install(
+        self,
+        name: str,
+        version: str,
+        *,
+        requires: list[str] | None = None,
+        extras: list[str] | None = None,
+        direct_url: dict[str, Any] | None = None,
+        directory_name: str | None = None,
+    ) -> Path:
+        if directory_name is None:
+            directory_name = f"{name.replace('-', '_')}-{version}.dist-info"
+
+        metadata_directory = self.path / directory_name
+        metadata_directory.mkdir()
+
+        lines = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+        lines.extend(f"Provides-Extra: {extra}" for extra in extras or [])
+        lines.extend(f"Requires-Dist: {requirement}" for requirement in requires or [])
+        metadata_file = "PKG-INFO" if directory_name.endswith(".egg-info") else "METADATA"
+        (metadata_directory / metadata_file).write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+        if direct_url is not None:
+            (metadata_directory / "direct_url.json").write_text(json.dumps(direct_url), encoding="utf-8")
+
+        return metadata_directory
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import zipfile
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions
+
+
+def archive_directory(directory, archive, *, compression=zipfile.ZIP_DEFLATED, prefix=b""):
+    archive.write_bytes(prefix)
+    with zipfile.ZipFile(archive, "a", compression=compression) as z:
+        for root, _, files in os.walk(directory):
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                z.write(path, os.path.relpath(path, directory).replace(os.sep, "/"))
+
+    return str(archive)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2])
+def test_compression(tmp_path, site_packages, compression):
+    site_packages.install("foo", "1.0", requires=["bar>=1"])
+    site_packages.install("bar", "1.0")
+    archive = archive_directory(site_packages.path, tmp_path / "app.zip", compression=compression)
+    distributions = InstalledDistributions(sys_path=[archive])
+
+    assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
+    assert not distributions.dependencies_satisfied([Dependency("bar>1")])
+
+
+def test_zipapp(tmp_path, site_packages):
+    site_packages.install("foo", "1.0")
+    archive = archive_directory(site_packages.path, tmp_path / "app.pyz", prefix=b"#!/usr/bin/env python3\n")
+    distributions = InstalledDistributions(sys_path=[archive])
+
+    distribution = distributions.get("foo")
+    assert distribution is not None
+    assert distribution.version == "1.0"
+    assert distribution.read_text("METADATA").startswith("Metadata-Version: 2.1\n")
+    assert distribution.read_text("RECORD") is None
+
+
+def test_egg(tmp_path, site_packages):
+    site_packages.install("foo-bar", "1.0", directory_name="EGG-INFO")
+    archive = archive_directory(site_packages.path, tmp_path / "foo_bar-1.0-py3.12.egg")
+    distributions = InstalledDistributions(sys_path=[archive])
+
+    assert distributions.dependencies_satisfied([Dependency("foo-bar==1.0")])
+
+
+def test_direct_url(tmp_path, site_packages):
+    project = tmp_path / "projects" / "foo"
+    site_packages.install("foo", "1.0", direct_url={"url": project.as_uri(), "dir_info": {"editable": True}})
+    archive = archive_directory(site_packages.path, tmp_path / "app.zip")
+    distributions = InstalledDistributions(sys_path=[archive])
+
+    assert distributions.dependencies_satisfied([Dependency(f"foo @ {project.as_uri()}", editable=True)])
+    assert distributions.installed_from(str(project)) == "foo"
+
+
+def test_central_directory_read_once(tmp_path, site_packages, monkeypatch):
+    for name in ("foo", "bar", "baz"):
+        site_packages.install(name, "1.0", requires=["qux; extra == 'all'"], extras=["all"])
+
+    archive = archive_directory(site_packages.path, tmp_path / "app.zip")
+    opened = []
+    zip_file = zipfile.ZipFile
+
+    def open_and_record(*args, **kwargs):
+        opened.append(args[0])
+        return zip_file(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "ZipFile", open_and_record)
+    distributions = InstalledDistributions(sys_path=[archive], share_entries=False)
+    dependencies = [Dependency("foo"), Dependency("bar[all]")]
+    state = distributions.dependency_state(dependencies, exhaustive=True)
+
+    assert state.missing == (dependencies[1],)
+    assert len(opened) == 1
+
+
+def test_not_an_archive(tmp_path, site_packages):
+    site_packages.install("foo", "1.0")
+    not_an_archive = tmp_path / "foo.zip"
+    not_an_archive.write_bytes(b"foo")
+    distributions = InstalledDistributions(sys_path=[str(not_an_archive), *site_packages.sys_path])
+
+    assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
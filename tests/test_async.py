@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions, UnsatisfiedReason
+from tests.conftest import SitePackages
+from tests.test_vcs import GitRemote
+
+
+@pytest.fixture
+def hanging_git(tmp_path, monkeypatch):
+    """
+    A `git` executable that records its process ID and never exits.
+    """
+    if sys.platform == "win32":
+        pytest.skip("requires a POSIX shell")
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pid_file = tmp_path / "git.pid"
+    git = bin_dir / "git"
+    git.write_text(f"#!/bin/sh\necho $$ > {pid_file}\nexec sleep 60\n", encoding="utf-8")
+    git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return pid_file
+
+
+def process_exited(pid: int) -> bool:
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+
+        time.sleep(0.1)
+
+    return False
+
+
+def test_matches_sync(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'bar'"], extras=["bar"])
+    site_packages.install("bar", "1.0")
+    site_packages.install("baz", "1.0")
+    deps = [Dependency("foo[bar]"), Dependency("bar>1"), Dependency("missing")]
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    state = asyncio.run(distributions.async_dependency_state(deps, exhaustive=True))
+    expected = InstalledDistributions(sys_path=site_packages.sys_path).dependency_state(deps, exhaustive=True)
+
+    assert state.satisfied == expected.satisfied == (deps[0],)
+    assert state.missing == expected.missing == (deps[1], deps[2])
+    assert state.not_required == expected.not_required == ("baz",)
+    assert asyncio.run(distributions.async_dependencies_satisfied(deps[:1]))
+    assert not asyncio.run(distributions.async_dependencies_satisfied(deps))
+
+
+def test_git_subprocesses_do_not_block(tmp_path, site_packages, monkeypatch):
+    remote = GitRemote(tmp_path / "remote.git")
+    old_commit_id = remote.commit()
+    commit_id = remote.commit()
+    remote.install(site_packages, "foo", commit_id)
+    other_site_packages = SitePackages(tmp_path / "other-site-packages")
+    remote.install(other_site_packages, "foo", old_commit_id)
+
+    monkeypatch.setattr(subprocess, "run", None)
+    deps = [Dependency(f"foo @ git+{remote.url}")]
+    cache_dir = str(tmp_path / "cache")
+
+    async def check_environments():
+        return await asyncio.gather(
+            InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir).async_dependency_state(deps),
+            InstalledDistributions(sys_path=other_site_packages.sys_path).async_dependency_state(deps),
+        )
+
+    state, other_state = asyncio.run(check_environments())
+    assert state.satisfied == (deps[0],)
+    assert other_state.missing == (deps[0],)
+
+    # Resolutions are persisted
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", None)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+    assert asyncio.run(distributions.async_dependencies_satisfied(deps))
+
+
+def test_vcs_timeout(site_packages, hanging_git):
+    vcs_info = {"vcs": "git", "commit_id": "abc"}
+    site_packages.install("foo", "1.0", direct_url={"url": "https://github.com/org/repo", "vcs_info": vcs_info})
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, vcs_timeout=0.5)
+
+    deps = [Dependency("foo @ git+https://github.com/org/repo")]
+    assert not asyncio.run(distributions.async_dependencies_satisfied(deps))
+    assert process_exited(int(hanging_git.read_text(encoding="utf-8")))
+    assert list(distributions.iter_dependency_state(deps)) == [(deps[0], False, UnsatisfiedReason.VCS_UNREACHABLE)]
+
+
+def test_timeout_kills_git(site_packages, hanging_git):
+    vcs_info = {"vcs": "git", "commit_id": "abc"}
+    site_packages.install("foo", "1.0", direct_url={"url": "https://github.com/org/repo", "vcs_info": vcs_info})
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    deps = [Dependency("foo @ git+https://github.com/org/repo")]
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(distributions.async_dependency_state(deps, timeout=0.5))
+
+    assert process_exited(int(hanging_git.read_text(encoding="utf-8")))
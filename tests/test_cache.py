@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import shutil
+import time
+
+from dep_sync import Dependency, InstalledDistributions, dependencies_satisfied
+
+
+def settle(path):
+    timestamp = time.time() - 10
+    os.utime(path, (timestamp, timestamp))
+
+
+def test_warm_cache_does_not_read_metadata(tmp_path, site_packages):
+    cache_dir = str(tmp_path / "cache")
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'baz'"], extras=["baz"])
+    site_packages.install("bar", "1.0")
+    settle(site_packages.path)
+
+    deps = [Dependency("foo[baz]==1.0")]
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    for metadata_directory in site_packages.path.iterdir():
+        (metadata_directory / "METADATA").unlink()
+
+    # Distributions that were already found are shared within the process
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path)
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, share_entries=False)
+    assert distributions.dependencies_satisfied(deps)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, share_entries=False)
+    assert not distributions.dependencies_satisfied(deps)
+
+
+def test_changed_directory_is_scanned(tmp_path, site_packages):
+    cache_dir = str(tmp_path / "cache")
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+
+    deps = [Dependency("foo"), Dependency("bar")]
+    assert not dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=cache_dir)
+
+    site_packages.install("bar", "1.0")
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=cache_dir)
+
+    settle(site_packages.path)
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=cache_dir)
+
+    shutil.rmtree(site_packages.path / "foo-1.0.dist-info")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+    assert distributions.get("foo") is None
+    assert distributions.get("bar") is not None
+
+
+def test_direct_url(tmp_path, site_packages):
+    cache_dir = str(tmp_path / "cache")
+    project_url = (tmp_path / "foo").as_uri()
+    site_packages.install("foo", "1.0", direct_url={"url": project_url, "dir_info": {"editable": True}})
+    settle(site_packages.path)
+
+    deps = [Dependency(f"foo @ {project_url}", editable=True)]
+    for _ in range(2):
+        assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=cache_dir)
+        assert not dependencies_satisfied([Dependency(f"foo @ {project_url}")], sys_path=site_packages.sys_path)
+
+
+def test_corrupt_cache(tmp_path, site_packages):
+    cache_dir = tmp_path / "cache"
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+
+    deps = [Dependency("foo")]
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=str(cache_dir))
+
+    for index_file in cache_dir.iterdir():
+        index_file.write_text("{", encoding="utf-8")
+
+    assert dependencies_satisfied(deps, sys_path=site_packages.sys_path, cache_dir=str(cache_dir))
@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+from dep_sync import Dependency, EnvironmentCheckError
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Requires Unix sockets")
+
+
+@pytest.fixture
+def socket_path():
+    # Socket paths are limited to about 100 characters so avoid the deeply nested temporary directories of tests
+    with tempfile.TemporaryDirectory() as d:
+        yield os.path.join(d, "dep-sync.sock")
+
+
+@pytest.fixture
+def daemon(socket_path):
+    from dep_sync.daemon import Daemon
+
+    server = Daemon().server(socket_path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield socket_path
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_state(daemon, venv):
+    from dep_sync.daemon import request_dependency_state
+
+    venv.install(["binary"])
+    deps = [Dependency("binary"), Dependency("binary>9000"), Dependency("binary")]
+
+    state = request_dependency_state(daemon, deps, python=venv.python_path, exhaustive=True)
+    assert state.satisfied == (deps[0], deps[2])
+    assert state.missing == (deps[1],)
+    assert state.not_required == ()
+
+
+def test_changes_are_detected(daemon, venv):
+    from dep_sync.daemon import request_dependency_state
+
+    deps = [Dependency("binary")]
+    assert request_dependency_state(daemon, deps, python=venv.python_path).missing == (deps[0],)
+
+    venv.install(["binary"])
+    assert request_dependency_state(daemon, deps, python=venv.python_path).satisfied == (deps[0],)
+
+
+def test_environment_error(daemon, tmp_path):
+    from dep_sync.daemon import request_dependency_state
+
+    python = str(tmp_path / "missing" / "python")
+    with pytest.raises(EnvironmentCheckError) as exc_info:
+        request_dependency_state(daemon, [Dependency("binary")], python=python)
+
+    assert exc_info.value.python == python
+
+
+def test_malformed_request(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(daemon)
+        client.sendall(b"{\n[]\n")
+        with client.makefile("rb") as f:
+            assert "error" in json.loads(f.readline())
+            assert "error" in json.loads(f.readline())
+
+
+def test_socket_permissions(daemon):
+    import stat
+
+    assert stat.S_IMODE(os.stat(daemon).st_mode) == 0o600
+
+
+def test_socket_removed_during_serve(socket_path, monkeypatch):
+    from dep_sync.daemon import Daemon
+
+    def serve_forever(_):
+        os.remove(socket_path)
+
+    monkeypatch.setattr("socketserver.BaseServer.serve_forever", serve_forever)
+    Daemon().serve(socket_path)
+
+    assert not os.path.exists(socket_path)
+
+
+def test_socket_in_use(daemon):
+    from dep_sync.daemon import Daemon
+
+    with pytest.raises(OSError, match="in use"):
+        Daemon().server(daemon)
+
+
+def test_not_a_socket(socket_path):
+    from dep_sync.daemon import Daemon
+
+    with open(socket_path, "w", encoding="utf-8") as f:
+        f.write("data")
+
+    with pytest.raises(OSError, match="in use"):
+        Daemon().server(socket_path)
+
+    with open(socket_path, encoding="utf-8") as f:
+        assert f.read() == "data"
+
+
+def test_entry_point(socket_path):
+    from dep_sync.daemon import request_dependency_state
+
+    # Leave a socket behind as would happen if a daemon was killed
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(socket_path)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    process = subprocess.Popen([sys.executable, "-m", "dep_sync.daemon", "--socket", socket_path], env=env)
+    try:
+        for _ in range(100):
+            try:
+                state = request_dependency_state(socket_path, [Dependency("packaging")], timeout=10)
+            except OSError:
+                time.sleep(0.1)
+            else:
+                break
+        else:  # no cov
+            pytest.fail("The daemon did not start")
+
+        assert state.satisfied == (Dependency("packaging"),)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=10)
+
+    assert process.returncode == 0
+    assert not os.path.exists(socket_path)
@@ -42,3 +42,50 @@ class TestPath:
     def test_unix(self):
         dep = Dependency("pkg @ file:///c/b/a")
         assert dep.path == "/c/b/a"
+
+
+class TestCanonicalName:
+    def test_normalized(self):
+        dep = Dependency("Foo.Bar_Baz>1")
+        assert dep.canonical_name == "foo-bar-baz"
+
+
+class TestFromString:
+    def test_shared(self):
+        dep = Dependency.from_string("pkg>1")
+        assert Dependency.from_string("pkg>1") is dep
+        assert dep == Dependency("pkg>1")
+
+    def test_editable(self):
+        dep = Dependency.from_string("pkg @ file:///a/b/c", editable=True)
+        assert dep.editable is True
+        assert Dependency.from_string("pkg @ file:///a/b/c") is not dep
+        assert Dependency.from_string("pkg @ file:///a/b/c").editable is False
+
+    def test_immutable(self):
+        dep = Dependency.from_string("pkg[foo] @ file:///a/b/c")
+        assert dep.path is not None
+
+        with pytest.raises(AttributeError, match="cannot be modified"):
+            dep.editable = True
+
+        assert dep.editable is False
+        assert dep.extras == frozenset({"foo"})
+        with pytest.raises(AttributeError):
+            dep.extras.add("bar")  # type: ignore[attr-defined]
+
+        assert Dependency.from_string("pkg[foo] @ file:///a/b/c").extras == {"foo"}
+
+    def test_subclass(self):
+        class Subclass(Dependency):
+            pass
+
+        dep = Subclass.from_string("pkg")
+        assert type(dep) is Subclass
+        assert Subclass.from_string("pkg") is dep
+        assert type(Dependency.from_string("pkg")) is Dependency
+
+    def test_not_shared_by_default(self):
+        dep = Dependency("pkg")
+        dep.editable = True
+        assert dep.editable is True
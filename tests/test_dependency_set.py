@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from dep_sync import Dependency, DependencySet, InstalledDistributions, UnsatisfiedReason
+from tests.conftest import SitePackages
+
+
+def test_sequence():
+    dependencies = [Dependency("foo"), Dependency("bar")]
+    dependency_set = DependencySet(iter(dependencies))
+
+    assert len(dependency_set) == 2
+    assert list(dependency_set) == dependencies
+    assert repr(dependency_set) == "DependencySet([<Dependency('foo')>, <Dependency('bar')>])"
+
+
+def test_many_environments(tmp_path):
+    project = tmp_path / "projects" / "baz"
+    dependency_set = DependencySet([
+        Dependency("Foo.Bar>=1"),
+        Dependency("qux[Extra_A]"),
+        Dependency(f"baz @ {project.as_uri()}", editable=True),
+        Dependency("missing; sys_platform == 'never'"),
+    ])
+
+    current = SitePackages(tmp_path / "current")
+    current.install("foo-bar", "1.5")
+    current.install("qux", "1.0", extras=["extra-a"], requires=["foo-bar>1; extra == 'extra-a'"])
+    current.install("baz", "1.0", direct_url={"url": project.as_uri(), "dir_info": {"editable": True}})
+
+    outdated = SitePackages(tmp_path / "outdated")
+    outdated.install("foo_bar", "0.9")
+    outdated.install("qux", "1.0")
+    outdated.install("baz", "1.0")
+
+    state = InstalledDistributions(sys_path=current.sys_path).dependency_state(dependency_set, exhaustive=True)
+    assert state.satisfied == dependency_set.dependencies
+    assert state.missing == ()
+    assert state.not_required == ()
+
+    distributions = InstalledDistributions(sys_path=outdated.sys_path)
+    assert not distributions.dependencies_satisfied(dependency_set)
+    assert [(reason, dependency) for dependency, _, reason in distributions.iter_dependency_state(dependency_set)] == [
+        (UnsatisfiedReason.VERSION_MISMATCH, dependency_set.dependencies[0]),
+        (UnsatisfiedReason.EXTRA_MISSING, dependency_set.dependencies[1]),
+        (UnsatisfiedReason.URL_MISMATCH, dependency_set.dependencies[2]),
+        (None, dependency_set.dependencies[3]),
+    ]
+
+    plan = distributions.plan(dependency_set)
+    assert plan.to_upgrade == dependency_set.dependencies[:3]
+
+
+def test_invalid_version(site_packages):
+    site_packages.install("foo", "unknown")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied(DependencySet([Dependency("foo")]))
+    assert not distributions.dependencies_satisfied(DependencySet([Dependency("foo>=1")]))
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from dep_sync import Dependency, InstalledDistributions
+
+
+def test_name_and_version_from_directory(site_packages):
+    metadata_directory = site_packages.install("foo-bar", "1.2.3")
+    (metadata_directory / "METADATA").unlink()
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("Foo.Bar==1.2.3")])
+    assert not distributions.dependencies_satisfied([Dependency("foo-bar>1.2.3")])
+
+
+def test_ambiguous_directory_reads_metadata(site_packages):
+    site_packages.install("foo-bar", "1.0", directory_name="foo_bar.egg-info")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    distribution = distributions.get("foo_bar")
+    assert distribution is not None
+    assert distribution.version == "1.0"
+    assert distributions.dependencies_satisfied([Dependency("foo-bar==1.0")])
+
+
+def test_egg_info_python_tag(site_packages):
+    site_packages.install("foo", "2.0", directory_name="foo-2.0-py3.12.egg-info")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo==2.0")])
+
+
+def test_get_returns_distribution(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    distribution = distributions.get("FOO")
+    assert distribution is not None
+    assert distribution.metadata["Name"] == "foo"
+    assert distribution.requires == ["bar"]
+    assert distributions.get("bar") is None
+
+
+def test_first_path_entry_takes_precedence(tmp_path, site_packages):
+    from tests.conftest import SitePackages
+
+    other = SitePackages(tmp_path / "other")
+    site_packages.install("foo", "1.0")
+    other.install("foo", "2.0")
+    other.install("bar", "1.0")
+    distributions = InstalledDistributions(sys_path=[*site_packages.sys_path, *other.sys_path])
+
+    assert distributions.dependencies_satisfied([Dependency("foo==1.0"), Dependency("bar")])
+    assert not distributions.dependencies_satisfied([Dependency("foo==2.0")])
+
+    state = distributions.dependency_state([Dependency("foo")], exhaustive=True)
+    assert state.not_required == ("bar",)
+
+
+def test_missing_path_entries_are_ignored(tmp_path, site_packages):
+    site_packages.install("foo", "1.0")
+    distributions = InstalledDistributions(sys_path=[str(tmp_path / "missing"), *site_packages.sys_path])
+
+    assert distributions.dependencies_satisfied([Dependency("foo")])
+
+
+class TestScanWorkers:
+    def test_precedence(self, tmp_path, monkeypatch):
+        import os
+        import threading
+        import time
+
+        from tests.conftest import SitePackages
+
+        entries = []
+        for i in range(4):
+            site_packages = SitePackages(tmp_path / f"site-packages{i}")
+            site_packages.install("foo", f"{i}.0")
+            site_packages.install(f"bar{i}", "1.0", directory_name=f"bar{i}.egg-info")
+            entries.append(str(site_packages.path))
+
+        threads = {}
+        scandir = os.scandir
+
+        def slow_scandir(path):
+            threads[os.fspath(path)] = threading.get_ident()
+            # Earlier entries finish scanning last
+            time.sleep(0.05 * (len(entries) - entries.index(os.fspath(path))))
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", slow_scandir)
+        distributions = InstalledDistributions(sys_path=[*entries, entries[0]], share_entries=False, scan_workers=4)
+
+        assert distributions.dependencies_satisfied([Dependency("foo==0.0")])
+        assert sorted(threads) == entries
+        assert len(set(threads.values())) > 1
+
+        state = distributions.dependency_state([Dependency("foo"), Dependency("bar3")], exhaustive=True)
+        assert state.not_required == ("bar0", "bar1", "bar2")
+
+    def test_refresh(self, tmp_path, site_packages):
+        import os
+        import time
+
+        from tests.conftest import SitePackages
+
+        other = SitePackages(tmp_path / "other")
+        other.install("foo", "2.0")
+        # Entries modified too recently are always considered changed
+        timestamp = time.time() - 10
+        os.utime(other.path, (timestamp, timestamp))
+        distributions = InstalledDistributions(
+            sys_path=[*site_packages.sys_path, *other.sys_path], collect_stats=True, scan_workers=2
+        )
+        assert distributions.dependencies_satisfied([Dependency("foo==2.0")])
+
+        site_packages.install("foo", "1.0")
+        assert distributions.refresh()
+        assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
+        assert distributions.stats is not None
+        assert distributions.stats.counts["entries_scanned"] == 3
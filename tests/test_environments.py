@@ -0,0 +1,206 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from dep_sync import (
+    Dependency,
+    DependencyState,
+    EnvironmentCheckError,
+    InstalledDistributions,
+    dependency_states,
+    python_info,
+)
+
+
+def test_no_environments():
+    assert dependency_states({}) == {}
+
+
+def test_multiple_environments(tmp_path, venv):
+    missing_python = str(tmp_path / "missing" / "python")
+    deps = [Dependency("packaging"), Dependency("dep-sync-missing")]
+
+    states = dependency_states(
+        {sys.executable: deps, venv.python_path: deps[:1], missing_python: deps}, max_workers=2, timeout=30
+    )
+    assert list(states) == [sys.executable, venv.python_path, missing_python]
+
+    state = states[sys.executable]
+    assert isinstance(state, DependencyState)
+    assert state.satisfied == (deps[0],)
+    assert state.missing == (deps[1],)
+
+    state = states[venv.python_path]
+    assert isinstance(state, DependencyState)
+    assert state.missing == (deps[0],)
+
+    error = states[missing_python]
+    assert isinstance(error, EnvironmentCheckError)
+    assert error.python == missing_python
+
+
+def test_exhaustive(venv):
+    venv.install(["binary"])
+
+    states = dependency_states({venv.python_path: []}, exhaustive=True)
+    state = states[venv.python_path]
+    assert isinstance(state, DependencyState)
+    assert state.not_required == ("binary",)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires non-Windows system")
+def test_interpreter_failure(tmp_path):
+    python = tmp_path / "python"
+    python.write_text("#!/bin/sh\nexit 3\n", encoding="utf-8")
+    python.chmod(0o755)
+
+    error = dependency_states({str(python): []})[str(python)]
+    assert isinstance(error, EnvironmentCheckError)
+    assert error.message.startswith("exited with code 3")
+
+
+class TestPythonInfo:
+    @staticmethod
+    def settle(venv, tmp_path):
+        timestamp = time.time() - 10
+        for path in venv.python_info["sys_path"]:
+            if path.startswith(str(tmp_path)):
+                os.utime(path, (timestamp, timestamp))
+
+    def test_uncached(self, venv):
+        assert python_info(venv.python_path) == venv.python_info
+
+    def test_cached(self, tmp_path, venv, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        self.settle(venv, tmp_path)
+        assert python_info(venv.python_path, cache_dir=cache_dir) == venv.python_info
+
+        with monkeypatch.context() as m:
+            m.setattr(subprocess, "run", None)
+            assert python_info(venv.python_path, cache_dir=cache_dir) == venv.python_info
+
+    def test_search_path_changed(self, tmp_path, venv):
+        cache_dir = str(tmp_path / "cache")
+        self.settle(venv, tmp_path)
+        assert python_info(venv.python_path, cache_dir=cache_dir) == venv.python_info
+
+        site_packages = next(path for path in venv.python_info["sys_path"] if path.startswith(str(tmp_path)))
+        extra_path = tmp_path / "extra"
+        extra_path.mkdir()
+        (Path(site_packages) / "extra.pth").write_text(f"{extra_path}\n", encoding="utf-8")
+
+        info = python_info(venv.python_path, cache_dir=cache_dir)
+        assert info["sys_path"] == [*venv.python_info["sys_path"], str(extra_path)]
+
+    def test_pyvenv_changed(self, tmp_path, venv, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        self.settle(venv, tmp_path)
+        assert python_info(venv.python_path, cache_dir=cache_dir) == venv.python_info
+
+        pyvenv_cfg = tmp_path / "venv" / "pyvenv.cfg"
+        pyvenv_cfg.write_text(pyvenv_cfg.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+        calls = []
+        run = subprocess.run
+
+        def run_and_record(*args, **kwargs):
+            calls.append(args)
+            return run(*args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "run", run_and_record)
+        assert python_info(venv.python_path, cache_dir=cache_dir) == venv.python_info
+        assert len(calls) == 1
+
+
+class TestInInterpreter:
+    def test_state(self, tmp_path, venv):
+        venv.install(["binary"])
+        missing_python = str(tmp_path / "missing" / "python")
+        deps = [
+            Dependency("binary"),
+            Dependency("binary>9000"),
+            Dependency("dep-sync-missing"),
+            Dependency("dep-sync-missing; python_version < '1'"),
+        ]
+
+        states = dependency_states({venv.python_path: deps, missing_python: deps}, exhaustive=True, in_interpreter=True)
+
+        state = states[venv.python_path]
+        assert isinstance(state, DependencyState)
+        assert state.satisfied == (deps[0], deps[3])
+        assert state.missing == (deps[1], deps[2])
+        assert state.not_required == ()
+
+        assert isinstance(states[missing_python], EnvironmentCheckError)
+
+    def test_matches_host_check(self, venv):
+        venv.install(["binary"])
+        deps = [Dependency("binary"), Dependency("packaging")]
+
+        host_state = dependency_states({venv.python_path: deps}, exhaustive=True)[venv.python_path]
+        state = dependency_states({venv.python_path: deps}, exhaustive=True, in_interpreter=True)[venv.python_path]
+        assert isinstance(host_state, DependencyState)
+        assert isinstance(state, DependencyState)
+        assert state.satisfied == host_state.satisfied
+        assert state.missing == host_state.missing
+        assert state.not_required == host_state.not_required
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="requires a POSIX shell")
+    def test_standard_library_only(self, tmp_path, site_packages):
+        project = tmp_path / "projects" / "local"
+        remote = (tmp_path / "missing-remote").as_uri()
+        site_packages.install(
+            "foo", "1.0", requires=["bar>=1; extra == 'all'", "baz; python_version < '1'"], extras=["all"]
+        )
+        site_packages.install("bar", "1.1")
+        site_packages.install("qux", "2.0rc1")
+        site_packages.install("local", "1.0", direct_url={"url": project.as_uri(), "dir_info": {"editable": True}})
+        site_packages.install("vcs", "1.0", direct_url={"url": remote, "vcs_info": {"vcs": "git", "commit_id": "abc"}})
+        site_packages.install("legacy", "0.1", directory_name="legacy.egg-info")
+        site_packages.install("unused", "1.0")
+        archive = tmp_path / "app.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("zipped-1.0.dist-info/METADATA", "Metadata-Version: 2.1\nName: zipped\nVersion: 1.0\n\n")
+
+        # Neither this package nor its dependencies may be imported by the interpreter
+        python = tmp_path / "python"
+        search_path = os.pathsep.join([str(site_packages.path), str(archive)])
+        python.write_text(f'#!/bin/sh\nPYTHONPATH={search_path} exec {sys.executable} -S "$@"\n', encoding="utf-8")
+        python.chmod(0o755)
+        assert subprocess.run([python, "-c", "import packaging"], check=False, capture_output=True).returncode
+
+        deps = [
+            Dependency("foo[all]==1.0"),
+            Dependency("foo>1"),
+            Dependency("bar~=1.0"),
+            Dependency("qux>=2.0rc1,!=2.0.*"),
+            Dependency("qux<2"),
+            Dependency(f"local @ {project.as_uri()}", editable=True),
+            Dependency(f"local @ {project.as_uri()}"),
+            Dependency(f"vcs @ git+{remote}@abc"),
+            Dependency(f"vcs @ git+{remote}"),
+            Dependency("legacy==0.1"),
+            Dependency("zipped>=1"),
+            Dependency("dep-sync-missing; python_version < '1'"),
+            Dependency("dep-sync-missing"),
+        ]
+        state = dependency_states({str(python): deps}, exhaustive=True, in_interpreter=True)[str(python)]
+        assert isinstance(state, DependencyState)
+        assert state.satisfied == (deps[0], deps[2], deps[5], deps[7], deps[9], deps[10], deps[11])
+        assert state.not_required == ("unused",)
+
+        distributions = InstalledDistributions(sys_path=[str(site_packages.path), str(archive)])
+        host_state = distributions.dependency_state(deps, exhaustive=True)
+        assert state.satisfied == host_state.satisfied
+        assert state.missing == host_state.missing
+        assert state.not_required == host_state.not_required
@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions
+
+
+def test_nested_extras(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar[baz]; extra == 'bar'"], extras=["bar"])
+    site_packages.install("bar", "1.0", requires=["baz; extra == 'baz'"], extras=["baz"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert not distributions.dependencies_satisfied([Dependency("foo[bar]")])
+
+    site_packages.install("baz", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]")])
+
+
+def test_extra_normalization(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'foo-bar'"], extras=["foo-bar"])
+    site_packages.install("bar", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[Foo_Bar]")])
+
+
+def test_extra_without_requirements(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar"], extras=["empty"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[empty]")])
+    assert not distributions.dependencies_satisfied([Dependency("foo[unknown]")])
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_self_referential_extras(site_packages, installed):
+    site_packages.install(
+        "foo",
+        "1.0",
+        requires=["foo[b]; extra == 'a'", "foo[a]; extra == 'b'", "bar; extra == 'b'"],
+        extras=["a", "b"],
+    )
+    if installed:
+        site_packages.install("bar", "1.0")
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[a]")]) is installed
+    assert distributions.dependencies_satisfied([Dependency("foo[b]")]) is installed
+
+
+def test_cycle_across_distributions(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar[y]; extra == 'x'", "missing; extra == 'x'"], extras=["x"])
+    site_packages.install("bar", "1.0", requires=["foo[x]; extra == 'y'"], extras=["y"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert not distributions.dependencies_satisfied([Dependency("foo[x]")])
+    assert not distributions.dependencies_satisfied([Dependency("bar[y]")])
+    assert distributions.dependencies_satisfied([Dependency("bar")])
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import dep_sync
+
+# The package may take at most this fraction of the time that it takes to import its heaviest dependency
+IMPORT_TIME_RATIO = 0.5
+
+
+def test_import_time_budget():
+    # The baseline is measured by the same process so that the comparison holds on slow or instrumented runners
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dep_sync; import packaging.requirements"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    cumulative_times = {}
+    for line in process.stderr.splitlines():
+        columns = line.split("|")
+        if len(columns) == 3 and columns[1].strip().isdigit():
+            cumulative_times[columns[2].strip()] = int(columns[1])
+
+    if "dep_sync" not in cumulative_times or "packaging.requirements" not in cumulative_times:  # no cov
+        pytest.fail(process.stderr)
+
+    assert cumulative_times["dep_sync"] < cumulative_times["packaging.requirements"] * IMPORT_TIME_RATIO, process.stderr
+
+
+def test_no_eager_imports():
+    script = "import sys; loaded = set(sys.modules); import dep_sync; print(sorted(set(sys.modules) - loaded))"
+    process = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+    imported = process.stdout
+
+    assert "packaging" not in imported
+    assert "importlib.metadata" not in imported
+    assert "dep_sync." not in imported
+
+
+def test_lazy_attributes():
+    for name in dep_sync.__all__:
+        assert getattr(dep_sync, name) is not None
+
+    assert set(dep_sync.__all__) <= set(dir(dep_sync))
+    assert dep_sync.scripts.PYTHON_INFO_SCRIPT
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="module 'dep_sync' has no attribute 'foo'"):
+        dep_sync.foo  # type: ignore[attr-defined]  # noqa: B018
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from dep_sync import Dependency, InstalledDistributions, UnsatisfiedReason
+
+
+def test_reasons(tmp_path, site_packages):
+    project_url = (tmp_path / "editable").as_uri()
+    site_packages.install("foo", "1.0", requires=["missing; extra == 'bar'"], extras=["bar"])
+    site_packages.install("editable", "1.0", direct_url={"url": project_url, "dir_info": {"editable": True}})
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    deps = [
+        Dependency("foo"),
+        Dependency("excluded; python_version < '3'"),
+        Dependency("missing"),
+        Dependency("foo>1"),
+        Dependency("foo[bar]"),
+        Dependency("foo[unknown]"),
+        Dependency(f"editable @ {project_url}"),
+        Dependency(f"foo @ {project_url}"),
+        Dependency(f"editable @ {project_url}", editable=True),
+    ]
+    assert list(distributions.iter_dependency_state(deps)) == [
+        (deps[0], True, None),
+        (deps[1], True, None),
+        (deps[2], False, UnsatisfiedReason.NOT_INSTALLED),
+        (deps[3], False, UnsatisfiedReason.VERSION_MISMATCH),
+        (deps[4], False, UnsatisfiedReason.EXTRA_MISSING),
+        (deps[5], False, UnsatisfiedReason.EXTRA_MISSING),
+        (deps[6], False, UnsatisfiedReason.URL_MISMATCH),
+        (deps[7], False, UnsatisfiedReason.URL_MISMATCH),
+        (deps[8], True, None),
+    ]
+
+
+def test_early_stop(site_packages):
+    site_packages.install("foo", "1.0")
+    site_packages.install("bar", "1.0")
+    reports = []
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, stats_hook=reports.append)
+
+    states = distributions.iter_dependency_state([Dependency("missing"), Dependency("foo")])
+    assert next(states) == (Dependency("missing"), False, UnsatisfiedReason.NOT_INSTALLED)
+    states.close()
+
+    assert len(reports) == 1
+    assert distributions.get("bar") is not None
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import pytest
+from packaging.markers import Marker
+
+from dep_sync import Dependency, DependencySet, InstalledDistributions
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    calls = []
+    evaluate = Marker.evaluate
+
+    def evaluate_and_record(self, environment=None):
+        calls.append(str(self))
+        return evaluate(self, environment)
+
+    monkeypatch.setattr(Marker, "evaluate", evaluate_and_record)
+    return calls
+
+
+def test_extra_only_markers_are_not_evaluated(site_packages, evaluations):
+    site_packages.install(
+        "foo",
+        "1.0",
+        requires=["bar; extra == 'Bar_Baz'", "baz; extra == 'bar-baz' or extra == 'baz'", "missing; extra == 'other'"],
+        extras=["bar-baz", "baz", "other"],
+    )
+    site_packages.install("bar", "1.0")
+    site_packages.install("baz", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[bar-baz,baz]"), Dependency("bar; extra == 'bar'")])
+    assert not distributions.dependencies_satisfied([Dependency("foo[other]")])
+    assert not evaluations
+
+
+def test_memoized_per_environment(site_packages, evaluations):
+    site_packages.install("foo", "1.0")
+    marker = "python_version > '1.0' and os_name != 'test_memoized_per_environment'"
+    deps = [Dependency(f"foo; {marker}"), Dependency(f"bar; {marker.replace('>', '<')}")]
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert distributions.dependencies_satisfied(deps * 10)
+    assert len(evaluations) == 2
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert distributions.dependencies_satisfied(deps)
+    assert len(evaluations) == 2
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, environment={"python_version": "0.1"})
+    assert not distributions.dependencies_satisfied(deps)
+    assert len(evaluations) == 4
+
+
+def test_memoized_per_extra(site_packages, evaluations):
+    marker = "os_name != 'test_memoized_per_extra'"
+    site_packages.install(
+        "foo",
+        "1.0",
+        requires=[f"bar; extra == 'bar' and {marker}", f"baz; extra == 'baz' and {marker}"],
+        extras=["bar", "baz"],
+    )
+    site_packages.install("bar", "1.0")
+    site_packages.install("baz", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]"), Dependency("foo[baz]")])
+    assert len(evaluations) == 4
+
+
+def test_least_recently_used_evicted(site_packages, evaluations, monkeypatch):
+    monkeypatch.setattr("dep_sync._markers.MAX_COMPILED_MARKERS", 2)
+    site_packages.install("foo", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    deps = {name: Dependency(f"foo; os_name != 'test_least_recently_used_evicted_{name}'") for name in "abc"}
+
+    for names in ("ab", "a", "c", "a"):
+        assert distributions.dependencies_satisfied([deps[name] for name in names])
+
+    assert [evaluation.rpartition("_")[2][:-1] for evaluation in evaluations] == ["a", "b", "c"]
+
+
+def test_results_bounded(site_packages, evaluations, monkeypatch):
+    monkeypatch.setattr("dep_sync._markers.MAX_MARKER_RESULTS", 2)
+    site_packages.install("foo", "1.0")
+    deps = [Dependency("foo; python_version != 'test_results_bounded'")]
+
+    for python_version in ("1", "2", "3", "1"):
+        distributions = InstalledDistributions(
+            sys_path=site_packages.sys_path, environment={"python_version": python_version}
+        )
+        assert distributions.dependencies_satisfied(deps)
+
+    assert len(evaluations) == 4
+
+
+def test_concurrent_compilation(site_packages, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr("dep_sync._markers.MAX_COMPILED_MARKERS", 8)
+    site_packages.install("foo", "1.0")
+
+    def check(thread: int) -> bool:
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+        deps = [Dependency(f"foo; os_name != 'test_concurrent_compilation_{thread}_{i}'") for i in range(200)]
+        return distributions.dependencies_satisfied(deps)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(check, range(8)))
+
+
+def test_compiled_once(site_packages, monkeypatch):
+    requires = ["bar; extra == 'bar' and os_name != 'test_compiled_once'", "baz; os_name != 'test_compiled_once'"]
+    site_packages.install("foo", "1.0", requires=requires, extras=["bar"])
+    site_packages.install("bar", "1.0")
+    site_packages.install("baz", "1.0")
+    deps = DependencySet([Dependency("foo[bar]; os_name != 'test_compiled_once'")])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert distributions.dependencies_satisfied(deps)
+
+    conversions = []
+    to_string = Marker.__str__
+
+    def to_string_and_record(self):
+        conversions.append(self)
+        return to_string(self)
+
+    monkeypatch.setattr(Marker, "__str__", to_string_and_record)
+    for _ in range(3):
+        assert distributions.dependencies_satisfied(deps)
+        assert distributions.requires("foo") == ["baz"]
+
+    assert not conversions
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import sys
+from importlib.metadata import distributions as importlib_distributions
+
+import pytest
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+from dep_sync import Dependency, InstalledDistributions
+
+DESCRIPTION = "\n".join(f"Requires-Dist: not-a-requirement-{i}" for i in range(1000))
+
+
+def assert_matches_importlib(distributions, project_name):
+    distribution = distributions.get(project_name)
+    assert distribution is not None
+
+    expected = []
+    for requirement_string in distribution.requires or []:
+        requirement = Requirement(requirement_string)
+        if requirement.marker is None or requirement.marker.evaluate({"extra": ""}):
+            expected.append(canonicalize_name(requirement.name))
+
+    assert distributions.requires(project_name) == list(dict.fromkeys(expected))
+    assert distributions.dependencies_satisfied([Dependency(f"{project_name}=={distribution.version}")])
+
+
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        pytest.param(
+            f"Metadata-Version: 2.1\nName: foo\nVersion: 1.0\nRequires-Dist: bar\n\n{DESCRIPTION}\n",
+            id="description in body",
+        ),
+        pytest.param(
+            "Metadata-Version: 1.2\nName: foo\nVersion: 1.0\nDescription: first line\n        |second line\n"
+            "        |Requires-Dist: baz\nRequires-Dist: bar\n",
+            id="folded description",
+        ),
+        pytest.param(
+            "Metadata-Version: 2.1\r\nName: foo\r\nVersion: 1.0\r\nRequires-Dist: bar\r\n"
+            "Requires-Dist: baz; python_version < '3'\r\n\r\nRequires-Dist: qux\r\n",
+            id="crlf",
+        ),
+        pytest.param(
+            "Metadata-Version: 2.1\nName:foo\nVersion:\t1.0\nRequires-Dist:   bar\nnot a header\nRequires-Dist: baz\n",
+            id="malformed",
+        ),
+        pytest.param("Metadata-Version: 2.1\nname: foo\nVERSION: 1.0\nrequires-dist: bar\n", id="case"),
+    ],
+)
+def test_matches_importlib(site_packages, metadata):
+    metadata_directory = site_packages.path / "foo.dist-info"
+    metadata_directory.mkdir()
+    (metadata_directory / "METADATA").write_bytes(metadata.encode("utf-8"))
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert_matches_importlib(distributions, "foo")
+    assert distributions.requires("foo") == ["bar"]
+
+
+def test_empty_metadata_falls_back_to_pkg_info(site_packages):
+    metadata_directory = site_packages.path / "foo.egg-info"
+    metadata_directory.mkdir()
+    (metadata_directory / "METADATA").write_text("", encoding="utf-8")
+    (metadata_directory / "PKG-INFO").write_text("Name: foo\nVersion: 1.0\nRequires-Dist: bar\n", encoding="utf-8")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert_matches_importlib(distributions, "foo")
+    assert distributions.requires("foo") == ["bar"]
+
+
+def test_legacy_egg_info_file(site_packages):
+    (site_packages.path / "foo.egg-info").write_text(
+        "Metadata-Version: 1.0\nName: foo\nVersion: 1.0\n\n", encoding="utf-8"
+    )
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert_matches_importlib(distributions, "foo")
+    assert distributions.requires("foo") == []
+
+
+def test_current_environment():
+    distributions = InstalledDistributions(sys_path=sys.path)
+    names = {
+        canonicalize_name(distribution.metadata["Name"])
+        for distribution in importlib_distributions(path=sys.path)
+        if distribution.metadata["Name"]
+    }
+    assert names
+
+    for name in names:
+        assert_matches_importlib(distributions, name)
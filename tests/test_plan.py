@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from dep_sync import Dependency, InstalledDistributions, SyncPlan
+
+
+def test_plan(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar", "baz; extra == 'baz'", "old; python_version < '3'"])
+    site_packages.install("bar", "1.0", requires=["qux[extra]"])
+    site_packages.install("qux", "1.0", requires=["quux; extra == 'extra'"], extras=["extra"])
+    site_packages.install("quux", "1.0")
+    site_packages.install("baz", "1.0")
+    site_packages.install("old", "1.0")
+    site_packages.install("outdated", "1.0")
+    site_packages.install("orphan", "1.0", requires=["orphan-dependency"])
+    site_packages.install("orphan-dependency", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    deps = [
+        Dependency("foo"),
+        Dependency("outdated>1"),
+        Dependency("missing"),
+        Dependency("excluded; python_version < '3'"),
+    ]
+    plan = distributions.plan(deps)
+
+    assert isinstance(plan, SyncPlan)
+    assert plan.satisfied == (deps[0], deps[3])
+    assert plan.to_install == (deps[2],)
+    assert plan.to_upgrade == (deps[1],)
+    assert sorted(plan.orphans) == ["baz", "old", "orphan", "orphan-dependency"]
+
+
+def test_requested_extras(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'Bar'"], extras=["Bar"])
+    site_packages.install("bar", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.plan([Dependency("foo")]).orphans == ("bar",)
+    assert distributions.plan([Dependency("foo[bar]")]).orphans == ()
+
+
+def test_cycles(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar"])
+    site_packages.install("bar", "1.0", requires=["foo"])
+    site_packages.install("baz", "1.0", requires=["baz"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.plan([Dependency("foo")]).orphans == ("baz",)
+
+
+def test_graph(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar>1", "Baz", "bar; extra == 'x'", "missing"])
+    site_packages.install("bar", "2.0")
+    site_packages.install("baz", "1.0", requires=["bar"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.requires("Foo") == ["bar", "baz", "missing"]
+    assert distributions.requires("unknown") == []
+    assert sorted(distributions.required_by("bar")) == ["baz", "foo"]
+    assert distributions.required_by("missing") == []
+
+    site_packages.install("qux", "1.0", requires=["bar"])
+    assert distributions.refresh()
+    assert sorted(distributions.required_by("bar")) == ["baz", "foo", "qux"]
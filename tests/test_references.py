@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+
+from dep_sync import Dependency, InstalledDistributions
+from tests.conftest import SitePackages
+
+
+def test_installed_from(tmp_path, site_packages, monkeypatch):
+    project_path = tmp_path / "projects" / "editable"
+    project_path.mkdir(parents=True)
+    vcs_url = "https://github.com/org/repo"
+    site_packages.install("editable", "1.0", direct_url={"url": project_path.as_uri(), "dir_info": {"editable": True}})
+    site_packages.install(
+        "archive", "1.0", direct_url={"url": "https://example.com/archive.tar.gz", "archive_info": {}}
+    )
+    site_packages.install(
+        "vcs",
+        "1.0",
+        direct_url={"url": vcs_url, "vcs_info": {"vcs": "git", "commit_id": "abc", "requested_revision": "v1"}},
+    )
+    site_packages.install("foo", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.installed_from(project_path.as_uri()) == "editable"
+    assert distributions.installed_from(str(project_path)) == "editable"
+    assert distributions.installed_from(f"{project_path}{os.sep}") == "editable"
+    monkeypatch.chdir(project_path.parent)
+    assert distributions.installed_from("editable") == "editable"
+
+    assert distributions.installed_from("https://example.com/archive.tar.gz") == "archive"
+    assert distributions.installed_from(vcs_url) == "vcs"
+    assert distributions.installed_from(f"git+{vcs_url}") == "vcs"
+    assert distributions.installed_from(f"git+{vcs_url}@v1") == "vcs"
+    assert distributions.installed_from(f"git+{vcs_url}@v1#egg=vcs") == "vcs"
+
+    assert distributions.installed_from(str(tmp_path)) is None
+    assert distributions.installed_from("https://example.com/other.tar.gz") is None
+    assert distributions.installed_from("git+https://github.com/org/other@v1") is None
+
+
+def test_installed_from_first_distribution(tmp_path, site_packages):
+    project_url = (tmp_path / "project").as_uri()
+    site_packages.install("foo", "1.0", direct_url={"url": project_url, "dir_info": {}})
+    other_site_packages = SitePackages(tmp_path / "other-site-packages")
+    other_site_packages.install("bar", "1.0", direct_url={"url": project_url, "dir_info": {}})
+    distributions = InstalledDistributions(sys_path=[*other_site_packages.sys_path, *site_packages.sys_path])
+
+    assert distributions.installed_from(project_url) == "bar"
+
+
+def test_installed_from_refresh(tmp_path, site_packages):
+    project_url = (tmp_path / "project").as_uri()
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, auto_refresh=True)
+    assert distributions.installed_from(project_url) is None
+
+    site_packages.install("foo", "1.0", direct_url={"url": project_url, "dir_info": {"editable": True}})
+    assert distributions.installed_from(project_url) == "foo"
+
+
+def test_direct_url_read_once(tmp_path, site_packages):
+    project_url = (tmp_path / "project").as_uri()
+    site_packages.install("foo", "1.0", direct_url={"url": project_url, "dir_info": {"editable": True}})
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, collect_stats=True)
+
+    deps = [Dependency(f"foo @ {project_url}", editable=True)]
+    assert distributions.dependencies_satisfied(deps)
+    assert distributions.dependencies_satisfied(deps)
+    assert distributions.installed_from(project_url) == "foo"
+    assert not distributions.dependencies_satisfied([Dependency(f"foo @ {project_url}")])
+    assert distributions.stats is not None
+    assert distributions.stats.counts["direct_url_reads"] == 1
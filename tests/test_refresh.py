@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import shutil
+import time
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions
+from tests.conftest import SitePackages
+
+
+def settle(*paths):
+    timestamp = time.time() - 10
+    for path in paths:
+        os.utime(path, (timestamp, timestamp))
+
+
+@pytest.fixture(params=[False, True], ids=["uncached", "cached"])
+def cache_dir(request, tmp_path):
+    return str(tmp_path / "cache") if request.param else None
+
+
+def test_nothing_discovered(site_packages):
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert not distributions.refresh()
+
+
+def test_unchanged(site_packages, cache_dir):
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+
+    assert distributions.dependencies_satisfied([Dependency("foo")])
+    assert not distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo")])
+
+
+def test_changes(site_packages, cache_dir):
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+    assert not distributions.dependencies_satisfied([Dependency("foo>1"), Dependency("bar")])
+
+    shutil.rmtree(site_packages.path / "foo-1.0.dist-info")
+    site_packages.install("foo", "2.0")
+    site_packages.install("bar", "1.0")
+    assert not distributions.dependencies_satisfied([Dependency("foo>1"), Dependency("bar")])
+
+    assert distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo>1"), Dependency("bar")])
+
+    shutil.rmtree(site_packages.path / "bar-1.0.dist-info")
+    assert distributions.refresh()
+    state = distributions.dependency_state([Dependency("foo"), Dependency("bar")], exhaustive=True)
+    assert state.missing == (Dependency("bar"),)
+    assert state.not_required == ()
+
+
+def test_extras_are_reevaluated(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'bar'"], extras=["bar"])
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert not distributions.dependencies_satisfied([Dependency("foo[bar]")])
+
+    site_packages.install("bar", "1.0")
+    assert distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]")])
+
+
+def test_precedence(tmp_path):
+    first = SitePackages(tmp_path / "first")
+    second = SitePackages(tmp_path / "second")
+    second.install("foo", "1.0")
+    settle(first.path, second.path)
+    distributions = InstalledDistributions(sys_path=[*first.sys_path, *second.sys_path])
+    assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
+
+    first.install("foo", "2.0")
+    assert distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo==2.0")])
+
+
+def test_only_changed_entries_are_scanned(tmp_path, monkeypatch):
+    first = SitePackages(tmp_path / "first")
+    second = SitePackages(tmp_path / "second")
+    first.install("foo", "1.0")
+    second.install("bar", "1.0")
+    settle(first.path, second.path)
+    distributions = InstalledDistributions(sys_path=[*first.sys_path, *second.sys_path])
+    assert distributions.dependencies_satisfied([Dependency("foo"), Dependency("bar")])
+
+    scanned = []
+    scandir = os.scandir
+
+    def record_scandir(path):
+        scanned.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", record_scandir)
+    second.install("baz", "1.0")
+    assert distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo"), Dependency("bar"), Dependency("baz")])
+    assert scanned == second.sys_path
+
+
+def test_unchanged_distributions_retain_metadata(site_packages):
+    metadata_directory = site_packages.install("foo", "1.0", requires=["bar; extra == 'bar'"], extras=["bar"])
+    site_packages.install("bar", "1.0")
+    settle(metadata_directory)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]")])
+
+    # The metadata would have to be read again for the distribution to be considered
+    (metadata_directory / "METADATA").unlink()
+    settle(metadata_directory)
+    site_packages.install("baz", "1.0")
+
+    assert distributions.refresh()
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]"), Dependency("baz")])
+
+
+def test_auto_refresh(site_packages):
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, auto_refresh=True)
+    assert distributions.get("foo") is None
+
+    site_packages.install("foo", "1.0")
+    assert distributions.get("foo") is not None
+    assert distributions.dependencies_satisfied([Dependency("foo")])
+    assert distributions.dependency_state([Dependency("foo")]).satisfied == (Dependency("foo"),)
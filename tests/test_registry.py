@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions
+from tests.conftest import SitePackages
+
+
+def settle(path):
+    timestamp = time.time() - 10
+    os.utime(path, (timestamp, timestamp))
+
+
+@pytest.fixture
+def scanned_directories(monkeypatch):
+    directories = []
+    scandir = os.scandir
+
+    def scandir_and_record(path):
+        directories.append(os.fspath(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir_and_record)
+    return directories
+
+
+def test_shared_across_instances(site_packages, scanned_directories):
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+
+    for _ in range(3):
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+        assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
+
+    assert scanned_directories == site_packages.sys_path
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, share_entries=False)
+    assert distributions.dependencies_satisfied([Dependency("foo==1.0")])
+    assert scanned_directories == site_packages.sys_path * 2
+
+
+def test_precedence(tmp_path, site_packages):
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+    venv_site_packages = SitePackages(tmp_path / "venv-site-packages")
+    venv_site_packages.install("foo", "2.0")
+    settle(venv_site_packages.path)
+
+    shared = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert shared.dependencies_satisfied([Dependency("foo==1.0")])
+
+    venv = InstalledDistributions(sys_path=[*venv_site_packages.sys_path, *site_packages.sys_path])
+    state = venv.dependency_state([Dependency("foo==2.0")], exhaustive=True)
+    assert state.missing == ()
+    assert state.not_required == ()
+
+    other_venv = InstalledDistributions(sys_path=[*site_packages.sys_path, *venv_site_packages.sys_path])
+    assert other_venv.dependencies_satisfied([Dependency("foo==1.0")])
+
+
+def test_changed_entry_is_scanned(site_packages, scanned_directories):
+    site_packages.install("foo", "1.0")
+    settle(site_packages.path)
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied([Dependency("foo")])
+
+    site_packages.install("bar", "1.0")
+    deps = [Dependency("foo"), Dependency("bar")]
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+    assert scanned_directories == site_packages.sys_path * 2
+
+
+def test_eviction(tmp_path, scanned_directories, monkeypatch):
+    monkeypatch.setattr("dep_sync._registry.REGISTRY_MAX_DISTRIBUTIONS", 2)
+    entries = {}
+    for name in ("foo", "bar", "baz"):
+        site_packages = SitePackages(tmp_path / name)
+        site_packages.install(name, "1.0")
+        settle(site_packages.path)
+        entries[name] = str(site_packages.path)
+
+    for names in (["foo", "bar"], ["bar"], ["baz"], ["bar", "foo"]):
+        distributions = InstalledDistributions(sys_path=[entries[name] for name in names])
+        assert distributions.dependencies_satisfied([Dependency(name) for name in names])
+
+    # The least recently used entry was evicted
+    assert scanned_directories == [entries["foo"], entries["bar"], entries["baz"], entries["foo"]]
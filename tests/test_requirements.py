@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions, merge_dependencies, read_dependencies
+
+
+def requirement_strings(dependencies):
+    return [(str(dependency), dependency.editable) for dependency in dependencies]
+
+
+class TestMerge:
+    def test_specifiers_and_extras(self):
+        dependencies = merge_dependencies([
+            Dependency("Foo[a]>=1"),
+            Dependency("bar"),
+            Dependency("foo[b]<2"),
+            Dependency("foo!=1.5"),
+        ])
+
+        assert len(dependencies) == 2
+        assert dependencies[0].name == "Foo"
+        assert dependencies[0].extras == {"a", "b"}
+        assert dependencies[0].specifier == Dependency("foo>=1,<2,!=1.5").specifier
+        assert str(dependencies[1]) == "bar"
+
+    def test_markers_kept_separate(self):
+        dependencies = merge_dependencies([
+            Dependency("foo>=1; sys_platform == 'win32'"),
+            Dependency("foo<2; sys_platform == 'win32'"),
+            Dependency("foo>=1.5"),
+        ])
+
+        assert requirement_strings(dependencies) == [
+            ('foo<2,>=1; sys_platform == "win32"', False),
+            ("foo>=1.5", False),
+        ]
+
+    def test_direct_references(self):
+        dependencies = merge_dependencies([
+            Dependency("foo @ file:///projects/foo ; python_version >= '3'", editable=True),
+            Dependency("foo[a] @ file:///projects/foo ; python_version >= '3'"),
+            Dependency("foo @ https://example.com/foo-1.0.tar.gz"),
+            Dependency("foo>=1"),
+        ])
+
+        assert requirement_strings(dependencies) == [
+            ('foo[a] @ file:///projects/foo ; python_version >= "3"', True),
+            ("foo @ https://example.com/foo-1.0.tar.gz", False),
+            ("foo>=1", False),
+        ]
+
+    def test_nothing_to_merge(self):
+        dependencies = [Dependency("foo"), Dependency("bar")]
+
+        assert all(a is b for a, b in zip(merge_dependencies(dependencies), dependencies))
+
+
+class TestRequirementsFile:
+    def test_syntax(self, tmp_path):
+        project = tmp_path / "projects" / "foo"
+        project.mkdir(parents=True)
+        (project / "pyproject.toml").write_text('[project]\nname = "foo"\n', encoding="utf-8")
+        (tmp_path / "base.txt").write_text("bar>=1\n-r requirements.txt\n", encoding="utf-8")
+        (tmp_path / "requirements.txt").write_text(
+            "# comment\n"
+            "--index-url https://example.com/simple\n"
+            "-r base.txt\n"
+            "-c constraints.txt\n"
+            "\n"
+            "bar<2 \\\n"
+            "    --hash=sha256:abc  # comment\n"
+            "baz[a]; python_version >= '3'\n"
+            "-e projects/foo[dev]\n"
+            "git+https://github.com/org/repo@v1#egg=qux\n"
+            "https://example.com/quux-1.0-py3-none-any.whl\n",
+            encoding="utf-8",
+        )
+
+        dependencies = read_dependencies([str(tmp_path / "requirements.txt")])
+        assert requirement_strings(dependencies) == [
+            ("bar<2,>=1", False),
+            ('baz[a]; python_version >= "3"', False),
+            (f"foo[dev] @ {project.as_uri()}", True),
+            ("qux @ git+https://github.com/org/repo@v1", False),
+            ("quux @ https://example.com/quux-1.0-py3-none-any.whl", False),
+        ]
+
+    def test_archive_file_name(self, tmp_path):
+        requirements_file = tmp_path / "requirements.txt"
+        requirements_file.write_text(
+            "foo-1.0-py3-none-any.whl\nbar-2.0-py3-none-any.whl[extra]; python_version >= '3'\n", encoding="utf-8"
+        )
+
+        dependencies = read_dependencies([str(requirements_file)])
+        assert requirement_strings(dependencies) == [
+            (f"foo @ {(tmp_path / 'foo-1.0-py3-none-any.whl').as_uri()}", False),
+            (f'bar[extra] @ {(tmp_path / "bar-2.0-py3-none-any.whl").as_uri()} ; python_version >= "3"', False),
+        ]
+
+    def test_attached_short_options(self, tmp_path):
+        project = tmp_path / "projects" / "foo"
+        project.mkdir(parents=True)
+        (project / "pyproject.toml").write_text('[project]\nname = "foo"\n', encoding="utf-8")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "more.txt").write_text("bar==1\n", encoding="utf-8")
+        requirements_file = tmp_path / "requirements.txt"
+        requirements_file.write_text(
+            "-rsub/more.txt\n-eprojects/foo\n-cconstraints.txt\n-ihttps://example.com/simple\n", encoding="utf-8"
+        )
+
+        dependencies = read_dependencies([str(requirements_file)])
+        assert requirement_strings(dependencies) == [("bar==1", False), (f"foo @ {project.as_uri()}", True)]
+
+    @pytest.mark.parametrize("line", ["--unknown", "-x foo", "--requirements=more.txt", "-r"])
+    def test_unsupported_option(self, tmp_path, line):
+        requirements_file = tmp_path / "requirements.txt"
+        requirements_file.write_text(f"foo\n{line}\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match=r"requirements\.txt:2: "):
+            read_dependencies([str(requirements_file)])
+
+    def test_invalid_requirement(self, tmp_path):
+        requirements_file = tmp_path / "requirements.txt"
+        requirements_file.write_text("foo\nbar>=>1\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match=r"requirements\.txt:2: "):
+            read_dependencies([str(requirements_file)])
+
+    def test_unknown_project_name(self, tmp_path):
+        (tmp_path / "project").mkdir()
+        requirements_file = tmp_path / "requirements.txt"
+        requirements_file.write_text("-e ./project\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="unable to determine the project name of: ./project"):
+            read_dependencies([str(requirements_file)])
+
+
+def test_pylock(tmp_path):
+    (tmp_path / "pylock.toml").write_text(
+        """\
+lock-version = "1.0"
+created-by = "test"
+
+[[packages]]
+name = "foo"
+version = "1.0"
+
+[[packages]]
+name = "bar"
+version = "2.0"
+marker = "sys_platform == 'win32'"
+
+[[packages]]
+name = "baz"
+vcs = { type = "git", url = "https://github.com/org/baz", commit-id = "abc" }
+
+[[packages]]
+name = "qux"
+directory = { path = "projects/qux", editable = true }
+
+[[packages]]
+name = "quux"
+archive = { url = "https://example.com/quux-1.0.tar.gz" }
+""",
+        encoding="utf-8",
+    )
+    (tmp_path / "requirements.txt").write_text("foo>=1\nfoo\n", encoding="utf-8")
+
+    dependencies = read_dependencies([str(tmp_path / "pylock.toml"), str(tmp_path / "requirements.txt")])
+    assert requirement_strings(dependencies) == [
+        ("foo==1.0,>=1", False),
+        ('bar==2.0; sys_platform == "win32"', False),
+        ("baz @ git+https://github.com/org/baz@abc", False),
+        (f"qux @ {(tmp_path / 'projects' / 'qux').as_uri()}", True),
+        ("quux @ https://example.com/quux-1.0.tar.gz", False),
+    ]
+
+
+def test_checked_once(tmp_path, site_packages):
+    site_packages.install("foo", "1.0")
+    requirements_files = []
+    for i in range(3):
+        requirements_file = tmp_path / f"requirements{i}.txt"
+        requirements_file.write_text(f"foo>={i}\n", encoding="utf-8")
+        requirements_files.append(str(requirements_file))
+
+    dependencies = read_dependencies(requirements_files)
+    state = InstalledDistributions(sys_path=site_packages.sys_path).dependency_state(dependencies)
+
+    assert len(dependencies) == 1
+    assert state.missing == (dependencies[0],)
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import time
+
+from dep_sync import Dependency, InstalledDistributions, Stats
+
+
+def test_disabled(site_packages):
+    site_packages.install("foo", "1.0")
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+
+    assert distributions.stats is None
+    assert distributions.dependency_state([Dependency("foo")]).stats is None
+
+
+def test_phases(tmp_path, site_packages):
+    project_url = (tmp_path / "bar").as_uri()
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'bar'", "baz; python_version < '3'"], extras=["bar"])
+    site_packages.install("bar", "1.0", direct_url={"url": project_url, "dir_info": {"editable": True}})
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, collect_stats=True)
+
+    state = distributions.dependency_state([
+        Dependency("foo[bar]"),
+        Dependency(f"bar @ {project_url}", editable=True),
+        Dependency("missing; python_version < '3'"),
+    ])
+    assert isinstance(state.stats, Stats)
+    assert state.stats.counts == {
+        "entries_scanned": 1,
+        "distributions_scanned": 2,
+        "metadata_reads": 1,
+        "direct_url_reads": 1,
+        "marker_evaluations": 3,
+        "extras_evaluated": 1,
+    }
+    assert set(state.stats.timings) == {"discovery", "metadata", "direct_url", "markers", "extras"}
+    assert all(seconds > 0 for seconds in state.stats.timings.values())
+
+
+def test_per_check(site_packages):
+    site_packages.install("foo", "1.0", requires=["bar; extra == 'bar'"], extras=["bar"])
+    site_packages.install("bar", "1.0")
+    reports = []
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, stats_hook=reports.append)
+
+    assert distributions.dependencies_satisfied([Dependency("foo[bar]")])
+    state = distributions.dependency_state([Dependency("foo[bar]")])
+
+    assert len(reports) == 2
+    assert reports[0].counts["metadata_reads"] == 1
+    assert state.stats is reports[1]
+    assert state.stats.counts == {}
+
+    assert distributions.stats is not None
+    assert distributions.stats.counts["metadata_reads"] == 1
+    assert distributions.stats.counts["entries_scanned"] == 1
+
+
+def test_cache(tmp_path, site_packages):
+    cache_dir = str(tmp_path / "cache")
+    site_packages.install("foo", "1.0")
+    timestamp = time.time() - 10
+    os.utime(site_packages.path, (timestamp, timestamp))
+
+    for expected in ("index_misses", "index_hits"):
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, collect_stats=True)
+        stats = distributions.dependency_state([Dependency("foo")]).stats
+        assert stats is not None
+        assert stats.counts[expected] == 1
+        assert stats.as_dict()["counts"] == stats.counts
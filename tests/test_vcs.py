@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import subprocess
+
+import pytest
+
+from dep_sync import Dependency, InstalledDistributions, UnsatisfiedReason
+
+
+class GitRemote:
+    def __init__(self, path) -> None:
+        self.path = path
+        self.work_tree = path.parent / f"{path.name}-work"
+        self.url = path.as_uri()
+        self.git("init", "--bare", str(path))
+        self.git("init", str(self.work_tree))
+        self.git("-C", str(self.work_tree), "checkout", "-b", "main")
+        self.git("-C", str(self.work_tree), "remote", "add", "origin", self.url)
+
+    @staticmethod
+    def git(*args: str) -> str:
+        process = subprocess.run(
+            ["git", "-c", "user.name=dep-sync", "-c", "user.email=dep-sync@localhost", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return process.stdout.strip()
+
+    def commit(self, branch: str = "main") -> str:
+        work_tree = str(self.work_tree)
+        self.git("-C", work_tree, "commit", "--allow-empty", "-m", "commit")
+        self.git("-C", work_tree, "push", "-q", "origin", f"HEAD:refs/heads/{branch}")
+        self.git("--git-dir", str(self.path), "symbolic-ref", "HEAD", "refs/heads/main")
+        return self.git("-C", work_tree, "rev-parse", "HEAD")
+
+    def tag(self, name: str) -> None:
+        work_tree = str(self.work_tree)
+        self.git("-C", work_tree, "tag", "-a", name, "-m", name)
+        self.git("-C", work_tree, "push", "-q", "origin", name)
+
+    def install(self, site_packages, name: str, commit_id: str, requested_revision: str | None = None) -> None:
+        vcs_info = {"vcs": "git", "commit_id": commit_id}
+        if requested_revision is not None:
+            vcs_info["requested_revision"] = requested_revision
+
+        site_packages.install(name, "1.0", direct_url={"url": self.url, "vcs_info": vcs_info})
+
+
+@pytest.fixture
+def git_remote(tmp_path) -> GitRemote:
+    return GitRemote(tmp_path / "remote.git")
+
+
+def test_no_revision(site_packages, git_remote):
+    commit_id = git_remote.commit()
+    git_remote.install(site_packages, "foo", commit_id)
+
+    deps = [Dependency(f"foo @ git+{git_remote.url}")]
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+    git_remote.commit()
+    assert not InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+
+def test_branch(site_packages, git_remote):
+    git_remote.commit()
+    commit_id = git_remote.commit("feature")
+    git_remote.install(site_packages, "foo", commit_id, "feature")
+
+    deps = [Dependency(f"foo @ git+{git_remote.url}@feature")]
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+    git_remote.commit("feature")
+    assert not InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+
+def test_annotated_tag(site_packages, git_remote):
+    commit_id = git_remote.commit()
+    git_remote.tag("v1")
+    git_remote.commit()
+    git_remote.install(site_packages, "foo", commit_id, "v1")
+
+    deps = [Dependency(f"foo @ git+{git_remote.url}@v1")]
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+
+def test_pinned_commit_does_not_list_remote(site_packages, git_remote, monkeypatch):
+    commit_id = git_remote.commit()
+    git_remote.install(site_packages, "foo", commit_id, "main")
+    monkeypatch.setattr(subprocess, "run", None)
+
+    deps = [
+        Dependency(f"foo @ git+{git_remote.url}@{commit_id}"),
+        Dependency(f"foo @ git+{git_remote.url}@main#{commit_id}"),
+    ]
+    assert InstalledDistributions(sys_path=site_packages.sys_path).dependencies_satisfied(deps)
+
+
+def test_remotes_listed_once(tmp_path, site_packages, monkeypatch):
+    remotes = [GitRemote(tmp_path / f"remote{i}.git") for i in range(3)]
+    deps = []
+    for i, remote in enumerate(remotes):
+        main_commit_id = remote.commit()
+        feature_commit_id = remote.commit("feature")
+        remote.install(site_packages, f"main{i}", main_commit_id, "main")
+        remote.install(site_packages, f"feature{i}", feature_commit_id, "feature")
+        deps.extend((
+            Dependency(f"main{i} @ git+{remote.url}@main"),
+            Dependency(f"feature{i} @ git+{remote.url}@feature"),
+        ))
+
+    commands = []
+    run = subprocess.run
+
+    def run_and_record(command, *args, **kwargs):
+        commands.append(command)
+        return run(command, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", run_and_record)
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, vcs_timeout=30, vcs_workers=2)
+
+    state = distributions.dependency_state(deps)
+    assert state.satisfied == tuple(deps)
+    assert sorted(commands) == sorted(["git", "ls-remote", remote.url] for remote in remotes)
+
+    assert distributions.dependencies_satisfied(deps)
+    assert len(commands) == len(remotes)
+
+
+def test_unreachable_remote(tmp_path, site_packages):
+    url = (tmp_path / "missing.git").as_uri()
+    site_packages.install("foo", "1.0", direct_url={"url": url, "vcs_info": {"vcs": "git", "commit_id": "abc"}})
+
+    deps = [Dependency(f"foo @ git+{url}")]
+    assert not InstalledDistributions(sys_path=site_packages.sys_path, vcs_timeout=30).dependencies_satisfied(deps)
+
+
+class TestCache:
+    def test_reused_across_instances(self, tmp_path, site_packages, git_remote, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        commit_id = git_remote.commit()
+        git_remote.install(site_packages, "foo", commit_id)
+
+        deps = [Dependency(f"foo @ git+{git_remote.url}")]
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+        assert distributions.dependencies_satisfied(deps)
+
+        git_remote.commit()
+        monkeypatch.setattr(subprocess, "run", None)
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir)
+        assert distributions.dependencies_satisfied(deps)
+
+    def test_expired(self, tmp_path, site_packages, git_remote):
+        cache_dir = str(tmp_path / "cache")
+        commit_id = git_remote.commit()
+        git_remote.install(site_packages, "foo", commit_id)
+
+        deps = [Dependency(f"foo @ git+{git_remote.url}")]
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, vcs_cache_ttl=0)
+        assert distributions.dependencies_satisfied(deps)
+
+        git_remote.commit()
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, vcs_cache_ttl=0)
+        assert not distributions.dependencies_satisfied(deps)
+
+    def test_eviction(self, tmp_path, site_packages, monkeypatch):
+        monkeypatch.setattr("dep_sync._vcs.VCS_CACHE_MAX_ENTRIES", 2)
+        cache_dir = tmp_path / "cache"
+        for i in range(3):
+            remote = GitRemote(tmp_path / f"remote{i}.git")
+            remote.install(site_packages, f"foo{i}", remote.commit())
+            deps = [Dependency(f"foo{i} @ git+{remote.url}")]
+            distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=str(cache_dir))
+            assert distributions.dependencies_satisfied(deps)
+
+        cache = json.loads((cache_dir / "vcs.json").read_text(encoding="utf-8"))
+        assert sorted(cache) == [f"{(tmp_path / f'remote{i}.git').as_uri()}#" for i in (1, 2)]
+
+
+class TestOffline:
+    def test_trust_installed_commit(self, site_packages, git_remote, monkeypatch):
+        git_remote.install(site_packages, "foo", "abc")
+        monkeypatch.setattr(subprocess, "run", None)
+
+        deps = [Dependency(f"foo @ git+{git_remote.url}")]
+        assert InstalledDistributions(sys_path=site_packages.sys_path, offline=True).dependencies_satisfied(deps)
+
+    def test_stale_cache(self, tmp_path, site_packages, git_remote, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        commit_id = git_remote.commit()
+        git_remote.install(site_packages, "foo", commit_id, "main")
+
+        deps = [Dependency(f"foo @ git+{git_remote.url}@main")]
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, vcs_cache_ttl=0)
+        assert distributions.dependencies_satisfied(deps)
+
+        (site_packages.path / "foo-1.0.dist-info" / "direct_url.json").write_text(
+            json.dumps({
+                "url": git_remote.url,
+                "vcs_info": {"vcs": "git", "commit_id": "abc", "requested_revision": "main"},
+            }),
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(subprocess, "run", None)
+        distributions = InstalledDistributions(
+            sys_path=site_packages.sys_path, cache_dir=cache_dir, vcs_cache_ttl=0, offline=True
+        )
+        assert not distributions.dependencies_satisfied(deps)
+
+
+def test_stats(tmp_path, site_packages, git_remote):
+    commit_id = git_remote.commit()
+    git_remote.install(site_packages, "foo", commit_id)
+    cache_dir = str(tmp_path / "cache")
+
+    deps = [Dependency(f"foo @ git+{git_remote.url}")]
+    # Every lookup is counted once even though remotes are looked up before and while checking
+    for expected, unexpected in (("vcs_cache_misses", "vcs_cache_hits"), ("vcs_cache_hits", "vcs_cache_misses")):
+        distributions = InstalledDistributions(sys_path=site_packages.sys_path, cache_dir=cache_dir, collect_stats=True)
+        stats = distributions.dependency_state(deps).stats
+        assert stats is not None
+        assert stats.counts[expected] == 1
+        assert unexpected not in stats.counts
+
+    assert distributions.stats is not None
+    assert "subprocesses" not in distributions.stats.counts
+
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path, collect_stats=True)
+    stats = distributions.dependency_state(deps).stats
+    assert stats is not None
+    assert stats.counts["subprocesses"] == 1
+    assert stats.timings["git"] > 0
+
+
+def test_stale_commit_reason(site_packages, git_remote):
+    commit_id = git_remote.commit()
+    git_remote.install(site_packages, "foo", commit_id)
+    git_remote.commit()
+
+    deps = [Dependency(f"foo @ git+{git_remote.url}")]
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert list(distributions.iter_dependency_state(deps)) == [(deps[0], False, UnsatisfiedReason.STALE_VCS_COMMIT)]
+
+
+def test_unreachable_reason(tmp_path, site_packages):
+    url = (tmp_path / "missing").as_uri()
+    vcs_info = {"vcs": "git", "commit_id": "abc"}
+    site_packages.install("foo", "1.0", direct_url={"url": url, "vcs_info": vcs_info})
+
+    deps = [Dependency(f"foo @ git+{url}")]
+    distributions = InstalledDistributions(sys_path=site_packages.sys_path)
+    assert list(distributions.iter_dependency_state(deps)) == [(deps[0], False, UnsatisfiedReason.VCS_UNREACHABLE)]